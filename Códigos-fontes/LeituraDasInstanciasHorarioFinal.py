@@ -55,14 +55,14 @@ def parse_constraints(constraints_element):
 
 # Função para gerar o arquivo LP
 def generate_lp_file(output_path):
-    delta = 9.0  # Peso para dias de trabalho
-    gamma = 3.0  # Peso para tempos ociosos
-    omega = 1.0  # Peso para lições duplas
+    delta = 1.0  # Peso para lições duplas
+    omega = 3.0  # Peso para tempos ociosos
+    gamma = 9.0  # Peso para dias de trabalho
 
     with open(output_path, "w") as f:
         # Escrever a função objetivo
         f.write("Minimize\n")
-        f.write(f" obj: {delta} sum_idle + {gamma} sum_days + {omega} sum_double\n\n")
+        f.write(f" obj: {omega} sum_idle + {gamma} sum_days + {delta} sum_double\n\n")
 
         # Escrever as restrições
         f.write("Subject To\n")
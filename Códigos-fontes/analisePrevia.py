@@ -0,0 +1,111 @@
+from formulacaoAtribuicao import DELTA, GAMMA
+from grafoConflitos import build_conflict_graph, slot_bounds
+
+# Análise prévia da instância, antes de chamar o resolvedor:
+#   - inviabilidades óbvias: carga de um professor ou turma maior que os tempos disponíveis,
+#     inclusive dia a dia com o máximo de aulas diárias dos eventos, evento que não cabe nos
+#     dias com o seu máximo diário e clique de conflitos maior que o número de tempos
+#   - limitante inferior do objetivo: dias de trabalho mínimos de cada professor (γ) e aulas
+#     duplas impossíveis (δ). Os períodos ociosos (ω) não entram no limitante.
+
+
+# Função para calcular a capacidade de um recurso em cada dia: tempos disponíveis no dia,
+# limitados pela soma dos máximos diários dos eventos do recurso
+def _daily_capacity(instance, resource_id, resource_events):
+    blocked = instance["unavailable"].get(resource_id, set())
+    daily_limit = sum(event["max_daily"] for event in resource_events)
+    capacity = {}
+    for day in instance["days"]:
+        available = sum(1 for time_id in instance["day_times"][day] if time_id not in blocked)
+        capacity[day] = min(available, daily_limit)
+    return capacity
+
+
+# Função para o número mínimo de dias de trabalho: dias com maior capacidade primeiro
+def minimum_working_days(load, capacity):
+    days = 0
+    for day_capacity in sorted(capacity.values(), reverse=True):
+        if load <= 0:
+            break
+        load -= day_capacity
+        days += 1
+    return days if load <= 0 else None
+
+
+# Função principal da análise prévia.
+# Devolve {"feasible", "issues" [mensagens], "lower_bound", "working_days" {professor: mínimo}, "slots"}
+def analyse_instance(instance, with_conflicts=True):
+    issues = []
+    events = [event for event in instance["events"] if event["duration"] > 0]
+    resource_events = {}
+    for event in events:
+        for resource in event["resources"]:
+            resource_events.setdefault(resource["reference"], []).append(event)
+
+    # Eventos que não cabem nos dias com o seu máximo diário
+    for event in events:
+        if event["max_daily"] * len(instance["days"]) < event["duration"]:
+            issues.append(f"Evento {event['id']}: duração {event['duration']} maior que "
+                          f"{event['max_daily']} aula(s) por dia em {len(instance['days'])} dia(s).")
+
+    # Carga dos professores e turmas contra os tempos disponíveis, no total e dia a dia
+    working_days = {}
+    for resource_id in instance["teachers"] + instance["classes"]:
+        assigned = resource_events.get(resource_id)
+        if not assigned:
+            continue
+        load = sum(event["duration"] for event in assigned)
+        blocked = instance["unavailable"].get(resource_id, set())
+        available = sum(1 for time in instance["times"] if time["id"] not in blocked)
+        capacity = _daily_capacity(instance, resource_id, assigned)
+        if load > available:
+            issues.append(f"Recurso {resource_id}: carga {load} maior que {available} tempo(s) disponível(is).")
+        elif load > sum(capacity.values()):
+            issues.append(f"Recurso {resource_id}: carga {load} maior que {sum(capacity.values())} "
+                          f"aula(s) possíveis com os máximos diários.")
+        if resource_id in instance["teachers"]:
+            working_days[resource_id] = minimum_working_days(load, capacity) or len(instance["days"])
+
+    # Conflitos: clique com soma de durações maior que o número de tempos
+    slots = None
+    if with_conflicts:
+        slots = slot_bounds(instance, build_conflict_graph(instance))
+        if slots["infeasible"]:
+            issues.append(f"Conflitos: uma clique de eventos precisa de {slots['lower_bound']} tempos "
+                          f"e a instância tem {slots['slots']}.")
+
+    # Limitante inferior: γ por dia de trabalho mínimo e δ por dupla que não cabe no evento
+    missing_doubles = sum(max(0, event["double_lessons"] - event["duration"] // 2) if event["max_block"] >= 2
+                          else event["double_lessons"] for event in events)
+    lower_bound = GAMMA * sum(working_days.values()) + DELTA * missing_doubles
+
+    return {"feasible": not issues, "issues": issues, "lower_bound": lower_bound,
+            "working_days": working_days, "slots": slots}
+
+
+# Função para o gap relativo entre uma solução e o limitante inferior
+def gap(objective, lower_bound):
+    if objective is None or lower_bound is None:
+        return None
+    if objective == 0:
+        return 0.0
+    return max(0.0, (objective - lower_bound) / abs(objective))
+
+
+# Função para imprimir o resultado da análise
+def print_analysis(instance_id, analysis):
+    status = "viável até onde a análise alcança" if analysis["feasible"] else "INVIÁVEL"
+    print(f"{instance_id}: {status}, limitante inferior {analysis['lower_bound']}")
+    for issue in analysis["issues"]:
+        print(f"  Erro: {issue}")
+
+
+# Exemplo: python Códigos-fontes/analisePrevia.py Instâncias/BrazilInstance1.xml [...]
+if __name__ == "__main__":
+    import sys
+
+    from instanciaXHSTT import read_instance
+
+    for file_path in sys.argv[1:] or ["./Instâncias/BrazilInstance1.xml"]:
+        instance = read_instance(file_path)
+        print_analysis(instance["id"], analyse_instance(instance))
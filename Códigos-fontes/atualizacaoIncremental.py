@@ -0,0 +1,225 @@
+import math
+import os
+import pickle
+import tempfile
+import time
+
+from formulacoes import build_model
+from instanciaXHSTT import read_instance
+from modeloMatricial import add_row, extract_timetable, model_statistics, write_lp
+from solverLocal import solve_lp
+
+# Atualização incremental da formulação de atribuição quando a instância muda pouco.
+# O cache guarda a instância lida, o modelo montado e a última solução. Uma nova versão da
+# instância é comparada com a do cache e só as linhas afetadas são corrigidas:
+#   duração de um evento:   lado direito da linha H1 do evento e das linhas S2_min dos seus
+#                           professores; linhas H5 que passam a ser necessárias são criadas
+#   máximo diário:          lado direito das linhas H5 do evento (e as que faltarem)
+#   indisponibilidade (H4): linhas H4_<recurso>_<tempo> criadas ou removidas
+# As colunas não mudam, então a solução anterior (x<i>) serve direto como MIP start.
+# Qualquer outra diferença entre as instâncias (tempos, recursos, eventos novos, salas, aulas
+# duplas, demais restrições, qualquer outro campo lido) é estrutural e o modelo é remontado do zero.
+# Só a formulação de atribuição com as opções padrão é corrigida (PATCHABLE_OPTIONS): com fixações,
+# linhas por cliques, cortes, dias agregados ou propagação, as linhas afetadas são outras.
+
+PATCHABLE_EVENT_FIELDS = ("duration", "max_daily")
+# Restrições obrigatórias cujo efeito no modelo está todo em "unavailable" e em "max_daily"
+PATCHABLE_CONSTRAINT_TAGS = ("AvoidUnavailableTimesConstraint", "SpreadEventsConstraint")
+# Campos da instância tratados diretamente por diff_instances ("id" só dá nome ao modelo)
+COMPARED_INSTANCE_FIELDS = ("id", "times", "resources", "events", "unavailable", "constraints")
+# Opções de build_assignment_model (com os valores) para as quais as regras de patch_model valem
+PATCHABLE_OPTIONS = {"working_day_mode": "disaggregated", "conflict_rows": "resource", "clique_cuts": False,
+                     "propagate": False, "pinned": None}
+
+
+# Função para criar o cache a partir de uma instância já lida
+def build_cache(instance, formulation="assignment", **options):
+    return {"instance": instance, "formulation": formulation, "options": options,
+            "model": build_model(instance, formulation, **options), "values": {}}
+
+
+# Função para gravar o cache em disco
+def save_cache(cache, path):
+    with open(path, "wb") as cache_file:
+        pickle.dump(cache, cache_file)
+
+
+# Função para ler o cache gravado por save_cache
+def load_cache(path):
+    with open(path, "rb") as cache_file:
+        return pickle.load(cache_file)
+
+
+# Função para comparar duas versões da instância. Devolve {"duration": {evento: (antes, depois)},
+# "max_daily": {evento: (antes, depois)}, "unavailable": {recurso: (tempos removidos, tempos novos)},
+# "structural": [motivos que impedem a correção incremental]}
+def diff_instances(old, new):
+    changes = {"duration": {}, "max_daily": {}, "unavailable": {}, "structural": []}
+    if [(time["id"], time["day"]) for time in old["times"]] != [(time["id"], time["day"]) for time in new["times"]]:
+        changes["structural"].append("tempos")
+    if old["resources"] != new["resources"]:
+        changes["structural"].append("recursos")
+    old_constraints, new_constraints = ([constraint for constraint in instance["constraints"]
+                                         if not (constraint["tag"] in PATCHABLE_CONSTRAINT_TAGS and constraint["required"])]
+                                        for instance in (old, new))
+    if old_constraints != new_constraints:
+        changes["structural"].append("restrições")
+    for field in dict.fromkeys(list(old) + list(new)):
+        if field not in COMPARED_INSTANCE_FIELDS and old.get(field) != new.get(field):
+            changes["structural"].append(field)
+    old_events = {event["id"]: event for event in old["events"]}
+    new_events = {event["id"]: event for event in new["events"]}
+    if list(old_events) != list(new_events):
+        changes["structural"].append("eventos incluídos ou retirados")
+    for event_id, event in new_events.items():
+        previous = old_events.get(event_id)
+        if previous is None:
+            continue
+        fixed_fields = [field for field in event if field not in PATCHABLE_EVENT_FIELDS and event[field] != previous.get(field)]
+        if fixed_fields:
+            changes["structural"].append(f"evento {event_id}: {', '.join(fixed_fields)}")
+        elif (previous["duration"] > 0) != (event["duration"] > 0):
+            changes["structural"].append(f"evento {event_id}: duração zero")
+        for field in PATCHABLE_EVENT_FIELDS:
+            if event[field] != previous[field]:
+                changes[field][event_id] = (previous[field], event[field])
+    time_order = [time["id"] for time in new["times"]]
+    for resource_id in dict.fromkeys(list(old["unavailable"]) + list(new["unavailable"])):
+        before = old["unavailable"].get(resource_id, set())
+        after = new["unavailable"].get(resource_id, set())
+        if before != after:
+            freed, blocked = before - after, after - before
+            changes["unavailable"][resource_id] = ([time_id for time_id in time_order if time_id in freed],
+                                                   [time_id for time_id in time_order if time_id in blocked])
+    return changes
+
+
+# Função para verificar se as mudanças podem ser aplicadas sem remontar o modelo
+def can_patch(cache, changes):
+    options = cache["options"]
+    return (not changes["structural"] and cache["formulation"] == "assignment" and set(options) <= set(PATCHABLE_OPTIONS)
+            and all(options.get(name, default) == default for name, default in PATCHABLE_OPTIONS.items()))
+
+
+# Função para corrigir uma cópia do modelo de atribuição (ver diff_instances).
+# Devolve (modelo corrigido, número de linhas alteradas, criadas ou removidas).
+def patch_model(model, instance, changes):
+    model = dict(model, rows=list(model["rows"]))
+    rows = model["rows"]
+    row_index = {row["name"]: index for index, row in enumerate(rows)}
+    column_index = model["column_index"]
+    events = {event["id"]: event for event in instance["events"] if event["duration"] > 0}
+    resource_events = {}
+    for event in events.values():
+        for resource in event["resources"]:
+            resource_events.setdefault(resource["reference"], []).append(event)
+    removed_rows = set()
+    touched = 0
+
+    # Função para trocar o lado direito de uma linha (sem alterar a linha do modelo original)
+    def set_rhs(name, rhs):
+        nonlocal touched
+        if name in row_index and rows[row_index[name]]["rhs"] != rhs:
+            rows[row_index[name]] = dict(rows[row_index[name]], rhs=rhs)
+            touched += 1
+
+    # H5: Máximo de aulas diárias, com as mesmas regras de build_assignment_model
+    # (linhas que ficam redundantes com a nova duração são removidas)
+    def update_max_daily(event):
+        nonlocal touched
+        for day in instance["days"]:
+            name = f"H5_{event['id']}_{day}"
+            if event["max_daily"] >= event["duration"]:
+                if name in row_index:
+                    removed_rows.add(row_index.pop(name))
+                continue
+            if name in row_index:
+                set_rhs(name, event["max_daily"])
+                continue
+            indices = [column_index[f"x_{event['id']}_{time_id}"] for time_id in instance["day_times"][day]
+                       if f"x_{event['id']}_{time_id}" in column_index]
+            if len(indices) > event["max_daily"]:
+                row_index[name] = add_row(model, name, "H5", indices, [1] * len(indices), "<=", event["max_daily"])
+                touched += 1
+
+    # H1 e mínimo de dias de trabalho dos professores do evento
+    longest_day = max(len(instance["day_times"][day]) for day in instance["days"])
+    for event_id in changes["duration"]:
+        event = events[event_id]
+        set_rhs(f"H1_{event_id}", event["duration"])
+        for resource in event["resources"]:
+            teacher = resource["reference"]
+            if teacher in instance["teachers"]:
+                load = sum(other["duration"] for other in resource_events[teacher])
+                set_rhs(f"S2_min_{teacher}", math.ceil(load / longest_day))
+        update_max_daily(event)
+    for event_id in changes["max_daily"]:
+        if event_id not in changes["duration"]:
+            update_max_daily(events[event_id])
+
+    # H4: Indisponibilidade dos recursos
+    for resource_id, (freed, blocked) in changes["unavailable"].items():
+        for time_id in freed:
+            if f"H4_{resource_id}_{time_id}" in row_index:
+                removed_rows.add(row_index.pop(f"H4_{resource_id}_{time_id}"))
+        for time_id in blocked:
+            indices = [column_index[f"x_{event['id']}_{time_id}"] for event in resource_events.get(resource_id, [])
+                       if f"x_{event['id']}_{time_id}" in column_index]
+            if indices:
+                row_index[f"H4_{resource_id}_{time_id}"] = add_row(model, f"H4_{resource_id}_{time_id}", "H4", indices,
+                                                                   [1] * len(indices), "=", 0)
+                touched += 1
+    if removed_rows:
+        model["rows"] = [row for index, row in enumerate(rows) if index not in removed_rows]
+        touched += len(removed_rows)
+    return model, touched
+
+
+# Função principal: aplica a nova versão da instância ao cache (corrigindo ou remontando o modelo)
+# e resolve com a solução anterior como MIP start. O cache é atualizado com o novo modelo e a
+# nova solução. O resultado traz "incremental" (se houve correção), "changes" e "update_time".
+def resolve_incremental(cache, instance, solver="highs", time_limit=None):
+    start = time.perf_counter()
+    changes = diff_instances(cache["instance"], instance)
+    incremental = can_patch(cache, changes)
+    if incremental:
+        model, touched = patch_model(cache["model"], instance, changes)
+        print(f"Atualização incremental: {touched} linha(s) alterada(s)")
+    else:
+        print("Aviso: mudança estrutural ({}); remontando o modelo.".format(
+            ", ".join(changes["structural"]) or f"{cache['formulation']} com {cache['options']}"))
+        model = build_model(instance, cache["formulation"], **cache["options"])
+    update_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as workdir:
+        lp_path = os.path.join(workdir, f"{instance['id']}_incremental.lp")
+        write_lp(model, lp_path)
+        result = solve_lp(lp_path, solver, time_limit, mip_start=cache["values"] if incremental and cache["values"] else None)
+
+    cache.update(instance=instance, model=model)
+    if result["values"]:
+        cache["values"] = result["values"]
+    result.update(model_statistics(model))
+    result.update({"timetable": extract_timetable(model, result["values"]), "incremental": incremental,
+                   "changes": changes, "update_time": update_time})
+    return result
+
+
+# Exemplo: python Códigos-fontes/atualizacaoIncremental.py Instâncias/BrazilInstance1.xml versao_nova.xml highs 60
+if __name__ == "__main__":
+    import sys
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else "./Instâncias/BrazilInstance1.xml"
+    new_path = sys.argv[2] if len(sys.argv) > 2 else file_path
+    solver = sys.argv[3] if len(sys.argv) > 3 else "highs"
+    time_limit = float(sys.argv[4]) if len(sys.argv) > 4 else None
+    cache_path = os.path.splitext(file_path)[0] + ".cache"
+    if os.path.exists(cache_path):
+        cache = load_cache(cache_path)
+    else:
+        cache = build_cache(read_instance(file_path))
+        resolve_incremental(cache, cache["instance"], solver, time_limit)
+    result = resolve_incremental(cache, read_instance(new_path), solver, time_limit)
+    save_cache(cache, cache_path)
+    print(f"Status: {result['status']}  Objetivo: {result['objective']}  Atualização: {result['update_time']:.3f}s  "
+          f"Resolução: {result['time']:.2f}s")
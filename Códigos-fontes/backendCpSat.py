@@ -0,0 +1,200 @@
+import math
+import os
+import time
+
+from formulacaoAtribuicao import DELTA, GAMMA, OMEGA
+from instanciaXHSTT import read_instance
+from propagacao import preassigned_block, propagate_domains
+from salas import room_capacity_groups, room_demands
+
+# Modelo CP-SAT (OR-Tools) da mesma formulação de atribuição, montado direto da instância:
+#   x[e, t]: aula do evento e no tempo t, com um intervalo opcional de tamanho 1 em t
+#   recursos: AddNoOverlap sobre os intervalos dos eventos de cada recurso (H2/H3)
+#   H1 (carga), H4 (domínio sem tempos indisponíveis), H5 (máximo diário), salas por grupos
+#   objetivo: γ dias de trabalho + ω períodos ociosos + δ aulas duplas não atendidas (9/3/1)
+# O OR-Tools é importado dentro das funções (como highspy em geradoresDeLinhas.load_highs), para que
+# este módulo e quem o importa funcionem sem ele; cpsat_available diz se está instalado.
+
+
+# Função para verificar se o OR-Tools (CP-SAT) está instalado
+def cpsat_available():
+    try:
+        from ortools.sat.python import cp_model  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# Função para criar o callback que registra o instante da primeira solução e a evolução do objetivo
+def _solution_recorder(cp_model):
+    class SolutionRecorder(cp_model.CpSolverSolutionCallback):
+        def __init__(self):
+            super().__init__()
+            self.start = time.perf_counter()
+            self.first_feasible = None
+            self.trajectory = []
+
+        def on_solution_callback(self):
+            elapsed = time.perf_counter() - self.start
+            if self.first_feasible is None:
+                self.first_feasible = elapsed
+            self.trajectory.append((elapsed, self.ObjectiveValue()))
+
+    return SolutionRecorder()
+
+
+# Função para montar o modelo CP-SAT. Devolve (modelo, variáveis x {(evento, tempo): var})
+def build_cpsat_model(instance, propagate=False):
+    from ortools.sat.python import cp_model
+
+    model = cp_model.CpModel()
+    times = instance["times"]
+    events = [event for event in instance["events"] if event["duration"] > 0]
+    domains = propagate_domains(instance)["domains"] if propagate else None
+
+    # Variáveis de aula com o intervalo opcional correspondente
+    x = {}
+    intervals = {}
+    for event in events:
+        blocked = set()
+        for resource in event["resources"]:
+            blocked.update(instance["unavailable"].get(resource["reference"], ()))
+        block = preassigned_block(instance, event) if domains is None else None
+        for time in times:
+            if time["id"] in blocked or (domains is not None and time["id"] not in domains[event["id"]]):
+                continue
+            if block is not None and time["id"] not in block:
+                continue
+            var = model.NewBoolVar(f"x_{event['id']}_{time['id']}")
+            x[event["id"], time["id"]] = var
+            intervals[event["id"], time["id"]] = model.NewOptionalFixedSizeIntervalVar(time["index"], 1, var, f"i_{event['id']}_{time['id']}")
+
+    # H1: Carga horária
+    for event in events:
+        model.Add(sum(x[event["id"], time["id"]] for time in times if (event["id"], time["id"]) in x) == event["duration"])
+
+    # H2/H3: Nenhum recurso em dois eventos ao mesmo tempo
+    resource_events = {}
+    for event in events:
+        for resource in event["resources"]:
+            resource_events.setdefault(resource["reference"], []).append(event)
+    for resource_id, users in resource_events.items():
+        if len(users) > 1:
+            model.AddNoOverlap([intervals[event["id"], time["id"]] for event in users for time in times
+                                if (event["id"], time["id"]) in intervals])
+
+    # Capacidade de salas por conjunto de salas compatíveis
+    for room_set, counts in room_capacity_groups(room_demands(instance)):
+        if sum(counts.values()) <= len(room_set):
+            continue
+        for time in times:
+            present = [(event_id, count) for event_id, count in counts.items() if (event_id, time["id"]) in x]
+            if sum(count for _, count in present) > len(room_set):
+                model.Add(sum(count * x[event_id, time["id"]] for event_id, count in present) <= len(room_set))
+
+    # H5: Máximo de aulas diárias
+    for event in events:
+        if event["max_daily"] < event["duration"]:
+            for day in instance["days"]:
+                terms = [x[event["id"], time_id] for time_id in instance["day_times"][day] if (event["id"], time_id) in x]
+                if len(terms) > event["max_daily"]:
+                    model.Add(sum(terms) <= event["max_daily"])
+
+    objective = []
+
+    # H6/S3: Aulas duplas
+    for event in events:
+        if not event["double_lessons"]:
+            continue
+        doubles = []
+        for day in instance["days"]:
+            day_times = instance["day_times"][day]
+            for current, following in zip(day_times, day_times[1:]):
+                if (event["id"], current) in x and (event["id"], following) in x:
+                    double = model.NewBoolVar(f"double_{event['id']}_{current}")
+                    model.AddImplication(double, x[event["id"], current])
+                    model.AddImplication(double, x[event["id"], following])
+                    doubles.append(double)
+        missing = model.NewIntVar(0, event["double_lessons"], f"g_{event['id']}")
+        model.Add(missing + sum(doubles) >= event["double_lessons"])
+        objective.append(DELTA * missing)
+
+    # S1/S2: Ocupação, períodos ociosos e dias de trabalho dos professores
+    longest_day = max(len(instance["day_times"][day]) for day in instance["days"])
+    for teacher in instance["teachers"]:
+        users = resource_events.get(teacher)
+        if not users:
+            continue
+        busy = {}
+        for time in times:
+            terms = [x[event["id"], time["id"]] for event in users if (event["id"], time["id"]) in x]
+            busy[time["id"]] = model.NewBoolVar(f"busy_{teacher}_{time['id']}")
+            model.Add(busy[time["id"]] == sum(terms))
+        working = []
+        for day in instance["days"]:
+            day_times = instance["day_times"][day]
+            # Ocioso: com aula antes e depois no mesmo dia e livre no período (como em formulacaoAtribuicao.idle_rows)
+            for position in range(1, len(day_times) - 1):
+                current = day_times[position]
+                before = model.NewBoolVar(f"pre_{teacher}_{current}")
+                model.AddMaxEquality(before, [busy[time_id] for time_id in day_times[:position]])
+                after = model.NewBoolVar(f"post_{teacher}_{current}")
+                model.AddMaxEquality(after, [busy[time_id] for time_id in day_times[position + 1:]])
+                idle = model.NewBoolVar(f"idle_{teacher}_{current}")
+                model.Add(idle >= before + after - busy[current] - 1)
+                objective.append(OMEGA * idle)
+            day_var = model.NewBoolVar(f"day_{teacher}_{day}")
+            model.AddMaxEquality(day_var, [busy[time_id] for time_id in day_times])
+            working.append(day_var)
+            objective.append(GAMMA * day_var)
+        load = sum(event["duration"] for event in users)
+        model.Add(sum(working) >= math.ceil(load / longest_day))
+
+    model.Minimize(sum(objective))
+    return model, x
+
+
+# Função para resolver com CP-SAT. Devolve um resultado no formato de solverLocal.solve_lp
+# (status, objective, bound, time, first_feasible) com "timetable" e "trajectory".
+def solve_cpsat(instance, time_limit=None, workers=None, propagate=False, log=False):
+    from ortools.sat.python import cp_model
+
+    model, x = build_cpsat_model(instance, propagate)
+    solver = cp_model.CpSolver()
+    solver.parameters.num_search_workers = workers or os.cpu_count() or 1
+    if time_limit:
+        solver.parameters.max_time_in_seconds = float(time_limit)
+    solver.parameters.log_search_progress = log
+    recorder = _solution_recorder(cp_model)
+    status = solver.Solve(model, recorder)
+
+    timetable = {}
+    has_solution = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    if has_solution:
+        for (event_id, time_id), var in x.items():
+            if solver.BooleanValue(var):
+                timetable.setdefault(event_id, []).append(time_id)
+    statistics = model.Proto()
+    return {
+        "status": solver.StatusName(status).lower(),
+        "objective": solver.ObjectiveValue() if has_solution else None,
+        "bound": solver.BestObjectiveBound(),
+        "time": solver.WallTime(),
+        "first_feasible": recorder.first_feasible,
+        "timetable": timetable,
+        "trajectory": recorder.trajectory,
+        "rows": len(statistics.constraints),
+        "columns": len(statistics.variables),
+    }
+
+
+# Exemplo: python Códigos-fontes/backendCpSat.py Instâncias/BrazilInstance7.xml 600 8
+if __name__ == "__main__":
+    import sys
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else "./Instâncias/BrazilInstance1.xml"
+    time_limit = float(sys.argv[2]) if len(sys.argv) > 2 else 600
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    result = solve_cpsat(read_instance(file_path), time_limit, workers, log=True)
+    print(f"Status: {result['status']}  Objetivo: {result['objective']}  Limitante: {result['bound']}  "
+          f"Primeira solução: {result['first_feasible']}  Tempo: {result['time']:.2f}s")
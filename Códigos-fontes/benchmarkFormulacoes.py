@@ -0,0 +1,188 @@
+import csv
+import os
+import sys
+
+import leituraAbsurda
+from decomposicao import solve_by_components
+from duasFases import solve_two_phase
+from formulacoes import parse_xml_and_generate_model
+from geracaoLinhas import solve_with_lazy_rows
+from instanciaXHSTT import read_instance
+from solverLocal import lp_statistics, solve_lp
+
+BRAZIL_INSTANCES = [f"./Instâncias/BrazilInstance{i}.xml" for i in range(1, 8)]
+RESULT_FIELDS = ["instance", "variant", "rows", "columns", "nonzeros", "size",
+                 "lp_bound", "status", "objective", "bound", "time", "first_feasible", "pre_bound", "gap", "iterations",
+                 "phase1_first_feasible", "phase1_objective", "phase2_first_feasible", "phase2_objective"]
+
+
+# Função para criar uma variante de benchmark a partir de um gerador de LP.
+# "generate" recebe (caminho da instância, caminho do LP, diretório de trabalho) e escreve o LP.
+def lp_variant(generate):
+    def run(instance_path, workdir, solver, time_limit):
+        lp_path = os.path.join(workdir, "model.lp")
+        generate(instance_path, lp_path, workdir)
+        result = lp_statistics(lp_path)
+        relaxation = solve_lp(lp_path, solver=solver, time_limit=time_limit, relax=True)
+        solution = solve_lp(lp_path, solver=solver, time_limit=time_limit)
+        result.update({
+            "lp_bound": relaxation["objective"],
+            "status": solution["status"],
+            "objective": solution["objective"],
+            "bound": solution["bound"],
+            "time": solution["time"],
+            "first_feasible": solution["first_feasible"],
+        })
+        return result
+    return run
+
+
+# Função para criar uma variante de leituraAbsurda com as opções de formulação informadas
+# (teacher_slot_mode, working_day_mode)
+def absurda_variant(**options):
+    def generate(instance_path, lp_path, workdir):
+        leituraAbsurda.parse_xml_and_generate_files(
+            instance_path,
+            lp_path,
+            os.path.join(workdir, "legend.txt"),
+            os.path.join(workdir, "constraints.txt"),
+            **options
+        )
+    return lp_variant(generate)
+
+
+# Função para criar uma variante a partir de uma formulação em forma matricial (formulacoes.py)
+def model_variant(formulation, **options):
+    def generate(instance_path, lp_path, workdir):
+        parse_xml_and_generate_model(
+            instance_path,
+            lp_path,
+            os.path.join(workdir, "legend.txt"),
+            os.path.join(workdir, "constraints.txt"),
+            formulation=formulation,
+            **options
+        )
+    return lp_variant(generate)
+
+
+# Função para criar uma variante que resolve cada componente independente em paralelo (decomposicao.py)
+def decomposition_variant(formulation, workers=None, **options):
+    def run(instance_path, workdir, solver, time_limit):
+        result = solve_by_components(read_instance(instance_path), formulation, solver, time_limit, workers, **options)
+        return {field: result.get(field) for field in RESULT_FIELDS}
+    return run
+
+
+# Função para criar uma variante com as linhas de conflito geradas sob demanda (geracaoLinhas.py);
+# linhas, colunas e não-zeros são os do modelo final
+def lazy_rows_variant(formulation, **options):
+    def run(instance_path, workdir, solver, time_limit):
+        result = solve_with_lazy_rows(read_instance(instance_path), formulation, solver, time_limit, **options)
+        row = {field: result.get(field) for field in RESULT_FIELDS}
+        row.update(result["final"])
+        return row
+    return run
+
+
+# Função para criar uma variante com o backend CP-SAT (backendCpSat.py); o limitante LP não se aplica.
+# Sem o OR-Tools instalado, a variante é ignorada (devolve None).
+def cpsat_variant(workers=None, **options):
+    def run(instance_path, workdir, solver, time_limit):
+        from backendCpSat import cpsat_available, solve_cpsat
+
+        if not cpsat_available():
+            print("Aviso: OR-Tools não encontrado; variante CP-SAT ignorada.")
+            return None
+        result = solve_cpsat(read_instance(instance_path), time_limit, workers, **options)
+        return {field: result.get(field) for field in RESULT_FIELDS}
+    return run
+
+
+# Função para criar uma variante com a resolução em duas fases (duasFases.py), registrando a
+# primeira solução viável e o objetivo de cada fase
+def two_phase_variant(formulation, phase1_time_limit=None, **options):
+    def run(instance_path, workdir, solver, time_limit):
+        result = solve_two_phase(read_instance(instance_path), formulation, solver, time_limit, phase1_time_limit, **options)
+        row = {field: result.get(field) for field in RESULT_FIELDS}
+        for phase in result["phases"]:
+            row[f"phase{phase['phase']}_first_feasible"] = phase["first_feasible"]
+            row[f"phase{phase['phase']}_objective"] = phase["objective"]
+        return row
+    return run
+
+
+# Conjuntos de variantes comparadas (nome do benchmark -> {nome da variante -> função de execução})
+BENCHMARKS = {
+    "teacher_slot_modes": {
+        "expanded": absurda_variant(teacher_slot_mode="expanded"),
+        "busy": absurda_variant(teacher_slot_mode="busy"),
+    },
+    "working_day_modes": {
+        "aggregated": absurda_variant(teacher_slot_mode="busy", working_day_mode="aggregated"),
+        "disaggregated": absurda_variant(teacher_slot_mode="busy", working_day_mode="disaggregated"),
+    },
+    "formulations": {
+        "assignment": model_variant("assignment"),
+        "flow": model_variant("flow"),
+    },
+    "conflict_rows": {
+        "resource": model_variant("assignment", conflict_rows="resource"),
+        "clique": model_variant("assignment", conflict_rows="clique"),
+        "clique_cuts": model_variant("assignment", conflict_rows="clique", clique_cuts=True),
+    },
+    "propagation": {
+        "full": model_variant("assignment"),
+        "propagated": model_variant("assignment", propagate=True),
+    },
+    "lazy_rows": {
+        "full": model_variant("assignment"),
+        "lazy": lazy_rows_variant("assignment"),
+    },
+    "engines": {
+        "lp_assignment": model_variant("assignment"),
+        "cpsat": cpsat_variant(),
+    },
+    "two_phase": {
+        "single": model_variant("assignment"),
+        "two_phase": two_phase_variant("assignment"),
+    },
+    "decomposition": {
+        "monolithic": model_variant("assignment"),
+        "components": decomposition_variant("assignment"),
+    },
+}
+
+
+# Função para executar todas as variantes em todas as instâncias e gravar um CSV
+def run_benchmark(instance_paths, variants, output_csv, solver="highs", time_limit=600):
+    rows = []
+    os.makedirs(os.path.dirname(output_csv) or ".", exist_ok=True)
+    for instance_path in instance_paths:
+        instance = os.path.splitext(os.path.basename(instance_path))[0]
+        for name, run in variants.items():
+            workdir = os.path.join(os.path.dirname(output_csv) or ".", instance, name)
+            os.makedirs(workdir, exist_ok=True)
+            print(f"Resolvendo {instance} com a variante {name}...")
+            result = run(instance_path, workdir, solver, time_limit)
+            if result is None:
+                continue
+            result.update({"instance": instance, "variant": name})
+            rows.append(result)
+            print(f"  linhas={result.get('rows')} colunas={result.get('columns')} nnz={result.get('nonzeros')} "
+                  f"objetivo={result.get('objective')} tempo={result.get('time', 0):.2f}s")
+
+    with open(output_csv, "w", newline="") as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=RESULT_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Resultados gravados em {output_csv}")
+    return rows
+
+
+# Exemplo: python Códigos-fontes/benchmarkFormulacoes.py [benchmark] [highs|cbc] [limite de tempo] [instâncias...]
+if __name__ == "__main__":
+    benchmark = sys.argv[1] if len(sys.argv) > 1 else "teacher_slot_modes"
+    solver = sys.argv[2] if len(sys.argv) > 2 else "highs"
+    time_limit = float(sys.argv[3]) if len(sys.argv) > 3 else 600
+    instance_paths = sys.argv[4:] or BRAZIL_INSTANCES
+    run_benchmark(instance_paths, BENCHMARKS[benchmark], f"./outputs/benchmark/{benchmark}.csv", solver, time_limit)
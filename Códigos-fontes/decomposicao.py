@@ -0,0 +1,126 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from analisePrevia import gap
+from formulacoes import solve_model
+from instanciaXHSTT import read_instance
+from salas import room_demands
+
+# Decomposição da instância em componentes independentes: eventos e recursos formam um grafo
+# bipartido (evento -- recurso que ele usa, ou sala em que ele pode ser alocado). Componentes
+# conexos diferentes não compartilham nenhuma linha do modelo, então cada um é resolvido
+# separadamente e os quadros de horários e objetivos são somados no final.
+
+
+# Função para encontrar a raiz de um nó no union-find (com compressão de caminho)
+def _find(parent, node):
+    while parent[node] != node:
+        parent[node] = parent[parent[node]]
+        node = parent[node]
+    return node
+
+
+# Função para encontrar os componentes conexos do grafo evento-recurso.
+# Devolve uma lista de (IDs dos eventos, IDs dos recursos), do maior para o menor componente.
+def find_components(instance):
+    events = [event for event in instance["events"] if event["duration"] > 0]
+    parent = {("e", event["id"]): ("e", event["id"]) for event in events}
+
+    def union(event_id, resource_id):
+        parent.setdefault(("r", resource_id), ("r", resource_id))
+        root_event = _find(parent, ("e", event_id))
+        root_resource = _find(parent, ("r", resource_id))
+        if root_event != root_resource:
+            parent[root_resource] = root_event
+
+    for event in events:
+        for resource in event["resources"]:
+            union(event["id"], resource["reference"])
+    # Pedidos de sala sem recurso ligam o evento a todas as salas compatíveis
+    for demand in room_demands(instance):
+        for room in demand["rooms"]:
+            union(demand["event"], room)
+
+    components = {}
+    for node in parent:
+        root = _find(parent, node)
+        kind, node_id = node
+        event_ids, resource_ids = components.setdefault(root, ([], []))
+        (event_ids if kind == "e" else resource_ids).append(node_id)
+    load = {event["id"]: event["duration"] for event in events}
+    return sorted(components.values(), key=lambda component: -sum(load[event_id] for event_id in component[0]))
+
+
+# Função para montar a sub-instância com apenas os eventos e recursos de um componente
+def component_instance(instance, number, event_ids, resource_ids):
+    event_ids = set(event_ids)
+    resource_ids = set(resource_ids)
+    sub = dict(instance)
+    sub["id"] = f"{instance['id']}_C{number}"
+    sub["events"] = [event for event in instance["events"] if event["id"] in event_ids]
+    sub["event_groups"] = {group: [event_id for event_id in members if event_id in event_ids]
+                           for group, members in instance["event_groups"].items()}
+    sub["resources"] = {resource_id: resource for resource_id, resource in instance["resources"].items() if resource_id in resource_ids}
+    for kind in ("teachers", "classes", "rooms"):
+        sub[kind] = [resource_id for resource_id in instance[kind] if resource_id in resource_ids]
+    sub["unavailable"] = {resource_id: times for resource_id, times in instance["unavailable"].items() if resource_id in resource_ids}
+    sub["max_working_days"] = {resource_id: limit for resource_id, limit in instance["max_working_days"].items() if resource_id in resource_ids}
+    return sub
+
+
+# Função para juntar os resultados dos componentes em um resultado único
+def merge_results(results):
+    merged = {"status": "optimal", "objective": 0.0, "bound": 0.0, "pre_bound": 0.0, "timetable": {},
+              "rows": 0, "columns": 0, "nonzeros": 0, "components": len(results)}
+    for result in results:
+        if result["status"] != "optimal" and merged["status"] == "optimal":
+            merged["status"] = result["status"]
+        for field in ("objective", "bound", "pre_bound"):
+            merged[field] = None if merged[field] is None or result.get(field) is None else merged[field] + result[field]
+        for field in ("rows", "columns", "nonzeros"):
+            merged[field] += result.get(field, 0)
+        merged["timetable"].update(result["timetable"])
+        if "rooms" in result:
+            merged.setdefault("rooms", {}).update(result["rooms"])
+            merged.setdefault("unassigned_rooms", []).extend(result["unassigned_rooms"])
+    # O primeiro horário completo só existe quando todos os componentes têm uma solução
+    first_feasible = [result["first_feasible"] for result in results]
+    merged["first_feasible"] = max(first_feasible) if first_feasible and None not in first_feasible else None
+    merged["gap"] = gap(merged["objective"], max(merged["pre_bound"] or 0, merged["bound"] or 0))
+    merged["largest_component_time"] = max((result["time"] for result in results), default=0.0)
+    return merged
+
+
+# Função principal: decompõe a instância e resolve cada componente em um processo separado.
+# workers=None usa o número de CPUs; componentes pequenos vão para a fila depois dos grandes.
+def solve_by_components(instance, formulation="assignment", solver="highs", time_limit=None, workers=None,
+                        with_rooms=False, **options):
+    components = find_components(instance)
+    print(f"{instance['id']}: {len(components)} componente(s) independente(s).")
+    subs = [component_instance(instance, number, event_ids, resource_ids)
+            for number, (event_ids, resource_ids) in enumerate(components, start=1)]
+
+    start = time.perf_counter()
+    if len(subs) == 1:
+        results = [solve_model(subs[0], formulation, solver, time_limit, with_rooms, **options)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            futures = [executor.submit(solve_model, sub, formulation, solver, time_limit, with_rooms, **options) for sub in subs]
+            results = [future.result() for future in futures]
+    merged = merge_results(results)
+    merged["time"] = time.perf_counter() - start
+    return merged
+
+
+# Exemplo: python Códigos-fontes/decomposicao.py Instâncias/ArtificialAll15.xml assignment highs 600
+if __name__ == "__main__":
+    import sys
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else "./Instâncias/ArtificialAll15.xml"
+    formulation = sys.argv[2] if len(sys.argv) > 2 else "assignment"
+    solver = sys.argv[3] if len(sys.argv) > 3 else "highs"
+    time_limit = float(sys.argv[4]) if len(sys.argv) > 4 else None
+    result = solve_by_components(read_instance(file_path), formulation, solver, time_limit)
+    print(f"Status: {result['status']}  Objetivo: {result['objective']}  Tempo: {result['time']:.2f}s "
+          f"(maior componente: {result['largest_component_time']:.2f}s)")
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import time
+
+from analisePrevia import analyse_instance, gap, print_analysis
+from formulacoes import build_model
+from instanciaXHSTT import read_instance
+from modeloMatricial import extract_timetable, model_statistics, objective_value, with_objective, write_lp
+from salas import assign_rooms
+from solverLocal import solve_lp
+
+# Resolução lexicográfica em duas fases sobre a mesma matriz de restrições:
+#   fase 1: apenas as restrições rígidas (H1-H6), com objetivo zero; o resolvedor para na
+#           primeira solução viável em vez de equilibrar períodos ociosos e dias de trabalho
+#   fase 2: o modelo completo (S1-S3 ponderados) com a solução da fase 1 como MIP start,
+#           no tempo que sobrar do limite total
+# Para cada fase ficam registrados o tempo até a primeira solução viável e o objetivo final
+# (na fase 1, o objetivo ponderado avaliado na solução viável encontrada).
+
+
+# Função para extrair o registro de uma fase a partir do resultado do resolvedor
+def _phase_record(phase, result, model, start):
+    first_feasible = result["first_feasible"]
+    if first_feasible is None and result["values"]:
+        first_feasible = result["time"]  # Solução encontrada já no presolve, sem linhas de árvore no log
+    return {
+        "phase": phase,
+        "status": result["status"],
+        "objective": objective_value(model, result["values"]) if result["values"] else None,
+        "first_feasible": first_feasible,
+        "time": result["time"],
+        "elapsed": time.perf_counter() - start,
+    }
+
+
+# Função principal. Devolve o resultado da fase 2 (ou da fase 1, se ela não achar solução) com
+# "phases" [registro da fase 1, registro da fase 2] e "first_feasible" medido desde o início.
+#   time_limit:        limite total das duas fases
+#   phase1_time_limit: limite da fase 1 (padrão: o limite total); a fase 2 recebe o restante
+def solve_two_phase(instance, formulation="assignment", solver="highs", time_limit=None, phase1_time_limit=None,
+                    with_rooms=False, precheck=True, **options):
+    analysis = analyse_instance(instance) if precheck else None
+    if analysis and not analysis["feasible"]:
+        print_analysis(instance["id"], analysis)
+        return {"status": "infeasible (pre-check)", "objective": None, "bound": None, "time": 0.0,
+                "first_feasible": None, "values": {}, "log": "\n".join(analysis["issues"]), "timetable": {},
+                "pre_bound": analysis["lower_bound"], "gap": None, "phases": []}
+
+    model = build_model(instance, formulation, **options)
+    start = time.perf_counter()
+    phases = []
+    with tempfile.TemporaryDirectory() as workdir:
+        lp_path = os.path.join(workdir, f"{instance['id']}_{formulation}_fase1.lp")
+        write_lp(with_objective(model, {}), lp_path)
+        result = solve_lp(lp_path, solver, phase1_time_limit or time_limit)
+        phases.append(_phase_record(1, result, model, start))
+
+        if result["values"]:
+            remaining = time_limit - (time.perf_counter() - start) if time_limit else None
+            if remaining is not None and remaining <= 0:
+                print("Aviso: sem tempo para a fase 2; devolvendo a solução da fase 1.")
+            else:
+                lp_path = os.path.join(workdir, f"{instance['id']}_{formulation}_fase2.lp")
+                write_lp(model, lp_path)
+                phase1_values = result["values"]
+                result = solve_lp(lp_path, solver, remaining, mip_start=phase1_values)
+                if not result["values"]:
+                    # A fase 2 não devolveu solução no tempo restante: fica a da fase 1
+                    result.update(values=phase1_values, objective=objective_value(model, phase1_values))
+                phases.append(_phase_record(2, result, model, start))
+        else:
+            print(f"Erro: a fase 1 não encontrou solução viável ({result['status']}).")
+
+    result["phases"] = phases
+    result["first_feasible"] = phases[0]["first_feasible"]
+    result["time"] = time.perf_counter() - start
+    result["timetable"] = extract_timetable(model, result["values"])
+    result.update(model_statistics(model))
+    if analysis:
+        result["pre_bound"] = analysis["lower_bound"]
+        result["gap"] = gap(result["objective"], max(analysis["lower_bound"], result["bound"] or 0))
+    if with_rooms:
+        result["rooms"], result["unassigned_rooms"] = assign_rooms(instance, result["timetable"])
+    return result
+
+
+# Exemplo: python Códigos-fontes/duasFases.py Instâncias/BrazilInstance7.xml highs 600 60
+if __name__ == "__main__":
+    import sys
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else "./Instâncias/BrazilInstance1.xml"
+    solver = sys.argv[2] if len(sys.argv) > 2 else "highs"
+    time_limit = float(sys.argv[3]) if len(sys.argv) > 3 else 600
+    phase1_time_limit = float(sys.argv[4]) if len(sys.argv) > 4 else None
+    result = solve_two_phase(read_instance(file_path), solver=solver, time_limit=time_limit, phase1_time_limit=phase1_time_limit)
+    for phase in result["phases"]:
+        print(f"Fase {phase['phase']}: {phase['status']}  primeira solução {phase['first_feasible']}  "
+              f"objetivo {phase['objective']}  tempo {phase['time']:.2f}s")
+    print(f"Objetivo final: {result['objective']}  Tempo total: {result['time']:.2f}s")
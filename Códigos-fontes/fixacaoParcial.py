@@ -0,0 +1,86 @@
+import os
+import tempfile
+
+from formulacoes import build_model
+from instanciaXHSTT import read_instance
+from modeloMatricial import extract_timetable, model_statistics, timetable_start, write_lp
+from solverLocal import solve_lp
+
+# Fixar e reotimizar: a partir de um quadro de horários {evento: [tempos]}, só a parte livre é
+# reotimizada e todas as outras aulas ficam fixadas na geração do modelo (opção "pinned" de
+# build_assignment_model): as colunas x dessas aulas nem chegam ao LP. A especificação da parte
+# livre é um dicionário com qualquer combinação de
+#   days:     dias cujas aulas ficam livres
+#   teachers: professores cujas aulas ficam livres
+#   classes:  turmas cujas aulas ficam livres
+#   events:   eventos cujas aulas ficam livres
+# Uma aula é livre se atender a qualquer um dos itens. As aulas livres podem ir para qualquer
+# tempo que não esteja ocupado por aulas fixadas dos mesmos recursos.
+
+PIN_SCOPES = ("days", "teachers", "classes", "events")
+
+
+# Função para separar as aulas fixadas do quadro de horários: devolve {evento: tempos fixados}
+def pinned_lessons(instance, timetable, free):
+    unknown = set(free) - set(PIN_SCOPES)
+    if unknown:
+        raise ValueError(f"Escopo de fixação desconhecido: {', '.join(sorted(unknown))}")
+    time_day = {time["id"]: time["day"] for time in instance["times"]}
+    free_days = set(free.get("days", ()))
+    free_teachers = set(free.get("teachers", ()))
+    free_classes = set(free.get("classes", ()))
+    free_events = set(free.get("events", ()))
+    events = {event["id"]: event for event in instance["events"]}
+    pinned = {}
+    for event_id, time_ids in timetable.items():
+        event = events[event_id]
+        if event_id in free_events or event["class"] in free_classes:
+            continue
+        if free_teachers & {resource["reference"] for resource in event["resources"]}:
+            continue
+        kept = {time_id for time_id in time_ids if time_day[time_id] not in free_days}
+        if kept:
+            pinned[event_id] = kept
+    return pinned
+
+
+# Função principal: fixa o quadro fora da parte livre, resolve só a parte livre (com o quadro
+# atual como MIP start, com todas as colunas preenchidas por timetable_start) e devolve o resultado do resolvedor com o quadro completo em "timetable",
+# "pinned" (número de aulas fixadas) e o tamanho do modelo reduzido.
+def solve_pinned(instance, timetable, free, solver="highs", time_limit=None, **options):
+    pinned = pinned_lessons(instance, timetable, free)
+    model = build_model(instance, "assignment", pinned=pinned, **options)
+    start = timetable_start(instance, model, timetable)
+    with tempfile.TemporaryDirectory() as workdir:
+        lp_path = os.path.join(workdir, f"{instance['id']}_pinned.lp")
+        write_lp(model, lp_path)
+        result = solve_lp(lp_path, solver, time_limit, mip_start=start)
+
+    merged = {event_id: sorted(time_ids) for event_id, time_ids in pinned.items()}
+    for event_id, time_ids in extract_timetable(model, result["values"]).items():
+        merged.setdefault(event_id, []).extend(time_ids)
+    result.update(model_statistics(model))
+    result.update({"timetable": merged, "pinned": sum(len(time_ids) for time_ids in pinned.values())})
+    return result
+
+
+# Exemplo: python Códigos-fontes/fixacaoParcial.py Instâncias/BrazilInstance7.xml quadro.csv days=Mo highs 60
+# (quadro.csv com linhas "evento;tempo"; a parte livre é dada como escopo=id1,id2)
+if __name__ == "__main__":
+    import sys
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else "./Instâncias/BrazilInstance1.xml"
+    timetable_path = sys.argv[2] if len(sys.argv) > 2 else "./outputs/quadro.csv"
+    scope, _, ids = (sys.argv[3] if len(sys.argv) > 3 else "days=").partition("=")
+    solver = sys.argv[4] if len(sys.argv) > 4 else "highs"
+    time_limit = float(sys.argv[5]) if len(sys.argv) > 5 else None
+    timetable = {}
+    with open(timetable_path) as timetable_file:
+        for line in timetable_file:
+            if line.strip():
+                event_id, time_id = line.strip().split(";")
+                timetable.setdefault(event_id, []).append(time_id)
+    result = solve_pinned(read_instance(file_path), timetable, {scope: [value for value in ids.split(",") if value]},
+                          solver, time_limit)
+    print(f"Aulas fixadas: {result['pinned']}  Colunas: {result['columns']}  Linhas: {result['rows']}")
+    print(f"Status: {result['status']}  Objetivo: {result['objective']}  Tempo: {result['time']:.2f}s")
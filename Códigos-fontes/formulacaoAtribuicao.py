@@ -0,0 +1,361 @@
+import math
+
+from grafoConflitos import build_conflict_graph, clique_cut_pool, clique_time_rows, maximal_cliques
+from modeloMatricial import add_column, new_model, new_row
+from propagacao import preassigned_block, propagate_domains
+from salas import room_capacity_groups, room_demands, room_group_rows
+
+# Pesos da função objetivo (README): δ aulas duplas não atendidas, ω períodos ociosos, γ dias de trabalho
+DELTA = 1
+OMEGA = 3
+GAMMA = 9
+
+# Modos de ligação dos indicadores de dia de trabalho (mesmos de leituraAbsurda)
+WORKING_DAY_MODES = ("aggregated", "disaggregated")
+
+# Linhas de conflito dos recursos que não são professores: uma por (recurso, tempo) ou, no modo
+# "clique", uma por (clique maximal do grafo de conflitos, tempo) no lugar das linhas de recurso
+# que ela domina
+CONFLICT_ROW_MODES = ("resource", "clique")
+
+# A formulação é definida uma única vez: build_layout numera as colunas em uma passada pela
+# instância (com todas as opções) e cada família de restrições é um gerador que devolve uma linha
+# por vez no formato de modeloMatricial. build_assignment_model junta as linhas em um modelo;
+# geradoresDeLinhas e geracaoParalela entregam as mesmas linhas, em fluxo ou por fatias, a outros
+# consumidores. Cada família aceita shard=(parte, partes): gera só a fatia contígua "parte" dos
+# seus donos (eventos, recursos, cliques, grupos de salas ou professores), na ordem original; as
+# fatias concatenadas em ordem reproduzem a família inteira.
+
+
+# Função para gerar as linhas S1 de um professor em um dia: o período interno p é ocioso quando há
+# aula antes de p e depois de p no mesmo dia e p está livre, qualquer que seja o tamanho do buraco.
+#   pre_p  >= busy(q) para todo q < p (pre_p >= busy(p-1) e pre_p >= pre_(p-1))
+#   post_p >= busy(q) para todo q > p (post_p >= busy(p+1) e post_p >= post_(p+1))
+#   idle_p >= pre_p + post_p - busy(p) - 1
+# pre/post são contínuas: na minimização ficam no menor valor, o "ou" exato das ocupações.
+# idle, before, after: {tempo interno: coluna}. Devolve (nome, índices, coeficientes, sentido, rhs).
+def idle_rows(teacher, day_times, busy, idle, before, after):
+    inner = day_times[1:-1]
+    for position, current in enumerate(inner, start=1):
+        previous, following = day_times[position - 1], day_times[position + 1]
+        yield f"S1_pre_{teacher}_{current}", [before[current], busy[teacher, previous]], [1, -1], ">=", 0
+        if position > 1:
+            yield f"S1_prechain_{teacher}_{current}", [before[current], before[previous]], [1, -1], ">=", 0
+        yield f"S1_post_{teacher}_{current}", [after[current], busy[teacher, following]], [1, -1], ">=", 0
+        if position < len(inner):
+            yield f"S1_postchain_{teacher}_{current}", [after[current], after[following]], [1, -1], ">=", 0
+        yield (f"S1_{teacher}_{current}", [idle[current], before[current], after[current], busy[teacher, current]],
+               [1, -1, -1, 1], ">=", -1)
+
+
+# Função para numerar as colunas da formulação de atribuição x_<evento>_<tempo>. Devolve o layout:
+# um modelo de modeloMatricial ainda sem linhas, com os índices de cada grupo de variáveis e os
+# dados que as famílias de linhas leem.
+#   conflict_rows: "resource" (H3 por recurso) ou "clique" (H3 por clique maximal)
+#   clique_cuts:   acrescenta o pool de cortes de clique (família CUT)
+#   propagate:     cria x apenas para os pares (evento, tempo) que sobrevivem à propagação de domínios
+#   pinned:        {evento: tempos} de aulas fixadas; não viram colunas x, reduzem o lado direito
+#                  das linhas do evento e ocupam os seus recursos (ver fixacaoParcial.py)
+def build_layout(instance, working_day_mode="disaggregated", conflict_rows="resource", clique_cuts=False,
+                 propagate=False, pinned=None):
+    if working_day_mode not in WORKING_DAY_MODES:
+        raise ValueError(f"Modo de dias de trabalho desconhecido: {working_day_mode}")
+    if conflict_rows not in CONFLICT_ROW_MODES:
+        raise ValueError(f"Modo de linhas de conflito desconhecido: {conflict_rows}")
+
+    layout = new_model(instance["id"])
+    times = [time["id"] for time in instance["times"]]
+    all_events = [event for event in instance["events"] if event["duration"] > 0]
+
+    # Aulas fixadas: tempos ocupados em cada recurso e aulas que faltam alocar em cada evento
+    pinned = {event_id: set(time_ids) for event_id, time_ids in (pinned or {}).items() if time_ids}
+    occupied = {}
+    for event in all_events:
+        for resource in event["resources"]:
+            occupied.setdefault(resource["reference"], set()).update(pinned.get(event["id"], ()))
+    remaining = {event["id"]: event["duration"] - len(pinned.get(event["id"], ())) for event in all_events}
+    events = [event for event in all_events if remaining[event["id"]] > 0]
+
+    # Domínios de tempos de cada evento (sem propagação, todos os tempos; um evento pré-atribuído
+    # fica restrito ao seu bloco, com os tempos obrigatórios como na propagação)
+    domains = {event["id"]: set(times) for event in events}
+    forced = {event["id"]: set() for event in events}
+    if propagate:
+        propagation = propagate_domains(instance)
+        if propagation["infeasible"]:
+            raise ValueError("Propagação de domínios: " + " ".join(propagation["infeasible"]))
+        domains, forced = propagation["domains"], propagation["forced"]
+    else:
+        for event in events:
+            block = preassigned_block(instance, event)
+            if block is not None:
+                domains[event["id"]] = set(block)
+                forced[event["id"]] = set(block)
+    for event in events:
+        for resource in event["resources"]:
+            domains[event["id"]] = domains[event["id"]] - occupied.get(resource["reference"], set())
+
+    # Eventos de cada recurso
+    resource_events = {}
+    for event in events:
+        for resource in event["resources"]:
+            resource_events.setdefault(resource["reference"], []).append(event)
+    for resource_id, time_ids in occupied.items():
+        if time_ids:
+            resource_events.setdefault(resource_id, [])  # Professor só com aulas fixadas ainda tem ocupação
+
+    layout.update({"times": times, "all_events": all_events, "events": events, "remaining": remaining, "pinned": pinned,
+                   "occupied": occupied, "resource_events": resource_events, "working_day_mode": working_day_mode,
+                   "conflict_rows": conflict_rows, "teachers": [teacher for teacher in instance["teachers"] if teacher in resource_events],
+                   "x": {}, "busy": {}, "double": {}, "missing": {}, "pinned_doubles": {}, "idle": {}, "pre": {}, "post": {},
+                   "day": {}})
+
+    # Variáveis de atribuição (aulas forçadas pela propagação ficam fixadas em 1)
+    for event in events:
+        for time_id in times:
+            if time_id in domains[event["id"]]:
+                layout["x"][event["id"], time_id] = add_column(layout, f"x_{event['id']}_{time_id}", kind="B",
+                                                               lower=1 if time_id in forced[event["id"]] else 0, upper=1,
+                                                               key=("x", event["id"], (time_id,)))
+    layout["event_time_columns"] = {key: [index] for key, index in layout["x"].items()}
+
+    # Ocupação dos professores
+    for resource_id in resource_events:
+        if instance["resources"].get(resource_id, {}).get("type") == "Teacher":
+            for time_id in times:
+                layout["busy"][resource_id, time_id] = add_column(layout, f"busy_{resource_id}_{time_id}", kind="B", upper=1,
+                                                                  key=("busy", resource_id, (time_id,)))
+
+    # Aulas duplas: um indicador por par de tempos seguidos do dia que o evento ainda pode ocupar;
+    # pares de aulas fixadas já contam como duplas atendidas
+    for event in all_events:
+        if not event["double_lessons"]:
+            continue
+        own = pinned.get(event["id"], set())
+        layout["pinned_doubles"][event["id"]] = 0
+        for day in instance["days"]:
+            day_times = instance["day_times"][day]
+            for current, following in zip(day_times, day_times[1:]):
+                if current in own and following in own:
+                    layout["pinned_doubles"][event["id"]] += 1
+                elif all((event["id"], time_id) in layout["x"] or time_id in own for time_id in (current, following)):
+                    layout["double"][event["id"], current] = add_column(layout, f"double_{event['id']}_{current}", upper=1,
+                                                                             key=("double", event["id"], (current, following)))
+        layout["missing"][event["id"]] = add_column(layout, f"g_{event['id']}", cost=DELTA, key=("missing", event["id"], ()))
+
+    # Períodos ociosos e dias de trabalho dos professores
+    for teacher in layout["teachers"]:
+        for day in instance["days"]:
+            for current in instance["day_times"][day][1:-1]:
+                layout["idle"][teacher, current] = add_column(layout, f"idle_{teacher}_{current}", cost=OMEGA, upper=1,
+                                                              key=("idle", teacher, (current,)))
+                layout["pre"][teacher, current] = add_column(layout, f"pre_{teacher}_{current}", upper=1, key=("pre", teacher, (current,)))
+                layout["post"][teacher, current] = add_column(layout, f"post_{teacher}_{current}", upper=1, key=("post", teacher, (current,)))
+    for teacher in layout["teachers"]:
+        for day in instance["days"]:
+            day_times = instance["day_times"][day]
+            layout["day"][teacher, day] = add_column(layout, f"day_{teacher}_{day}", cost=GAMMA, kind="B", upper=1,
+                                                     key=("day", teacher, tuple(day_times)))
+
+    # H3 por cliques: cada clique de recurso é estendida até ser maximal; as cliques que são
+    # exatamente os eventos de um professor já são garantidas por busy <= 1. Em cada tempo, a linha
+    # de uma clique só entra se dominar (conter os eventos de) pelo menos duas linhas H3 de recurso
+    # ainda não dominadas, escolhidas de forma gulosa; as linhas dominadas saem do modelo, então o
+    # modo "clique" nunca tem mais linhas que o modo "resource". Os cortes descartam as cliques já
+    # garantidas pelas linhas do modelo: as cliques de cada recurso e as cliques usadas no modo
+    # "clique". Guardadas como [(número, clique, família)], com os tempos das cliques H3 em
+    # clique_times {número: tempos} e as linhas de recurso dominadas em covered {(recurso, tempo)}.
+    layout["cliques"] = []
+    layout["clique_times"] = {}
+    layout["covered"] = set()
+    if conflict_rows == "clique" or clique_cuts:
+        graph = build_conflict_graph(instance)
+    if conflict_rows == "clique":
+        teacher_cliques = {frozenset(event["id"] for event in resource_events.get(teacher, [])) for teacher in instance["teachers"]}
+        cliques = {number: clique for number, clique in enumerate(maximal_cliques(graph), start=1) if clique not in teacher_cliques}
+        event_cliques = {}
+        for number, clique in cliques.items():
+            for event_id in clique:
+                event_cliques.setdefault(event_id, set()).add(number)
+        for time_id in times:
+            dominated = {}
+            for resource_id, users in resource_events.items():
+                if instance["resources"].get(resource_id, {}).get("type") == "Teacher":
+                    continue
+                members = [event["id"] for event in users if (event["id"], time_id) in layout["x"]]
+                if len(members) < 2:
+                    continue
+                for number in set.intersection(*(event_cliques.get(event_id, set()) for event_id in members)):
+                    dominated.setdefault(number, set()).add(resource_id)
+            while dominated:
+                number = max(dominated, key=lambda number: (len(dominated[number]), -number))
+                if len(dominated[number]) < 2:
+                    break
+                covered = dominated.pop(number)
+                layout["clique_times"].setdefault(number, set()).add(time_id)
+                layout["covered"].update((resource_id, time_id) for resource_id in covered)
+                dominated = {other: resources - covered for other, resources in dominated.items() if resources - covered}
+        layout["cliques"] += [(number, cliques[number], "H3") for number in sorted(layout["clique_times"])]
+    if clique_cuts:
+        used_cliques = list(graph["resource_cliques"].values()) + [clique for _, clique, _ in layout["cliques"]]
+        layout["cliques"] += [(number, clique, "CUT") for number, clique in enumerate(clique_cut_pool(graph, used_cliques), start=1)]
+
+    layout["room_groups"] = room_capacity_groups(room_demands(instance))
+    return layout
+
+
+# Função para obter a fatia contígua de uma lista de donos (shard=None: todos)
+def _share(items, shard):
+    items = list(items)
+    if shard is None:
+        return items
+    index, count = shard
+    return items[len(items) * index // count:len(items) * (index + 1) // count]
+
+
+# H1: Carga horária
+def h1_rows(instance, layout, shard=None):
+    for event in _share(layout["events"], shard):
+        indices = [layout["x"][event["id"], time_id] for time_id in layout["times"] if (event["id"], time_id) in layout["x"]]
+        yield new_row(f"H1_{event['id']}", "H1", indices, [1] * len(indices), "=", layout["remaining"][event["id"]])
+
+
+# H2/H3: Conflitos de horário. Professores têm a variável de ocupação busy_<professor>_<tempo>,
+# que já implica o conflito; os demais recursos (turmas, salas) recebem linhas "<= 1", exceto as
+# dominadas por uma linha de clique (modo "clique").
+def h2_h3_rows(instance, layout, shard=None):
+    for resource_id, users in _share(layout["resource_events"].items(), shard):
+        is_teacher = instance["resources"].get(resource_id, {}).get("type") == "Teacher"
+        if not is_teacher and len(users) < 2:
+            continue
+        for time_id in layout["times"]:
+            indices = [layout["x"][event["id"], time_id] for event in users if (event["id"], time_id) in layout["x"]]
+            if is_teacher:
+                yield new_row(f"H2_{resource_id}_{time_id}", "H2", [layout["busy"][resource_id, time_id]] + indices,
+                              [1] + [-1] * len(indices), "=", 1 if time_id in layout["occupied"].get(resource_id, ()) else 0)
+            elif len(indices) > 1 and (resource_id, time_id) not in layout["covered"]:
+                yield new_row(f"H3_{resource_id}_{time_id}", "H3", indices, [1] * len(indices), "<=", 1)
+
+
+# H3 por cliques e cortes de clique (ver build_layout)
+def clique_rows(instance, layout, shard=None):
+    for number, clique, family in _share(layout["cliques"], shard):
+        times = layout["clique_times"][number] if family == "H3" else None
+        yield from clique_time_rows(instance, number, clique, layout["event_time_columns"], family, times)
+
+
+# Capacidade de salas: apenas os eventos compatíveis com cada conjunto de salas
+def room_rows(instance, layout, shard=None):
+    for number, (room_set, counts) in _share(enumerate(layout["room_groups"], start=1), shard):
+        yield from room_group_rows(instance, number, room_set, counts, layout["event_time_columns"], layout["pinned"])
+
+
+# H4: Indisponibilidade dos recursos
+def h4_rows(instance, layout, shard=None):
+    for resource_id, unavailable_times in _share(instance["unavailable"].items(), shard):
+        users = layout["resource_events"].get(resource_id)
+        if not users:
+            continue
+        for time_id in layout["times"]:
+            if time_id in unavailable_times:
+                indices = [layout["x"][event["id"], time_id] for event in users if (event["id"], time_id) in layout["x"]]
+                if indices:  # Sem colunas: já retirado pela propagação
+                    yield new_row(f"H4_{resource_id}_{time_id}", "H4", indices, [1] * len(indices), "=", 0)
+
+
+# H5: Máximo de aulas diárias
+def h5_rows(instance, layout, shard=None):
+    for event in _share(layout["events"], shard):
+        if event["max_daily"] >= event["duration"]:
+            continue
+        for day in instance["days"]:
+            indices = [layout["x"][event["id"], time_id] for time_id in instance["day_times"][day]
+                       if (event["id"], time_id) in layout["x"]]
+            limit = event["max_daily"] - len(layout["pinned"].get(event["id"], set()) & set(instance["day_times"][day]))
+            if len(indices) > limit:
+                yield new_row(f"H5_{event['id']}_{day}", "H5", indices, [1] * len(indices), "<=", limit)
+
+
+# H6/S3: Lições duplas. double_<evento>_<tempo> <= x no tempo e no seguinte (mesmo dia), e
+# g_<evento> + soma(double) >= número de duplas pedidas; um tempo fixado dispensa a linha H6 do seu lado
+def double_rows(instance, layout, shard=None):
+    for event in _share(layout["all_events"], shard):
+        if not event["double_lessons"]:
+            continue
+        own = layout["pinned"].get(event["id"], set())
+        doubles = []
+        for day in instance["days"]:
+            day_times = instance["day_times"][day]
+            for current, following in zip(day_times, day_times[1:]):
+                double = layout["double"].get((event["id"], current))
+                if double is None:
+                    continue
+                doubles.append(double)
+                for time_id in (current, following):
+                    if time_id not in own:
+                        yield new_row(f"H6_{event['id']}_{time_id}", "H6", [double, layout["x"][event["id"], time_id]], [1, -1], "<=", 0)
+        yield new_row(f"S3_{event['id']}", "S3", [layout["missing"][event["id"]]] + doubles, [1] * (len(doubles) + 1), ">=",
+                      event["double_lessons"] - layout["pinned_doubles"][event["id"]])
+
+
+# S1: Períodos ociosos (ver idle_rows)
+def s1_rows(instance, layout, shard=None):
+    for teacher in _share(layout["teachers"], shard):
+        for day in instance["days"]:
+            day_times = instance["day_times"][day]
+            idle, before, after = ({current: layout[kind][teacher, current] for current in day_times[1:-1]}
+                                   for kind in ("idle", "pre", "post"))
+            for name, indices, coefs, sense, rhs in idle_rows(teacher, day_times, layout["busy"], idle, before, after):
+                yield new_row(name, "S1", indices, coefs, sense, rhs)
+
+
+# S2: Dias de trabalho, um indicador binário por (professor, dia), e mínimo de dias por professor
+def s2_rows(instance, layout, shard=None):
+    busy = layout["busy"]
+    longest_day = max(len(instance["day_times"][day]) for day in instance["days"])
+    for teacher in _share(layout["teachers"], shard):
+        load = sum(layout["remaining"][event["id"]] for event in layout["resource_events"][teacher]) + len(layout["occupied"].get(teacher, ()))
+        day_indices = []
+        for day in instance["days"]:
+            day_times = instance["day_times"][day]
+            working = layout["day"][teacher, day]
+            day_indices.append(working)
+            if layout["working_day_mode"] == "aggregated":
+                indices = [busy[teacher, time_id] for time_id in day_times]
+                yield new_row(f"S2_{teacher}_{day}", "S2", [working] + indices, [len(day_times)] + [-1] * len(indices), ">=", 0)
+            else:
+                for time_id in day_times:
+                    yield new_row(f"S2_{teacher}_{time_id}", "S2", [working, busy[teacher, time_id]], [1, -1], ">=", 0)
+        # Mínimo de dias de trabalho: carga / maior número de períodos em um dia
+        yield new_row(f"S2_min_{teacher}", "S2", day_indices, [1] * len(day_indices), ">=", math.ceil(load / longest_day))
+
+
+# Famílias na ordem de emissão do modelo
+FAMILIES = {
+    "H1": h1_rows,
+    "H2/H3": h2_h3_rows,
+    "CLIQUE": clique_rows,
+    "ROOM": room_rows,
+    "H4": h4_rows,
+    "H5": h5_rows,
+    "H6/S3": double_rows,
+    "S1": s1_rows,
+    "S2": s2_rows,
+}
+
+
+# Função para encadear os geradores das famílias escolhidas
+def model_rows(instance, layout, families=tuple(FAMILIES)):
+    for family in families:
+        yield from FAMILIES[family](instance, layout)
+
+
+# Função para montar a formulação de atribuição x_<evento>_<tempo> em forma matricial.
+# É a mesma formulação de leituraAbsurda (modo "busy" + indicadores por dia), escrita
+# sobre a instância lida por instanciaXHSTT. As opções são as de build_layout.
+def build_assignment_model(instance, working_day_mode="disaggregated", conflict_rows="resource", clique_cuts=False,
+                           propagate=False, pinned=None):
+    layout = build_layout(instance, working_day_mode, conflict_rows, clique_cuts, propagate, pinned)
+    model = new_model(instance["id"])
+    model.update(columns=layout["columns"], column_index=layout["column_index"], rows=list(model_rows(instance, layout)))
+    return model
@@ -0,0 +1,180 @@
+import math
+
+from formulacaoAtribuicao import DELTA, GAMMA, OMEGA
+from modeloMatricial import add_column, add_row, new_model
+from propagacao import preassigned_block, propagate_domains
+from salas import add_room_capacity_rows
+
+# Formulação de fluxo do artigo (README, Documentos/ExplicaçãoProblema.txt): para cada professor
+# e dia há um grafo de caminho com os nós "s" (origem), 0..P (fronteiras entre períodos) e "z"
+# (destino). Os arcos são:
+#   lesson: aula do evento e de p até p+tamanho (tamanho 1 ou 2, S_ta no artigo)
+#   idle:   período p ocioso, de p até p+1 (apenas períodos internos do dia)
+#   start:  s -> p, o professor começa o dia no período p (custo γ, conta um dia de trabalho)
+#   end:    p -> z, o professor termina o dia antes do período p
+#   off:    s -> z, dia de folga
+# A conservação de fluxo tem b_v = 1 em s, -1 em z e 0 nos demais nós.
+
+
+# Função para enumerar os arcos viáveis do grafo de um professor em um dia
+# (domains, se informado, restringe os tempos de cada evento; ver propagacao)
+def _day_arcs(instance, teacher, day, teacher_events, domains=None):
+    day_times = instance["day_times"][day]
+    periods = len(day_times)
+    unavailable = instance["unavailable"]
+
+    # Função para verificar se todos os recursos do evento estão livres nos tempos
+    def available(event, time_ids):
+        if domains is not None and not all(time_id in domains[event["id"]] for time_id in time_ids):
+            return False
+        for resource in event["resources"]:
+            blocked = unavailable.get(resource["reference"])
+            if blocked and any(time_id in blocked for time_id in time_ids):
+                return False
+        return True
+
+    arcs = []
+    for event in teacher_events:
+        largest = min(2, event["max_block"], event["max_daily"], event["duration"])
+        for size in range(1, largest + 1):
+            for period in range(periods - size + 1):
+                covered = day_times[period:period + size]
+                if available(event, covered):
+                    arcs.append({"kind": "lesson", "tail": period, "head": period + size, "event": event, "size": size, "times": covered})
+
+    lesson_tails = {arc["tail"] for arc in arcs}
+    lesson_heads = {arc["head"] for arc in arcs}
+    for period in range(1, periods - 1):
+        arcs.append({"kind": "idle", "tail": period, "head": period + 1, "times": [day_times[period]]})
+    for node in sorted(lesson_tails):
+        arcs.append({"kind": "start", "tail": "s", "head": node})
+    for node in sorted(lesson_heads):
+        arcs.append({"kind": "end", "tail": node, "head": "z"})
+    arcs.append({"kind": "off", "tail": "s", "head": "z"})
+
+    # Poda: mantém apenas os arcos que estão em algum caminho de s até z
+    reach_forward = {"s"}
+    reach_backward = {"z"}
+    changed = True
+    while changed:
+        changed = False
+        for arc in arcs:
+            if arc["tail"] in reach_forward and arc["head"] not in reach_forward:
+                reach_forward.add(arc["head"])
+                changed = True
+            if arc["head"] in reach_backward and arc["tail"] not in reach_backward:
+                reach_backward.add(arc["tail"])
+                changed = True
+    return [arc for arc in arcs if arc["tail"] in reach_forward and arc["head"] in reach_backward]
+
+
+# Função para montar a formulação de fluxo em forma matricial
+# Com propagate=True, os arcos de aula só usam tempos que sobrevivem à propagação de domínios; sem
+# ela, os eventos pré-atribuídos continuam restritos ao seu bloco de tempos.
+def build_flow_model(instance, propagate=False):
+    events = [event for event in instance["events"] if event["duration"] > 0]
+    missing_teacher = [event["id"] for event in events if not event["teacher"]]
+    if missing_teacher:
+        raise ValueError(f"A formulação de fluxo exige um professor por evento; {len(missing_teacher)} evento(s) sem professor.")
+
+    domains = None
+    if propagate:
+        propagation = propagate_domains(instance)
+        if propagation["infeasible"]:
+            raise ValueError("Propagação de domínios: " + " ".join(propagation["infeasible"]))
+        domains = propagation["domains"]
+    else:
+        blocks = {event["id"]: preassigned_block(instance, event) for event in events}
+        if any(block is not None for block in blocks.values()):
+            all_times = {time["id"] for time in instance["times"]}
+            domains = {event_id: all_times if block is None else block for event_id, block in blocks.items()}
+
+    model = new_model(instance["id"])
+    teacher_events = {}
+    for event in events:
+        teacher_events.setdefault(event["teacher"], []).append(event)
+
+    event_arcs = {event["id"]: [] for event in events}  # (coluna, arco) das aulas de cada evento
+    longest_day = max(len(instance["day_times"][day]) for day in instance["days"])
+
+    for teacher, assigned in teacher_events.items():
+        start_indices = []
+        for day in instance["days"]:
+            arcs = _day_arcs(instance, teacher, day, assigned, domains)
+            node_terms = {}
+            for arc in arcs:
+                if arc["kind"] == "lesson":
+                    name = f"f_{teacher}_{day}_lesson_{arc['event']['id']}_{arc['tail']}_{arc['size']}"
+                    index = add_column(model, name, kind="B", upper=1, key=("x", arc["event"]["id"], tuple(arc["times"])))
+                    event_arcs[arc["event"]["id"]].append((index, arc))
+                elif arc["kind"] == "idle":
+                    index = add_column(model, f"f_{teacher}_{day}_idle_{arc['tail']}", cost=OMEGA, kind="B", upper=1)
+                elif arc["kind"] == "start":
+                    index = add_column(model, f"f_{teacher}_{day}_start_{arc['head']}", cost=GAMMA, kind="B", upper=1)
+                    start_indices.append(index)
+                else:
+                    index = add_column(model, f"f_{teacher}_{day}_{arc['kind']}_{arc['tail']}", kind="B", upper=1)
+                # Arco sai de "tail" (A+) e entra em "head" (A-)
+                node_terms.setdefault(arc["tail"], []).append((index, 1))
+                node_terms.setdefault(arc["head"], []).append((index, -1))
+
+            # Conservação de fluxo
+            for node, terms in node_terms.items():
+                b_v = 1 if node == "s" else -1 if node == "z" else 0
+                add_row(model, f"FLOW_{teacher}_{day}_{node}", "FLOW", [index for index, _ in terms], [coef for _, coef in terms], "=", b_v)
+
+        # Mínimo de dias de trabalho (Y'_t): carga / maior número de períodos em um dia
+        load = sum(event["duration"] for event in assigned)
+        add_row(model, f"S2_min_{teacher}", "S2", start_indices, [1] * len(start_indices), ">=", math.ceil(load / longest_day))
+
+    # H1: Carga horária (soma de S_ta x_ta = H)
+    for event in events:
+        arcs = event_arcs[event["id"]]
+        add_row(model, f"H1_{event['id']}", "H1", [index for index, _ in arcs], [arc["size"] for _, arc in arcs], "=", event["duration"])
+
+    # H3: Conflitos dos demais recursos (turmas, salas, segundo professor). Recursos usados
+    # apenas como professor do próprio caminho já são protegidos pela conservação de fluxo.
+    resource_events = {}
+    for event in events:
+        for resource in event["resources"]:
+            resource_events.setdefault(resource["reference"], []).append(event)
+    for resource_id, users in resource_events.items():
+        if len(users) < 2 or all(event["teacher"] == resource_id for event in users):
+            continue
+        by_time = {}
+        for event in users:
+            for index, arc in event_arcs[event["id"]]:
+                for time_id in arc["times"]:
+                    by_time.setdefault(time_id, []).append(index)
+        for time_id, indices in by_time.items():
+            if len(indices) > 1:
+                add_row(model, f"H3_{resource_id}_{time_id}", "H3", indices, [1] * len(indices), "<=", 1)
+
+    # Capacidade de salas: apenas os eventos compatíveis com cada conjunto de salas
+    event_time_columns = {}
+    for event_id, arcs in event_arcs.items():
+        for index, arc in arcs:
+            for time_id in arc["times"]:
+                event_time_columns.setdefault((event_id, time_id), []).append(index)
+    add_room_capacity_rows(model, instance, event_time_columns)
+
+    # H5: Máximo de aulas diárias
+    time_days = {time["id"]: time["day"] for time in instance["times"]}
+    for event in events:
+        if event["max_daily"] >= event["duration"]:
+            continue
+        by_day = {}
+        for index, arc in event_arcs[event["id"]]:
+            by_day.setdefault(time_days[arc["times"][0]], []).append((index, arc["size"]))
+        for day, terms in by_day.items():
+            add_row(model, f"H5_{event['id']}_{day}", "H5", [index for index, _ in terms], [size for _, size in terms], "<=", event["max_daily"])
+
+    # S3: Aulas duplas não atendidas: g + soma(arcos duplos) >= M
+    for event in events:
+        if not event["double_lessons"]:
+            continue
+        doubles = [index for index, arc in event_arcs[event["id"]] if arc["size"] == 2]
+        missing = add_column(model, f"g_{event['id']}", cost=DELTA)
+        add_row(model, f"S3_{event['id']}", "S3", [missing] + doubles, [1] * (len(doubles) + 1), ">=", event["double_lessons"])
+
+    return model
@@ -0,0 +1,92 @@
+import os
+import tempfile
+
+from analisePrevia import analyse_instance, gap, print_analysis
+from formulacaoAtribuicao import build_assignment_model
+from formulacaoFluxo import build_flow_model
+from instanciaXHSTT import read_instance
+from modeloMatricial import extract_timetable, model_statistics, permuted_model, write_lp
+from salas import assign_rooms
+from solverLocal import solve_lp
+
+# Formulações disponíveis sobre a instância lida por instanciaXHSTT
+FORMULATIONS = {
+    "assignment": build_assignment_model,
+    "flow": build_flow_model,
+}
+
+
+# Função para montar o modelo de uma formulação
+def build_model(instance, formulation="assignment", **options):
+    if formulation not in FORMULATIONS:
+        raise ValueError(f"Formulação desconhecida: {formulation}")
+    return FORMULATIONS[formulation](instance, **options)
+
+
+# Função principal: lê o XML, monta a formulação escolhida e gera o LP e as legendas.
+# A ordem das linhas e colunas é determinística; permutation_seed embaralha as duas com essa semente.
+def parse_xml_and_generate_model(file_path, lp_output_path, legend_output_path=None, constraints_output_path=None,
+                                 formulation="assignment", instance_id=None, permutation_seed=None, **options):
+    instance = read_instance(file_path, instance_id)
+    model = build_model(instance, formulation, **options)
+    if permutation_seed is not None:
+        model = permuted_model(model, permutation_seed)
+    write_lp(model, lp_output_path, legend_output_path, constraints_output_path)
+    return model
+
+
+# Função para montar e resolver a formulação de uma instância já lida e ler o quadro de horários.
+# Com with_rooms=True, as salas são atribuídas depois, por emparelhamento em cada tempo.
+# Com precheck=True, a análise prévia evita chamar o resolvedor em instâncias sem solução e
+# o resultado ganha o limitante inferior combinatório ("pre_bound") e o gap até ele.
+# Com permutation_seed, o LP é escrito com linhas e colunas permutadas por essa semente.
+def solve_model(instance, formulation="assignment", solver="highs", time_limit=None, with_rooms=False, precheck=True,
+                permutation_seed=None, **options):
+    analysis = analyse_instance(instance) if precheck else None
+    if analysis and not analysis["feasible"]:
+        print_analysis(instance["id"], analysis)
+        return {"status": "infeasible (pre-check)", "objective": None, "bound": None, "time": 0.0,
+                "first_feasible": None, "values": {}, "log": "\n".join(analysis["issues"]), "timetable": {},
+                "pre_bound": analysis["lower_bound"], "gap": None}
+    model = build_model(instance, formulation, **options)
+    if permutation_seed is not None:
+        model = permuted_model(model, permutation_seed)
+    with tempfile.TemporaryDirectory() as workdir:
+        lp_path = os.path.join(workdir, f"{instance['id']}_{formulation}.lp")
+        write_lp(model, lp_path)
+        result = solve_lp(lp_path, solver, time_limit)
+    result["timetable"] = extract_timetable(model, result["values"])
+    result.update(model_statistics(model))
+    if analysis:
+        result["pre_bound"] = analysis["lower_bound"]
+        result["gap"] = gap(result["objective"], max(analysis["lower_bound"], result["bound"] or 0))
+    if with_rooms:
+        result["rooms"], result["unassigned_rooms"] = assign_rooms(instance, result["timetable"])
+    return result
+
+
+# Função para ler o XML e resolver a formulação escolhida (ver solve_model)
+def solve_instance(file_path, formulation="assignment", solver="highs", time_limit=None, instance_id=None,
+                   with_rooms=False, **options):
+    instance = read_instance(file_path, instance_id)
+    return solve_model(instance, formulation, solver, time_limit, with_rooms, **options)
+
+
+# Exemplo: python Códigos-fontes/formulacoes.py Instâncias/BrazilInstance1.xml flow [semente da permutação]
+if __name__ == "__main__":
+    import sys
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else "./Instâncias/BrazilInstance1.xml"
+    formulation = sys.argv[2] if len(sys.argv) > 2 else "assignment"
+    permutation_seed = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    os.makedirs("./outputs/lps", exist_ok=True)
+    os.makedirs("./outputs/txt", exist_ok=True)
+    parse_xml_and_generate_model(
+        file_path,
+        f"./outputs/lps/{name}_{formulation}.lp",
+        f"./outputs/txt/{name}_{formulation}_legend.txt",
+        f"./outputs/txt/{name}_{formulation}_constraints.txt",
+        formulation=formulation,
+        permutation_seed=permutation_seed
+    )
@@ -0,0 +1,263 @@
+import os
+import tempfile
+
+from formulacaoAtribuicao import DELTA, GAMMA, OMEGA
+from instanciaXHSTT import read_instance
+from modeloMatricial import add_column, add_row, new_model, write_lp
+from solverLocal import solve_lp
+
+# Geração de colunas sobre padrões diários de cada professor. Um padrão é o dia de um professor:
+# a aula (evento) de cada período ou período livre. O problema mestre escolhe um padrão por
+# (professor, dia):
+#   H1_<evento>:          soma das aulas do evento nos padrões + artificial = duração
+#   CONV_<prof>_<dia>:    soma dos padrões do (professor, dia) = 1 (o padrão vazio sempre existe)
+#   H3_<recurso>_<tempo>: padrões que usam a turma/sala no tempo <= 1
+#   S3_<evento>:          g + soma das duplas nos padrões >= duplas pedidas
+# O custo do padrão é γ se houver aula no dia mais ω por período ocioso entre aulas (como no
+# caminho da formulação de fluxo). O pricing é uma programação dinâmica por rótulos sobre os
+# períodos do dia, com o máximo diário de cada evento e os tempos indisponíveis.
+
+ARTIFICIAL_COST = 1000
+
+
+# Função para montar os dados do problema: eventos por professor, recursos das linhas H3 e bloqueios
+def build_pattern_data(instance):
+    events = [event for event in instance["events"] if event["duration"] > 0]
+    missing_teacher = [event["id"] for event in events if not event["teacher"]]
+    if missing_teacher:
+        raise ValueError(f"A geração de colunas exige um professor por evento; {len(missing_teacher)} evento(s) sem professor.")
+
+    teacher_events = {}
+    resource_events = {}
+    for event in events:
+        teacher_events.setdefault(event["teacher"], []).append(event)
+        for resource in event["resources"]:
+            resource_events.setdefault(resource["reference"], []).append(event)
+    # Recursos que não são só o professor dos próprios eventos entram nas linhas H3
+    shared = {resource_id for resource_id, users in resource_events.items()
+              if len(users) > 1 and not all(event["teacher"] == resource_id for event in users)}
+
+    blocked = {}
+    for event in events:
+        blocked[event["id"]] = set()
+        for resource in event["resources"]:
+            blocked[event["id"]].update(instance["unavailable"].get(resource["reference"], ()))
+    return {"events": {event["id"]: event for event in events}, "teacher_events": teacher_events,
+            "shared": shared, "blocked": blocked}
+
+
+# Função para calcular o custo de um padrão: γ se não for vazio e ω por período ocioso entre aulas
+def pattern_cost(lessons, day_times):
+    if not lessons:
+        return 0
+    used = sorted(day_times.index(time_id) for _, time_id in lessons)
+    idle = used[-1] - used[0] + 1 - len(used)
+    return GAMMA + OMEGA * idle
+
+
+# Função para contar as aulas duplas de cada evento em um padrão (pares de períodos seguidos)
+def _pattern_doubles(lessons, day_times):
+    by_period = {day_times.index(time_id): event_id for event_id, time_id in lessons}
+    doubles = {}
+    for period, event_id in by_period.items():
+        if by_period.get(period + 1) == event_id:
+            doubles[event_id] = doubles.get(event_id, 0) + 1
+    return doubles
+
+
+# Função para montar o problema mestre restrito com os padrões atuais.
+# Com integer=True os padrões são binários e as artificiais ficam de fora (price-and-branch).
+def build_master(instance, data, patterns, integer=False):
+    model = new_model(f"{instance['id']}_master")
+    rows = {}
+    h1 = {event_id: ([], []) for event_id in data["events"]}
+    convexity = {}
+    conflicts = {}
+    doubles = {event_id: ([], []) for event_id, event in data["events"].items() if event["double_lessons"]}
+
+    for (teacher, day), day_patterns in patterns.items():
+        day_times = instance["day_times"][day]
+        for number, lessons in enumerate(day_patterns):
+            index = add_column(model, f"p_{teacher}_{day}_{number}", cost=pattern_cost(lessons, day_times),
+                               kind="B" if integer else "C", upper=1, key=("pattern", teacher, day, lessons))
+            convexity.setdefault((teacher, day), []).append(index)
+            counts = {}
+            for event_id, time_id in lessons:
+                counts[event_id] = counts.get(event_id, 0) + 1
+                for resource in data["events"][event_id]["resources"]:
+                    if resource["reference"] in data["shared"]:
+                        conflicts.setdefault((resource["reference"], time_id), []).append(index)
+            for event_id, count in counts.items():
+                h1[event_id][0].append(index)
+                h1[event_id][1].append(count)
+            for event_id, count in _pattern_doubles(lessons, day_times).items():
+                if event_id in doubles:
+                    doubles[event_id][0].append(index)
+                    doubles[event_id][1].append(count)
+
+    for event_id, (indices, coefs) in h1.items():
+        if not integer:
+            indices, coefs = indices + [add_column(model, f"art_{event_id}", cost=ARTIFICIAL_COST)], coefs + [1]
+        if indices:
+            rows["H1", event_id] = add_row(model, f"H1_{event_id}", "H1", indices, coefs, "=", data["events"][event_id]["duration"])
+    for (teacher, day), indices in convexity.items():
+        rows["CONV", (teacher, day)] = add_row(model, f"CONV_{teacher}_{day}", "CONV", indices, [1] * len(indices), "=", 1)
+    for (resource_id, time_id), indices in conflicts.items():
+        if len(indices) > 1:
+            rows["H3", (resource_id, time_id)] = add_row(model, f"H3_{resource_id}_{time_id}", "H3", indices, [1] * len(indices), "<=", 1)
+    for event_id, (indices, coefs) in doubles.items():
+        missing = add_column(model, f"g_{event_id}", cost=DELTA)
+        rows["S3", event_id] = add_row(model, f"S3_{event_id}", "S3", [missing] + indices, [1] + coefs, ">=",
+                                       data["events"][event_id]["double_lessons"])
+    return model, rows
+
+
+# Função de pricing: programação dinâmica por rótulos sobre os períodos do dia.
+# Estado: (fase, último evento, períodos ociosos pendentes); fase "before" (sem aula ainda),
+# "busy" (aula no período anterior) ou "gap" (livre depois de uma aula). Cada rótulo guarda o
+# custo reduzido parcial, as aulas por evento (para o máximo diário) e as aulas escolhidas.
+# max_labels limita os rótulos por estado (pricing heurístico; o limitante deixa de ser exato).
+# day_cost e idle_cost são os custos do dia de trabalho e do período ocioso (γ e ω; a relaxação
+# lagrangiana usa 0 para os eventos sem professor); com nonempty=True o padrão vazio não conta.
+# Devolve (custo reduzido, aulas) do melhor padrão (custo infinito se nenhum padrão couber).
+def price_pattern(instance, data, teacher, day, duals, max_labels=None, day_cost=GAMMA, idle_cost=OMEGA, nonempty=False):
+    day_times = instance["day_times"][day]
+    events = data["teacher_events"][teacher]
+    position = {event["id"]: number for number, event in enumerate(events)}
+    limits = [min(event["max_daily"], event["duration"]) for event in events]
+
+    # Contribuição de cada (evento, tempo): -π_e - soma dos μ dos recursos compartilhados
+    lesson_value = {}
+    for event in events:
+        for time_id in day_times:
+            if time_id in data["blocked"][event["id"]]:
+                continue
+            value = -duals.get(("H1", event["id"]), 0.0)
+            for resource in event["resources"]:
+                value -= duals.get(("H3", (resource["reference"], time_id)), 0.0)
+            lesson_value[event["id"], time_id] = value
+
+    labels = {("before", None, 0): [(0.0, (0,) * len(events), ())]}
+    for time_id in day_times:
+        extended = {}
+
+        def push(state, label):
+            extended.setdefault(state, []).append(label)
+
+        for (phase, last, pending), state_labels in labels.items():
+            for cost, counts, lessons in state_labels:
+                # Período livre
+                if phase == "before":
+                    push(("before", None, 0), (cost, counts, lessons))
+                else:
+                    push(("gap", None, pending + 1), (cost, counts, lessons))
+                # Aula de cada evento permitido no tempo
+                for event in events:
+                    key = (event["id"], time_id)
+                    slot = position[event["id"]]
+                    if key not in lesson_value or counts[slot] >= limits[slot]:
+                        continue
+                    new_cost = cost + lesson_value[key]
+                    new_cost += day_cost if phase == "before" else idle_cost * pending
+                    if phase == "busy" and last == event["id"]:
+                        new_cost -= duals.get(("S3", event["id"]), 0.0)
+                    new_counts = counts[:slot] + (counts[slot] + 1,) + counts[slot + 1:]
+                    push(("busy", event["id"], 0), (new_cost, new_counts, lessons + (key,)))
+
+        # Dominância: para o mesmo estado e as mesmas aulas por evento, fica o rótulo de menor custo
+        labels = {}
+        for state, state_labels in extended.items():
+            cheapest = {}
+            for label in state_labels:
+                if label[1] not in cheapest or label[0] < cheapest[label[1]][0]:
+                    cheapest[label[1]] = label
+            kept = sorted(cheapest.values(), key=lambda label: label[0])
+            labels[state] = kept[:max_labels] if max_labels else kept
+
+    best_cost, best_lessons = (float("inf"), ()) if nonempty else (0.0, ())
+    for (phase, _, _), state_labels in labels.items():
+        for cost, _, lessons in state_labels:
+            if cost < best_cost and (lessons or not nonempty):
+                best_cost, best_lessons = cost, lessons
+    return best_cost - duals.get(("CONV", (teacher, day)), 0.0), best_lessons
+
+
+# Função para resolver o mestre e traduzir os duais para as chaves das linhas
+def _solve_master(model, rows, solver, time_limit, integer=False):
+    with tempfile.TemporaryDirectory() as workdir:
+        lp_path = os.path.join(workdir, "master.lp")
+        write_lp(model, lp_path)
+        result = solve_lp(lp_path, solver, time_limit, duals=not integer)
+    result["row_duals"] = {key: result["duals"].get(f"c{index + 1}", 0.0) for key, index in rows.items()}
+    return result
+
+
+# Função principal da geração de colunas. Devolve {"bound" (LP do mestre ao convergir),
+# "lagrangian_bound" (z_mestre + soma dos custos reduzidos mínimos, válido em toda iteração),
+# "patterns", "history" [(objetivo do mestre, limitante lagrangiano, colunas novas)], "converged"}
+def column_generation(instance, solver="highs", max_iterations=200, time_limit=None, max_labels=None):
+    data = build_pattern_data(instance)
+    patterns = {(teacher, day): [()] for teacher in data["teacher_events"] for day in instance["days"]}
+    history = []
+    best_lagrangian = -float("inf")
+    converged = False
+    master = None
+    for _ in range(max_iterations):
+        model, rows = build_master(instance, data, patterns)
+        master = _solve_master(model, rows, solver, time_limit)
+        if master["objective"] is None:
+            print("Erro: o resolvedor não resolveu o problema mestre.")
+            break
+        added = 0
+        reduced_total = 0.0
+        for (teacher, day), day_patterns in patterns.items():
+            reduced, lessons = price_pattern(instance, data, teacher, day, master["row_duals"], max_labels)
+            if reduced < -1e-6 and lessons not in day_patterns:
+                day_patterns.append(lessons)
+                added += 1
+            reduced_total += min(0.0, reduced)
+        best_lagrangian = max(best_lagrangian, master["objective"] + reduced_total)
+        history.append((master["objective"], master["objective"] + reduced_total, added))
+        if not added:
+            converged = True
+            break
+
+    artificial = sum(value for name, value in master["values"].items() if value > 1e-6 and
+                     model["columns"][int(name[1:]) - 1]["name"].startswith("art_")) if master else 0
+    if artificial > 1e-6:
+        print("Aviso: o mestre terminou com variáveis artificiais positivas; o LP pode ser inviável.")
+    return {
+        "bound": master["objective"] if converged and master else None,
+        "lagrangian_bound": best_lagrangian,
+        "patterns": patterns,
+        "history": history,
+        "converged": converged,
+    }
+
+
+# Função price-and-branch: resolve o mestre inteiro com os padrões gerados.
+# Devolve o resultado do resolvedor com o quadro de horários {evento: [tempos]} em "timetable".
+def price_and_branch(instance, solver="highs", time_limit=None, max_iterations=200, max_labels=None):
+    generation = column_generation(instance, solver, max_iterations, time_limit, max_labels)
+    data = build_pattern_data(instance)
+    model, rows = build_master(instance, data, generation["patterns"], integer=True)
+    result = _solve_master(model, rows, solver, time_limit, integer=True)
+    timetable = {}
+    for index, column in enumerate(model["columns"]):
+        if column["key"] and result["values"].get(f"x{index + 1}", 0) > 0.5:
+            for event_id, time_id in column["key"][3]:
+                timetable.setdefault(event_id, []).append(time_id)
+    result.update({"timetable": timetable, "lp_bound": generation["bound"], "lagrangian_bound": generation["lagrangian_bound"]})
+    return result
+
+
+# Exemplo: python Códigos-fontes/geracaoColunas.py Instâncias/BrazilInstance7.xml highs
+if __name__ == "__main__":
+    import sys
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else "./Instâncias/BrazilInstance1.xml"
+    solver = sys.argv[2] if len(sys.argv) > 2 else "highs"
+    result = column_generation(read_instance(file_path), solver)
+    for iteration, (objective, lagrangian, added) in enumerate(result["history"], start=1):
+        print(f"{iteration:4d}  mestre={objective:.2f}  lagrangiano={lagrangian:.2f}  colunas novas={added}")
+    print(f"Limitante LP: {result['bound']}  (convergiu: {result['converged']})")
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import time
+
+from formulacoes import build_model
+from instanciaXHSTT import read_instance
+from modeloMatricial import extract_timetable, model_statistics, write_lp
+from solverLocal import solve_lp
+
+# Geração de linhas: as linhas de conflito dos recursos que não são professores (H3) começam fora
+# do modelo. As ligações busy = Σx dos professores (H2) ficam sempre no modelo, pois os períodos
+# ociosos e os dias de trabalho dependem delas. A cada iteração o modelo restrito é resolvido, a
+# solução é verificada contra as linhas de conflito pendentes e só as violadas entram; o próximo
+# solve recebe a solução anterior como MIP start. Termina quando nenhuma linha pendente é violada
+# ou no limite de iterações (com o status "iteration limit (infeasible for full model)" se ainda
+# houver linhas violadas).
+
+LAZY_FAMILIES = ("H3",)
+
+
+# Função para criar a cópia do modelo com apenas as linhas informadas
+def _with_rows(model, row_indices):
+    return dict(model, rows=[model["rows"][index] for index in sorted(row_indices)])
+
+
+# Função para verificar se uma linha é violada pelos valores (por x<i>)
+def row_violated(row, values, tolerance=1e-6):
+    activity = sum(coef * values.get(f"x{index + 1}", 0.0) for index, coef in zip(row["indices"], row["coefs"]))
+    if row["sense"] == "<=":
+        return activity > row["rhs"] + tolerance
+    if row["sense"] == ">=":
+        return activity < row["rhs"] - tolerance
+    return abs(activity - row["rhs"]) > tolerance
+
+
+# Função principal. Devolve o resultado do último solve com "iterations", "timetable",
+# "history" [(linhas ativas, linhas adicionadas, objetivo, tempo)] e os tamanhos do modelo
+# completo ("full") e do modelo final ("final"); "time" é a soma dos tempos de todos os solves.
+def solve_with_lazy_rows(instance, formulation="assignment", solver="highs", time_limit=None, max_iterations=50,
+                         lazy_families=LAZY_FAMILIES, **options):
+    model = build_model(instance, formulation, **options)
+    active = {index for index, row in enumerate(model["rows"]) if row["family"] not in lazy_families}
+    pending = {index for index, row in enumerate(model["rows"]) if row["family"] in lazy_families}
+    history = []
+    start_values = None
+    result = None
+
+    with tempfile.TemporaryDirectory() as workdir:
+        lp_path = os.path.join(workdir, "lazy.lp")
+        for iteration in range(1, max_iterations + 1):
+            restricted = _with_rows(model, active)
+            write_lp(restricted, lp_path)
+            result = solve_lp(lp_path, solver, time_limit, mip_start=start_values)
+            if not result["values"]:
+                print(f"Erro: sem solução na iteração {iteration} ({result['status']}).")
+                break
+            violated = {index for index in pending if row_violated(model["rows"][index], result["values"])}
+            history.append((len(active), len(violated), result["objective"], result["time"]))
+            print(f"Iteração {iteration}: {len(active)} linhas, {len(violated)} linhas de conflito violadas, "
+                  f"objetivo {result['objective']}")
+            if not violated:
+                break
+            if iteration == max_iterations:
+                result["status"] = "iteration limit (infeasible for full model)"
+                break
+            active |= violated
+            pending -= violated
+            start_values = result["values"]
+
+    result = result or {"status": "error", "objective": None, "values": {}}
+    result.update({
+        "time": sum(entry[3] for entry in history) if history else result.get("time"),
+        "iterations": len(history),
+        "history": history,
+        "timetable": extract_timetable(model, result["values"]),
+        "full": model_statistics(model),
+        "final": model_statistics(_with_rows(model, active)),
+    })
+    return result
+
+
+# Exemplo: python Códigos-fontes/geracaoLinhas.py Instâncias/KosovaInstance1.xml highs 600
+if __name__ == "__main__":
+    import sys
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else "./Instâncias/BrazilInstance1.xml"
+    solver = sys.argv[2] if len(sys.argv) > 2 else "highs"
+    time_limit = float(sys.argv[3]) if len(sys.argv) > 3 else None
+    start = time.perf_counter()
+    result = solve_with_lazy_rows(read_instance(file_path), solver=solver, time_limit=time_limit)
+    print(f"Iterações: {result['iterations']}  Objetivo: {result['objective']}  Tempo total: {time.perf_counter() - start:.2f}s")
+    print(f"Modelo completo: {result['full']}")
+    print(f"Modelo final:    {result['final']}")
@@ -0,0 +1,117 @@
+import os
+import tempfile
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from formulacaoAtribuicao import FAMILIES, build_layout
+from instanciaXHSTT import read_instance
+from modeloMatricial import write_lp_from_shards, write_row_shard
+
+# Geração paralela de uma única instância: cada família de restrições de formulacaoAtribuicao é
+# dividida em fatias contíguas dos seus donos (eventos, professores/turmas/salas, grupos de salas)
+# e as fatias rodam em um pool de processos. A instância vai uma vez para cada processo (no
+# inicializador), que monta o próprio layout; como a numeração das colunas é determinística, todos
+# os processos usam os mesmos índices. Cada fatia vira:
+#   lp:  um pedaço de linhas sem numeração, gravado em disco; o processo principal junta os pedaços
+#        na ordem do plano, numera as linhas (c1, c2, ...) e escreve objetivo, limites e legendas.
+#        O LP final é idêntico, byte a byte, ao de write_lp_stream.
+#   coo: um bloco (linha, coluna, valor, sentido, rhs) com linhas locais, deslocadas na junção.
+# O MPS não é gerado por fatias: a seção COLUMNS é ordenada por coluna e precisa de todas as linhas.
+# options: as demais opções de build_assignment_model (conflict_rows, clique_cuts, propagate, pinned).
+
+_worker = {}
+
+
+# Função para montar o plano de fatias: [(família, (parte, partes))], na ordem do modelo.
+# Cada família é dividida em "parts" fatias (por padrão, 4 por processo).
+def shard_plan(families=tuple(FAMILIES), workers=None, parts=None):
+    parts = parts or 4 * (workers or os.cpu_count() or 1)
+    return [(family, (index, parts)) for family in families for index in range(parts)]
+
+
+# Inicializador dos processos: guarda a instância e monta o layout uma única vez por processo
+def _init_worker(instance, working_day_mode, options):
+    _worker["instance"] = instance
+    _worker["layout"] = build_layout(instance, working_day_mode, **options)
+
+
+# Função para gerar as linhas de uma fatia no processo atual
+def _shard_rows(family, shard):
+    return FAMILIES[family](_worker["instance"], _worker["layout"], shard)
+
+
+# Tarefa lp: grava o pedaço de linhas da fatia e devolve o número de linhas
+def _write_shard(task):
+    family, shard, shard_path = task
+    return write_row_shard(_shard_rows(family, shard), shard_path)
+
+
+# Tarefa coo: devolve o bloco da fatia com as linhas numeradas a partir de 0
+def _coo_block(task):
+    family, shard = task
+    block = {"row": array("i"), "column": array("i"), "value": array("d"), "sense": [], "rhs": array("d")}
+    for number, row in enumerate(_shard_rows(family, shard)):
+        block["row"].extend([number] * len(row["indices"]))
+        block["column"].extend(row["indices"])
+        block["value"].extend(row["coefs"])
+        block["sense"].append(row["sense"])
+        block["rhs"].append(row["rhs"])
+    return block
+
+
+# Função para abrir o pool com a instância já distribuída aos processos
+def _executor(instance, working_day_mode, workers, options):
+    return ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker,
+                               initargs=(instance, working_day_mode, options))
+
+
+# Função principal (lp): gera o LP e as legendas por fatias em paralelo.
+# Devolve {"rows", "columns", "shards", "time"}.
+def generate_lp_sharded(instance, lp_output_path, legend_output_path=None, constraints_output_path=None, workers=None,
+                        working_day_mode="disaggregated", families=tuple(FAMILIES), parts=None, legend_format="text", **options):
+    start = time.perf_counter()
+    layout = build_layout(instance, working_day_mode, **options)
+    plan = shard_plan(families, workers, parts)
+    with tempfile.TemporaryDirectory() as workdir:
+        shard_paths = [os.path.join(workdir, f"shard{number}.txt") for number in range(len(plan))]
+        with _executor(instance, working_day_mode, workers, options) as executor:
+            counts = list(executor.map(_write_shard, [(family, shard, path) for (family, shard), path in zip(plan, shard_paths)]))
+        write_lp_from_shards(layout["columns"], shard_paths, lp_output_path, legend_output_path, constraints_output_path,
+                             legend_format)
+    return {"rows": sum(counts), "columns": len(layout["columns"]), "shards": len(plan), "time": time.perf_counter() - start}
+
+
+# Função principal (coo): monta a matriz esparsa por fatias em paralelo, no formato de
+# geradoresDeLinhas.assemble_coo (as linhas de cada bloco são deslocadas pelas linhas anteriores).
+def generate_coo_sharded(instance, workers=None, working_day_mode="disaggregated", families=tuple(FAMILIES), parts=None,
+                         **options):
+    layout = build_layout(instance, working_day_mode, **options)
+    matrix = {"row": array("i"), "column": array("i"), "value": array("d"), "sense": [], "rhs": array("d"),
+              "cost": array("d", (column["cost"] for column in layout["columns"])), "shape": None}
+    offset = 0
+    with _executor(instance, working_day_mode, workers, options) as executor:
+        for block in executor.map(_coo_block, shard_plan(families, workers, parts)):
+            matrix["row"].extend(row + offset for row in block["row"])
+            matrix["column"].extend(block["column"])
+            matrix["value"].extend(block["value"])
+            matrix["sense"].extend(block["sense"])
+            matrix["rhs"].extend(block["rhs"])
+            offset += len(block["rhs"])
+    matrix["shape"] = (offset, len(layout["columns"]))
+    return matrix
+
+
+# Exemplo: python Códigos-fontes/geracaoParalela.py Instâncias/NetherlandsKottenpark2003.xml 8
+if __name__ == "__main__":
+    import sys
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else "./Instâncias/BrazilInstance1.xml"
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    os.makedirs("./outputs/lps", exist_ok=True)
+    os.makedirs("./outputs/txt", exist_ok=True)
+    result = generate_lp_sharded(read_instance(file_path), f"./outputs/lps/{name}_sharded.lp",
+                                 f"./outputs/txt/{name}_sharded_legend.txt", f"./outputs/txt/{name}_sharded_constraints.txt",
+                                 workers)
+    print(f"{name}: {result['rows']} linhas, {result['columns']} colunas, {result['shards']} fatias, {result['time']:.2f}s")
@@ -0,0 +1,90 @@
+from array import array
+
+from formulacaoAtribuicao import FAMILIES, build_layout, model_rows
+from instanciaXHSTT import read_instance
+from modeloMatricial import write_lp_stream, write_mps_stream
+
+# Geração em fluxo da formulação de atribuição. O layout (colunas numeradas) e os geradores de
+# cada família de restrições são os de formulacaoAtribuicao (build_layout, FAMILIES, model_rows),
+# os mesmos que build_assignment_model junta em um modelo; aqui as linhas, no formato de
+# modeloMatricial, vão uma por vez para consumidores que as leem uma única vez:
+#   lp / mps:   escrevem o arquivo (e a legenda de restrições) sem guardar as linhas
+#   coo:        monta a matriz esparsa em vetores compactos (linha, coluna, valor)
+#   highs:      carrega o modelo direto no HiGHS em memória (highspy)
+#   statistics: conta linhas, não-zeros e linhas por família
+# As fatias de cada família (shard) são usadas por geracaoParalela.py.
+
+
+# Consumidor: conta linhas, colunas, não-zeros e linhas por família
+def row_statistics(layout, rows):
+    statistics = {"rows": 0, "columns": len(layout["columns"]), "nonzeros": 0, "families": {}}
+    for row in rows:
+        statistics["rows"] += 1
+        statistics["nonzeros"] += len(row["indices"])
+        statistics["families"][row["family"]] = statistics["families"].get(row["family"], 0) + 1
+    return statistics
+
+
+# Consumidor: matriz esparsa em coordenadas (COO) em vetores compactos, com sentido, lado direito e
+# custos. Os vetores podem ser passados sem cópia para numpy (np.frombuffer).
+def assemble_coo(layout, rows):
+    matrix = {"row": array("i"), "column": array("i"), "value": array("d"), "sense": [], "rhs": array("d"),
+              "cost": array("d", (column["cost"] for column in layout["columns"])), "shape": None}
+    number = 0
+    for number, row in enumerate(rows, start=1):
+        matrix["row"].extend([number - 1] * len(row["indices"]))
+        matrix["column"].extend(row["indices"])
+        matrix["value"].extend(row["coefs"])
+        matrix["sense"].append(row["sense"])
+        matrix["rhs"].append(row["rhs"])
+    matrix["shape"] = (number, len(layout["columns"]))
+    return matrix
+
+
+# Consumidor: carrega o modelo no HiGHS em memória, linha por linha, sem passar por arquivo.
+# highspy é importado aqui porque só este consumidor depende dele.
+def load_highs(layout, rows):
+    import highspy
+
+    highs = highspy.Highs()
+    infinity = highspy.kHighsInf
+    for index, column in enumerate(layout["columns"]):
+        lower = -infinity if column["lower"] is None else column["lower"]
+        upper = infinity if column["upper"] is None else column["upper"]
+        if column["kind"] == "B" and column["upper"] is None:
+            upper = 1
+        highs.addCol(column["cost"], lower, upper, 0, [], [])
+        if column["kind"] != "C":
+            highs.changeColIntegrality(index, highspy.HighsVarType.kInteger)
+    for row in rows:
+        lower = row["rhs"] if row["sense"] in (">=", "=") else -infinity
+        upper = row["rhs"] if row["sense"] in ("<=", "=") else infinity
+        highs.addRow(lower, upper, len(row["indices"]), row["indices"], row["coefs"])
+    return highs
+
+
+# Função principal: monta o layout e entrega as linhas, em fluxo, a cada consumidor
+# (consumers: {nome: função(layout, linhas)}). Cada consumidor recebe um gerador novo.
+# options: as demais opções de build_assignment_model (conflict_rows, clique_cuts, propagate, pinned).
+def stream_model(instance, consumers, working_day_mode="disaggregated", families=tuple(FAMILIES), **options):
+    layout = build_layout(instance, working_day_mode, **options)
+    return {name: consumer(layout, model_rows(instance, layout, families)) for name, consumer in consumers.items()}
+
+
+# Exemplo: python Códigos-fontes/geradoresDeLinhas.py Instâncias/NetherlandsKottenpark2003.xml
+if __name__ == "__main__":
+    import os
+    import sys
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else "./Instâncias/BrazilInstance1.xml"
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    os.makedirs("./outputs/lps", exist_ok=True)
+    os.makedirs("./outputs/txt", exist_ok=True)
+    results = stream_model(read_instance(file_path), {
+        "statistics": row_statistics,
+        "lp": lambda layout, rows: write_lp_stream(layout["columns"], rows, f"./outputs/lps/{name}_stream.lp",
+                                                   f"./outputs/txt/{name}_stream_legend.txt",
+                                                   f"./outputs/txt/{name}_stream_constraints.txt"),
+        "mps": lambda layout, rows: write_mps_stream(layout["columns"], rows, f"./outputs/lps/{name}_stream.mps"),
+    })
+    print(results["statistics"])
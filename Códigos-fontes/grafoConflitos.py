@@ -0,0 +1,161 @@
+import heapq
+
+from modeloMatricial import new_row
+
+# Grafo de conflitos entre eventos: dois eventos são vizinhos quando usam o mesmo recurso
+# (professor, turma ou sala pré-atribuída) e portanto não podem ocorrer no mesmo tempo.
+# Cada evento ocupa "duration" tempos distintos, então o problema de conflitos é uma
+# multi-coloração: o evento recebe "duration" cores (tempos) diferentes das dos vizinhos.
+#   DSATUR:  limitante superior do número de tempos necessários (coloração gulosa)
+#   cliques: limitante inferior (soma das durações de uma clique) e linhas "<= 1" mais fortes
+
+
+# Função para montar o grafo de conflitos.
+# Devolve {"events": [IDs], "duration": {ID: duração}, "adjacency": {ID: conjunto de vizinhos},
+#          "resource_cliques": {recurso: [IDs dos eventos do recurso]}}
+def build_conflict_graph(instance):
+    events = [event for event in instance["events"] if event["duration"] > 0]
+    resource_cliques = {}
+    for event in events:
+        for resource in event["resources"]:
+            members = resource_cliques.setdefault(resource["reference"], [])
+            if event["id"] not in members:
+                members.append(event["id"])
+
+    adjacency = {event["id"]: set() for event in events}
+    for members in resource_cliques.values():
+        for event_id in members:
+            adjacency[event_id].update(members)
+    for event_id, neighbours in adjacency.items():
+        neighbours.discard(event_id)
+
+    return {
+        "events": [event["id"] for event in events],
+        "duration": {event["id"]: event["duration"] for event in events},
+        "adjacency": adjacency,
+        "resource_cliques": {resource: members for resource, members in resource_cliques.items() if len(members) > 1},
+    }
+
+
+# Função para colorir o grafo com DSATUR: o próximo evento é o de maior saturação (cores distintas
+# já usadas na vizinhança), com desempate pela soma das durações dos vizinhos.
+# Cada evento recebe as "duration" menores cores livres. Devolve {evento: [cores]}.
+def dsatur(graph):
+    adjacency = graph["adjacency"]
+    duration = graph["duration"]
+    neighbour_colours = {event_id: set() for event_id in graph["events"]}
+    weighted_degree = {event_id: sum(duration[other] for other in adjacency[event_id]) for event_id in graph["events"]}
+    heap = [(0, -weighted_degree[event_id], event_id) for event_id in graph["events"]]
+    heapq.heapify(heap)
+    colouring = {}
+    while heap:
+        saturation, _, event_id = heapq.heappop(heap)
+        if event_id in colouring or -saturation != len(neighbour_colours[event_id]):
+            continue  # Entrada desatualizada da fila
+        colours = []
+        colour = 0
+        while len(colours) < duration[event_id]:
+            if colour not in neighbour_colours[event_id]:
+                colours.append(colour)
+            colour += 1
+        colouring[event_id] = colours
+        for other in adjacency[event_id]:
+            if other not in colouring:
+                neighbour_colours[other].update(colours)
+                heapq.heappush(heap, (-len(neighbour_colours[other]), -weighted_degree[other], other))
+    return colouring
+
+
+# Função para estender uma clique até ser maximal, adicionando o candidato de maior grau
+def _extend_clique(adjacency, clique):
+    clique = set(clique)
+    candidates = set.intersection(*(adjacency[event_id] for event_id in clique)) - clique if clique else set()
+    while candidates:
+        chosen = max(candidates, key=lambda event_id: (len(adjacency[event_id]), event_id))
+        clique.add(chosen)
+        candidates &= adjacency[chosen]
+    return frozenset(clique)
+
+
+# Função para remover as cliques contidas em outras. As repetidas saem mantendo a primeira
+# ocorrência e a ordenação por tamanho é estável, então a ordem não depende do hash das cliques.
+def _remove_dominated(cliques):
+    cliques = sorted(dict.fromkeys(cliques), key=len, reverse=True)
+    kept = []
+    for clique in cliques:
+        if not any(clique <= other for other in kept):
+            kept.append(clique)
+    return kept
+
+
+# Função para extrair cliques maximais. Cada recurso já é uma clique; ela é estendida com os
+# eventos de outros recursos que conflitam com todos os seus eventos e as cliques repetidas
+# ou contidas em outras são descartadas. Com from_events=True, cada evento também semeia uma
+# clique (usadas como pool de cortes).
+def maximal_cliques(graph, from_events=False):
+    adjacency = graph["adjacency"]
+    seeds = list(graph["resource_cliques"].values())
+    if from_events:
+        seeds += [[event_id] for event_id in graph["events"] if adjacency[event_id]]
+    return _remove_dominated(_extend_clique(adjacency, seed) for seed in seeds)
+
+
+# Função para a análise rápida de conflitos contra o número de tempos da instância.
+#   lower_bound:   maior soma de durações em uma clique (tempos necessários, no mínimo)
+#   dsatur_slots:  tempos usados pela coloração DSATUR (suficientes para os conflitos)
+#   infeasible:    True se lower_bound passa do número de tempos
+#   conflict_free: True se a coloração cabe nos tempos (ignora indisponibilidades e demais restrições)
+def slot_bounds(instance, graph=None, cliques=None):
+    graph = graph or build_conflict_graph(instance)
+    cliques = cliques if cliques is not None else maximal_cliques(graph)
+    colouring = dsatur(graph)
+    lower_bound = max((sum(graph["duration"][event_id] for event_id in clique) for clique in cliques), default=0)
+    lower_bound = max([lower_bound] + list(graph["duration"].values()))
+    dsatur_slots = max((colour + 1 for colours in colouring.values() for colour in colours), default=0)
+    slots = len(instance["times"])
+    return {
+        "slots": slots,
+        "lower_bound": lower_bound,
+        "dsatur_slots": dsatur_slots,
+        "infeasible": lower_bound > slots,
+        "conflict_free": dsatur_slots <= slots,
+    }
+
+
+# Função para acrescentar ao modelo uma linha "<= 1" por (clique, tempo).
+# event_time_columns: {(evento, tempo): [colunas que colocam o evento no tempo]}
+# skip: cliques já garantidas pelo modelo (ex.: eventos de um professor, já ligados a busy)
+def add_clique_rows(model, instance, cliques, event_time_columns, family="H3", skip=()):
+    skip = {frozenset(clique) for clique in skip}
+    added = 0
+    for number, clique in enumerate(cliques, start=1):
+        if clique in skip:
+            continue
+        for row in clique_time_rows(instance, number, clique, event_time_columns, family):
+            model["rows"].append(row)
+            added += 1
+    return added
+
+
+# Função para gerar as linhas "<= 1" de uma clique (numerada K<number>) em cada tempo
+# (times, se informado, limita as linhas a esses tempos)
+def clique_time_rows(instance, number, clique, event_time_columns, family="H3", times=None):
+    members = sorted(clique)
+    for time in instance["times"]:
+        if times is not None and time["id"] not in times:
+            continue
+        indices = [index for event_id in members for index in event_time_columns.get((event_id, time["id"]), [])]
+        if len(indices) > 1:
+            yield new_row(f"{family}_K{number}_{time['id']}", family, indices, [1] * len(indices), "<=", 1)
+
+
+# Função para montar o pool de cortes de clique: cliques semeadas por evento que não estão
+# contidas nas cliques já usadas como linhas do modelo
+def clique_cut_pool(graph, used_cliques=()):
+    used = [frozenset(clique) for clique in used_cliques]
+    return [clique for clique in maximal_cliques(graph, from_events=True) if not any(clique <= other for other in used)]
+
+
+# Função para acrescentar o pool de cortes de clique (família CUT)
+def add_clique_cuts(model, instance, graph, event_time_columns, used_cliques=()):
+    return add_clique_rows(model, instance, clique_cut_pool(graph, used_cliques), event_time_columns, family="CUT")
@@ -0,0 +1,166 @@
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+
+# Tamanho do bloco lido a cada passo da varredura (1 MiB)
+CHUNK_SIZE = 1 << 20
+
+# Tags de abertura/fechamento que interessam ao índice. "Instance\b" não casa com
+# "Instances" nem "SolutionGroup\b" com "SolutionGroups".
+TAG_PATTERN = re.compile(rb"<(/?)(Instance|SolutionGroup|Solution)\b([^>]*)>")
+ID_PATTERN = re.compile(rb"""(Id|Reference)\s*=\s*["']([^"']*)["']""")
+ENCODING_PATTERN = re.compile(rb"""<\?xml[^>]*encoding\s*=\s*["']([^"']+)["']""")
+
+
+# Função para obter o caminho do índice auxiliar de um arquivo
+def index_path_for(archive_path):
+    return archive_path + ".idx.json"
+
+
+# Função para varrer o arquivo uma única vez e registrar os offsets (em bytes)
+# de cada <Instance>, <SolutionGroup> e <Solution>
+def build_archive_index(archive_path):
+    instances = []
+    solution_groups = []
+    encoding = "utf-8"
+    open_elements = []  # Pilha de elementos abertos: (tag, id, offset inicial)
+    group_solutions = None  # Soluções do <SolutionGroup> aberto (None fora de um grupo)
+
+    with open(archive_path, "rb") as archive:
+        offset = 0  # Offset, no arquivo, do primeiro byte de "buffer"
+        buffer = b""
+        first_chunk = True
+        while True:
+            chunk = archive.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            if first_chunk:
+                match = ENCODING_PATTERN.search(chunk[:200])
+                if match:
+                    encoding = match.group(1).decode("ascii").lower()
+                first_chunk = False
+            buffer += chunk
+
+            last_end = 0
+            for match in TAG_PATTERN.finditer(buffer):
+                closing, tag, attributes = match.groups()
+                tag = tag.decode("ascii")
+                if closing:
+                    if not open_elements or open_elements[-1][0] != tag:
+                        raise ValueError(f"Erro: </{tag}> sem abertura correspondente no offset {offset + match.start()}.")
+                    _, element_id, start = open_elements.pop()
+                    entry = {"id": element_id, "start": start, "end": offset + match.end()}
+                    if tag == "Instance":
+                        instances.append(entry)
+                    elif tag == "SolutionGroup":
+                        entry["solutions"] = group_solutions
+                        solution_groups.append(entry)
+                        group_solutions = None
+                    elif group_solutions is None:
+                        raise ValueError(f"Erro: <Solution> fora de um <SolutionGroup> no offset {start}.")
+                    else:
+                        group_solutions.append(entry)
+                else:
+                    id_match = ID_PATTERN.search(attributes)
+                    element_id = id_match.group(2).decode(encoding) if id_match else None
+                    if attributes.rstrip().endswith(b"/"):
+                        continue  # Elemento vazio, nada a indexar
+                    if tag == "SolutionGroup":
+                        group_solutions = []
+                    open_elements.append((tag, element_id, offset + match.start()))
+                last_end = match.end()
+
+            # Mantém apenas a cauda que pode conter uma tag cortada entre blocos
+            cut = buffer.rfind(b"<", last_end)
+            if cut == -1:
+                cut = len(buffer)
+            offset += cut
+            buffer = buffer[cut:]
+
+        size = offset + len(buffer)
+
+    if open_elements:
+        raise ValueError(f"Erro: elemento <{open_elements[-1][0]}> não foi fechado em {archive_path}.")
+
+    return {
+        "archive": os.path.basename(archive_path),
+        "size": size,
+        "mtime": os.path.getmtime(archive_path),
+        "encoding": encoding,
+        "instances": instances,
+        "solution_groups": solution_groups,
+    }
+
+
+# Função para gravar o índice auxiliar ao lado do arquivo
+def write_archive_index(archive_path, index=None):
+    if index is None:
+        index = build_archive_index(archive_path)
+    with open(index_path_for(archive_path), "w") as index_file:
+        json.dump(index, index_file, indent=1)
+    return index
+
+
+# Função para carregar o índice auxiliar, reconstruindo-o se estiver ausente ou desatualizado
+def load_archive_index(archive_path):
+    path = index_path_for(archive_path)
+    if os.path.exists(path):
+        with open(path) as index_file:
+            index = json.load(index_file)
+        if index.get("size") == os.path.getsize(archive_path) and index.get("mtime") == os.path.getmtime(archive_path):
+            return index
+        print(f"Aviso: índice {path} desatualizado, reconstruindo.")
+    return write_archive_index(archive_path)
+
+
+# Função para ler apenas os bytes de um trecho do arquivo e convertê-lo em elemento XML
+def _parse_slice(archive_path, entry, encoding):
+    with open(archive_path, "rb") as archive:
+        archive.seek(entry["start"])
+        data = archive.read(entry["end"] - entry["start"])
+    return ET.fromstring(data.decode(encoding))
+
+
+# Função para listar os IDs das instâncias de um arquivo
+def list_instances(archive_path):
+    return [entry["id"] for entry in load_archive_index(archive_path)["instances"]]
+
+
+# Função para carregar uma única instância sob demanda (a primeira, se instance_id for None)
+def load_instance(archive_path, instance_id=None):
+    index = load_archive_index(archive_path)
+    for entry in index["instances"]:
+        if instance_id is None or entry["id"] == instance_id:
+            return _parse_slice(archive_path, entry, index["encoding"])
+    raise KeyError(f"Instância {instance_id} não encontrada em {archive_path}.")
+
+
+# Função para carregar um grupo de soluções inteiro sob demanda
+def load_solution_group(archive_path, group_id):
+    index = load_archive_index(archive_path)
+    for entry in index["solution_groups"]:
+        if entry["id"] == group_id:
+            return _parse_slice(archive_path, entry, index["encoding"])
+    raise KeyError(f"Grupo de soluções {group_id} não encontrado em {archive_path}.")
+
+
+# Função para carregar as soluções de uma instância, vindas de todos os grupos
+def load_solutions(archive_path, instance_id):
+    index = load_archive_index(archive_path)
+    solutions = []
+    for group in index["solution_groups"]:
+        for entry in group["solutions"]:
+            if entry["id"] == instance_id:
+                solutions.append((group["id"], _parse_slice(archive_path, entry, index["encoding"])))
+    return solutions
+
+
+if __name__ == "__main__":
+    import sys
+
+    for archive_path in sys.argv[1:]:
+        index = write_archive_index(archive_path)
+        print(f"{archive_path}: {len(index['instances'])} instância(s), {len(index['solution_groups'])} grupo(s) de soluções")
+        for entry in index["instances"]:
+            print(f"  {entry['id']}: bytes {entry['start']}-{entry['end']}")
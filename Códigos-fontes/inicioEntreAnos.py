@@ -0,0 +1,215 @@
+import os
+import re
+import tempfile
+
+from formulacoes import build_model
+from instanciaXHSTT import read_instance
+from modeloMatricial import extract_timetable, model_statistics, timetable_start, write_lp
+from solverLocal import solve_lp
+
+# Início a quente entre anos da mesma escola (ex.: NetherlandsKottenpark2003/2005/2008/2009).
+# O quadro de horários resolvido do ano anterior é levado para a nova instância:
+#   recursos: comparados sem o prefixo do tipo ("Teacher_BOW" e "BOW" são o mesmo professor); nas
+#             turmas saem também o prefixo de local e a letra de subturma ("Class_KO1HV3A", "L1HV3B"
+#             e "1HV3" são a mesma turma)
+#   tempos:   pela posição (índice do dia, período no dia), já que os IDs mudam entre os anos
+#   eventos:  pela disciplina (duas primeiras letras do nome do evento), professores e turmas, em níveis cada vez
+#             mais frouxos; as aulas do ano anterior de uma mesma chave formam um estoque que os
+#             eventos novos com a mesma chave consomem
+# As aulas levadas que violam a nova instância (indisponibilidade, conflito de recurso, máximo
+# diário) são descartadas; o resultado é o início parcial do MIP. A semente heurística completa
+# esse quadro alocando as aulas que faltam no primeiro tempo livre.
+
+MATCH_LEVELS = (
+    ("subject", "teachers", "classes"),
+    ("teachers", "classes"),
+    ("subject", "classes"),
+    ("subject", "teachers"),
+    ("teachers",),
+)
+
+
+# Função para ler um quadro de horários em CSV com linhas "evento;tempo"
+def read_timetable(path):
+    timetable = {}
+    with open(path) as timetable_file:
+        for line in timetable_file:
+            if line.strip():
+                event_id, time_id = line.strip().rsplit(";", 1)
+                timetable.setdefault(event_id, []).append(time_id)
+    return timetable
+
+
+# Função para gravar um quadro de horários no formato de read_timetable
+def write_timetable(timetable, path):
+    with open(path, "w") as timetable_file:
+        for event_id, time_ids in timetable.items():
+            for time_id in time_ids:
+                timetable_file.write(f"{event_id};{time_id}\n")
+
+
+# Função para normalizar o ID de um recurso (sem o prefixo do tipo e sem maiúsculas)
+def _resource_name(resource):
+    reference = resource["reference"]
+    if resource["type"] and reference.lower().startswith(resource["type"].lower() + "_"):
+        reference = reference[len(resource["type"]) + 1:]
+    name = reference.strip("_").lower()
+    if resource["type"] == "Class":
+        name = re.sub(r"(?<=\d)[a-z]$", "", re.sub(r"^(l|ko)(?=\d)", "", name))
+    return name
+
+
+# Função para extrair a disciplina do nome do evento ("WI (L1G1)" -> "wi", "netl-L1HV1A_2" -> "ne");
+# nomes iguais ao ID (ex.: "E0") não indicam disciplina
+def _subject(event):
+    if event["name"] == event["id"]:
+        return None
+    letters = re.sub(r"[^a-z]", "", re.split(r"[\s(\-_]", event["name"].strip(), maxsplit=1)[0].lower())
+    return letters[:2] or None
+
+
+# Função para montar as chaves de comparação de um evento: {campo: valor}
+def event_signature(event):
+    return {
+        "subject": _subject(event),
+        "teachers": frozenset(_resource_name(resource) for resource in event["resources"] if resource["type"] == "Teacher"),
+        "classes": frozenset(_resource_name(resource) for resource in event["resources"] if resource["type"] in ("Class", "Student")),
+    }
+
+
+# Função para levar o quadro do ano anterior para a nova instância.
+# Devolve ({evento novo: [tempos novos]}, {"events", "matched_events", "lessons", "mapped_lessons", "levels"})
+def map_timetable(previous_instance, previous_timetable, instance):
+    previous_position = {time["id"]: (previous_instance["days"].index(time["day"]), time["period"]) for time in previous_instance["times"]}
+    position_time = {(instance["days"].index(time["day"]), time["period"]): time["id"] for time in instance["times"]}
+    previous_events = {event["id"]: event for event in previous_instance["events"]}
+    stock = []
+    for event_id, time_ids in previous_timetable.items():
+        if event_id in previous_events:
+            signature = event_signature(previous_events[event_id])
+            stock.extend([signature, position_time.get(previous_position.get(time_id)), False] for time_id in time_ids)
+
+    events = [event for event in instance["events"] if event["duration"] > 0]
+    signatures = {event["id"]: event_signature(event) for event in events}
+    mapped = {}
+    levels = {}
+    for level in MATCH_LEVELS:
+        pools = {}
+        for lesson in stock:
+            if not lesson[2] and all(lesson[0][field] for field in level):
+                pools.setdefault(tuple(lesson[0][field] for field in level), []).append(lesson)
+        for event in events:
+            signature = signatures[event["id"]]
+            if event["id"] in mapped or not all(signature[field] for field in level):
+                continue
+            pool = [lesson for lesson in pools.get(tuple(signature[field] for field in level), []) if not lesson[2]]
+            if not pool:
+                continue
+            mapped[event["id"]] = []
+            levels[event["id"]] = level
+            for lesson in pool[:event["duration"]]:
+                lesson[2] = True
+                if lesson[1] is not None:
+                    mapped[event["id"]].append(lesson[1])
+
+    timetable, placed = repair_timetable(instance, mapped)
+    statistics = {
+        "events": len(events),
+        "matched_events": len(mapped),
+        "lessons": sum(event["duration"] for event in events),
+        "mapped_lessons": placed,
+        "levels": {" + ".join(level): sum(1 for value in levels.values() if value == level) for level in MATCH_LEVELS},
+    }
+    return timetable, statistics
+
+
+# Função para descartar as aulas que violam a instância: tempo indisponível para algum recurso,
+# recurso já ocupado no tempo, máximo diário ou duração excedidos. Devolve (quadro, aulas mantidas)
+def repair_timetable(instance, timetable):
+    events = {event["id"]: event for event in instance["events"]}
+    time_day = {time["id"]: time["day"] for time in instance["times"]}
+    occupied = set()
+    repaired = {}
+    kept = 0
+    for event_id, time_ids in timetable.items():
+        event = events[event_id]
+        resources = [resource["reference"] for resource in event["resources"]]
+        per_day = {}
+        for time_id in dict.fromkeys(time_ids):
+            if len(repaired.get(event_id, [])) >= event["duration"] or per_day.get(time_day[time_id], 0) >= event["max_daily"]:
+                continue
+            if any(time_id in instance["unavailable"].get(resource, ()) or (resource, time_id) in occupied for resource in resources):
+                continue
+            occupied.update((resource, time_id) for resource in resources)
+            per_day[time_day[time_id]] = per_day.get(time_day[time_id], 0) + 1
+            repaired.setdefault(event_id, []).append(time_id)
+            kept += 1
+    return repaired, kept
+
+
+# Função para completar um quadro parcial: cada aula que falta vai para o primeiro tempo livre para
+# todos os recursos do evento (respeitando indisponibilidade e máximo diário). Devolve (quadro, aulas sem tempo)
+def complete_timetable(instance, timetable):
+    time_day = {time["id"]: time["day"] for time in instance["times"]}
+    events = {event["id"]: event for event in instance["events"]}
+    occupied = {(resource["reference"], time_id) for event_id, time_ids in timetable.items()
+                for resource in events[event_id]["resources"] for time_id in time_ids}
+    completed = {event_id: list(time_ids) for event_id, time_ids in timetable.items()}
+    missing = 0
+    for event in sorted(events.values(), key=lambda event: -len(event["resources"])):
+        placed = completed.setdefault(event["id"], [])
+        resources = [resource["reference"] for resource in event["resources"]]
+        for time in instance["times"]:
+            if len(placed) >= event["duration"]:
+                break
+            if time["id"] in placed or sum(1 for time_id in placed if time_day[time_id] == time["day"]) >= event["max_daily"]:
+                continue
+            if any(time["id"] in instance["unavailable"].get(resource, ()) or (resource, time["id"]) in occupied for resource in resources):
+                continue
+            occupied.update((resource, time["id"]) for resource in resources)
+            placed.append(time["id"])
+        missing += event["duration"] - len(placed)
+    return {event_id: time_ids for event_id, time_ids in completed.items() if time_ids}, missing
+
+
+# Função principal: leva o quadro do ano anterior para a nova instância e resolve com ele como
+# MIP start (parcial ou completado pela semente heurística, com seed=True), com todas as colunas
+# preenchidas por modeloMatricial.timetable_start. Só a formulação de atribuição usa o início: na de
+# fluxo, um bloco de dois períodos teria o arco duplo e os dois arcos simples em 1.
+def solve_with_previous_year(previous_instance, previous_timetable, instance, formulation="assignment", solver="highs",
+                             time_limit=None, seed=False, **options):
+    timetable, statistics = map_timetable(previous_instance, previous_timetable, instance)
+    if seed:
+        timetable, statistics["unplaced_lessons"] = complete_timetable(instance, timetable)
+    model = build_model(instance, formulation, **options)
+    with tempfile.TemporaryDirectory() as workdir:
+        lp_path = os.path.join(workdir, f"{instance['id']}_warm.lp")
+        write_lp(model, lp_path)
+        if formulation == "assignment":
+            start = timetable_start(instance, model, timetable)
+        else:
+            print(f"Aviso: o início entre anos só vale para a formulação de atribuição; resolvendo {formulation} sem ele.")
+            start = None
+        result = solve_lp(lp_path, solver, time_limit, mip_start=start)
+    result.update(model_statistics(model))
+    result.update({"timetable": extract_timetable(model, result["values"]), "mapping": statistics})
+    return result
+
+
+# Exemplo: python Códigos-fontes/inicioEntreAnos.py Instâncias/NetherlandsKottenpark2008.xml quadro2008.csv
+#          Instâncias/NetherlandsKottenpark2009.xml highs 600
+if __name__ == "__main__":
+    import sys
+
+    previous_path = sys.argv[1] if len(sys.argv) > 1 else "./Instâncias/NetherlandsKottenpark2008.xml"
+    timetable_path = sys.argv[2] if len(sys.argv) > 2 else "./outputs/quadro2008.csv"
+    file_path = sys.argv[3] if len(sys.argv) > 3 else "./Instâncias/NetherlandsKottenpark2009.xml"
+    solver = sys.argv[4] if len(sys.argv) > 4 else "highs"
+    time_limit = float(sys.argv[5]) if len(sys.argv) > 5 else 600
+    result = solve_with_previous_year(read_instance(previous_path), read_timetable(timetable_path), read_instance(file_path),
+                                      solver=solver, time_limit=time_limit, seed=True)
+    mapping = result["mapping"]
+    print(f"Eventos levados: {mapping['matched_events']}/{mapping['events']}  "
+          f"Aulas levadas: {mapping['mapped_lessons']}/{mapping['lessons']}  Níveis: {mapping['levels']}")
+    print(f"Status: {result['status']}  Objetivo: {result['objective']}  Primeira solução: {result['first_feasible']}  "
+          f"Tempo: {result['time']:.2f}s")
@@ -0,0 +1,233 @@
+import xml.etree.ElementTree as ET
+from indiceArquivoXHSTT import load_instance
+
+# Leitura de uma instância XHSTT para um dicionário único, compartilhado pelos
+# geradores de modelo (atribuição, fluxo, ...). Os campos são:
+#   times:          lista de {"id", "day", "period", "index"} na ordem do arquivo
+#   days:           IDs dos dias na ordem em que aparecem
+#   day_times:      {dia: [IDs dos tempos do dia, em ordem]}
+#   time_groups:    {grupo: [IDs dos tempos]} (inclui os dias)
+#   resources:      {ID: {"id", "type", "groups"}}
+#   resource_groups:{grupo: [IDs dos recursos]}
+#   teachers, classes, rooms: IDs dos recursos de cada tipo
+#   events:         lista de eventos (ver parse_events)
+#   event_groups:   {grupo: [IDs dos eventos]}
+#   unavailable:    {recurso: conjunto de tempos proibidos (restrições obrigatórias)}
+#   max_working_days: {professor: (máximo de dias, peso)}
+#   constraints:    lista com o resumo de todas as restrições
+
+
+# Função para ler uma referência de lista, ex.: <Times><Time Reference=.../></Times>
+def _references(element, path):
+    if element is None:
+        return []
+    return [child.get("Reference") for child in element.findall(path) if child.get("Reference")]
+
+
+# Função para processar os tempos e grupos de tempos
+def parse_times(instance, times_element):
+    instance["time_groups"] = {}
+    group_tags = {}
+    for group in times_element.findall("TimeGroups/*"):
+        instance["time_groups"][group.get("Id")] = []
+        group_tags[group.get("Id")] = group.tag
+
+    for index, time in enumerate(times_element.findall("Time")):
+        time_id = time.get("Id")
+        day = time.find("Day").get("Reference") if time.find("Day") is not None else None
+        groups = _references(time, "TimeGroups/TimeGroup")
+        if day is None:
+            # Alguns arquivos só indicam o dia dentro de <TimeGroups>
+            day = next((group for group in groups if group_tags.get(group) == "Day"), "all")
+        if day not in instance["day_times"]:
+            instance["days"].append(day)
+            instance["day_times"][day] = []
+        instance["times"].append({
+            "id": time_id,
+            "day": day,
+            "period": len(instance["day_times"][day]),
+            "index": index
+        })
+        instance["day_times"][day].append(time_id)
+        for group in groups + [day]:
+            instance["time_groups"].setdefault(group, []).append(time_id)
+
+    # Grupos de tempos usados em "Week" (todos os tempos) ficam vazios no arquivo
+    for group_id, tag in group_tags.items():
+        if tag == "Week" and not instance["time_groups"][group_id]:
+            instance["time_groups"][group_id] = [time["id"] for time in instance["times"]]
+
+
+# Função para processar os recursos e grupos de recursos
+def parse_resources(instance, resources_element):
+    for group in resources_element.findall("ResourceGroups/ResourceGroup"):
+        instance["resource_groups"][group.get("Id")] = []
+    for resource in resources_element.findall("Resource"):
+        resource_id = resource.get("Id")
+        resource_type = resource.find("ResourceType").get("Reference") if resource.find("ResourceType") is not None else ""
+        groups = _references(resource, "ResourceGroups/ResourceGroup")
+        instance["resources"][resource_id] = {"id": resource_id, "type": resource_type, "groups": groups}
+        for group in groups:
+            instance["resource_groups"].setdefault(group, []).append(resource_id)
+        if resource_type == "Teacher":
+            instance["teachers"].append(resource_id)
+        elif resource_type == "Class":
+            instance["classes"].append(resource_id)
+        elif resource_type == "Room":
+            instance["rooms"].append(resource_id)
+
+
+# Função para processar os eventos
+# Cada evento guarda o nome, o professor e a turma (primeiro recurso de cada tipo), as salas
+# pré-atribuídas, os pedidos de sala ainda sem recurso e todos os recursos com papel e tipo.
+def parse_events(instance, events_element):
+    for group in events_element.findall("EventGroups/*"):
+        instance["event_groups"][group.get("Id")] = []
+    for event in events_element.findall("Event"):
+        event_id = event.get("Id")
+        duration_elem = event.find("Duration")
+        duration = int(duration_elem.text) if duration_elem is not None and duration_elem.text.strip().isdigit() else 0
+        teacher = None
+        cls = None
+        rooms = []
+        requirements = []
+        event_resources = []
+        for resource in event.findall("Resources/Resource"):
+            reference = resource.get("Reference")
+            role = resource.get("Role") or resource.findtext("Role")
+            resource_type = resource.find("ResourceType").get("Reference") if resource.find("ResourceType") is not None else None
+            if resource_type is None and reference in instance["resources"]:
+                resource_type = instance["resources"][reference]["type"]
+            if reference is None:
+                requirements.append({"role": role, "type": resource_type})
+                continue
+            event_resources.append({"reference": reference, "role": role, "type": resource_type})
+            if resource_type == "Teacher" and teacher is None:
+                teacher = reference
+            elif resource_type == "Class" and cls is None:
+                cls = reference
+            elif resource_type == "Room":
+                rooms.append(reference)
+        groups = _references(event, "EventGroups/EventGroup") + _references(event, "Course")
+        for group in groups:
+            instance["event_groups"].setdefault(group, []).append(event_id)
+        instance["events"].append({
+            "id": event_id,
+            "name": event.findtext("Name") or event_id,
+            "duration": duration,
+            "teacher": teacher,
+            "class": cls,
+            "rooms": rooms,
+            "room_requirements": requirements,
+            "resources": event_resources,
+            "groups": groups,
+            "preassigned_time": event.find("Time").get("Reference") if event.find("Time") is not None else None,
+            "max_daily": duration,  # Ajustado por SpreadEventsConstraint
+            "max_block": 1,  # Ajustado por SplitEventsConstraint
+            "double_lessons": 0  # Ajustado por DistributeSplitEventsConstraint
+        })
+
+
+# Função para obter os recursos alcançados por um <AppliesTo>
+def _applies_to_resources(instance, applies_to):
+    resources = _references(applies_to, "Resources/Resource")
+    for group in _references(applies_to, "ResourceGroups/ResourceGroup"):
+        resources.extend(instance["resource_groups"].get(group, []))
+    return list(dict.fromkeys(resources))
+
+
+# Função para obter os eventos alcançados por um <AppliesTo>
+def _applies_to_events(instance, applies_to):
+    events = _references(applies_to, "Events/Event")
+    for group in _references(applies_to, "EventGroups/EventGroup"):
+        events.extend(instance["event_groups"].get(group, []))
+    return list(dict.fromkeys(events))
+
+
+# Função para obter os tempos de um elemento com <Times> e/ou <TimeGroups>
+def _constraint_times(instance, constraint):
+    times = _references(constraint, "Times/Time")
+    for group in _references(constraint, "TimeGroups/TimeGroup"):
+        times.extend(instance["time_groups"].get(group, []))
+    return list(dict.fromkeys(times))
+
+
+# Função para processar as restrições e aplicar aos eventos e recursos o que os geradores usam
+def parse_constraints(instance, constraints_element):
+    events_by_id = {event["id"]: event for event in instance["events"]}
+    for constraint in constraints_element:
+        applies_to = constraint.find("AppliesTo")
+        required = (constraint.findtext("Required") or "false").strip().lower() == "true"
+        weight = float(constraint.findtext("Weight") or 1)
+        resources = _applies_to_resources(instance, applies_to)
+        events = _applies_to_events(instance, applies_to)
+        summary = {
+            "id": constraint.get("Id"),
+            "tag": constraint.tag,
+            "name": constraint.findtext("Name") or "",
+            "required": required,
+            "weight": weight,
+            "resources": resources,
+            "events": events,
+            "times": _constraint_times(instance, constraint),
+            "minimum": int(constraint.findtext("Minimum")) if constraint.findtext("Minimum") else None,
+            "maximum": int(constraint.findtext("Maximum")) if constraint.findtext("Maximum") else None,
+        }
+        instance["constraints"].append(summary)
+
+        if constraint.tag == "AvoidUnavailableTimesConstraint" and required:
+            for resource in resources:
+                instance["unavailable"].setdefault(resource, set()).update(summary["times"])
+        elif constraint.tag == "ClusterBusyTimesConstraint" and summary["maximum"] is not None:
+            for resource in resources:
+                instance["max_working_days"][resource] = (summary["maximum"], weight)
+        elif constraint.tag == "SplitEventsConstraint":
+            maximum_duration = int(constraint.findtext("MaximumDuration") or 1)
+            for event_id in events:
+                if event_id in events_by_id:
+                    events_by_id[event_id]["max_block"] = maximum_duration
+        elif constraint.tag == "DistributeSplitEventsConstraint" and constraint.findtext("Duration") == "2":
+            for event_id in events:
+                if event_id in events_by_id:
+                    events_by_id[event_id]["double_lessons"] = summary["minimum"] or 0
+        elif constraint.tag == "PreferResourcesConstraint":
+            # Recursos aceitos para o papel <Role> dos eventos (usado no índice de salas)
+            summary["role"] = constraint.findtext("Role")
+            summary["preferred_resources"] = _applies_to_resources(instance, constraint)
+        elif constraint.tag == "SpreadEventsConstraint" and required:
+            # Máximo de blocos por dia vezes a maior duração de bloco = máximo de aulas no dia
+            spread_max = [int(group.findtext("Maximum")) for group in constraint.findall("TimeGroups/TimeGroup") if group.findtext("Maximum")]
+            if spread_max:
+                summary["maximum"] = min(spread_max)
+
+    # Os limites diários dependem dos blocos, então são aplicados depois de todas as restrições
+    for summary in instance["constraints"]:
+        if summary["tag"] == "SpreadEventsConstraint" and summary["required"] and summary["maximum"] is not None:
+            for event_id in summary["events"]:
+                event = events_by_id.get(event_id)
+                if event is not None:
+                    event["max_daily"] = min(event["duration"], summary["maximum"] * event["max_block"])
+
+
+# Função principal: lê o arquivo (ou apenas a instância pedida, via índice) e devolve o dicionário
+def read_instance(file_path, instance_id=None):
+    if instance_id is not None:
+        root = load_instance(file_path, instance_id)
+    else:
+        root = ET.parse(file_path).getroot()
+        if root.tag != "Instance":
+            root = root.find(".//Instance")
+
+    instance = {
+        "id": root.get("Id"),
+        "times": [], "days": [], "day_times": {}, "time_groups": {},
+        "resources": {}, "resource_groups": {}, "teachers": [], "classes": [], "rooms": [],
+        "events": [], "event_groups": {},
+        "unavailable": {}, "max_working_days": {}, "constraints": []
+    }
+    parse_times(instance, root.find("Times"))
+    parse_resources(instance, root.find("Resources"))
+    parse_events(instance, root.find("Events"))
+    if root.find("Constraints") is not None:
+        parse_constraints(instance, root.find("Constraints"))
+    return instance
@@ -0,0 +1,159 @@
+import mmap
+import struct
+from array import array
+
+# Legenda binária das colunas (x<i>) ou das linhas (c<j>) de um modelo, no lugar dos arquivos
+# "x123: x_E1_Mo_1". Cada nome é guardado como um código de família (o texto antes do primeiro
+# separador, "_" nos nomes de modeloMatricial e " " nas restrições de leituraAbsurda) e uma tupla de
+# inteiros (os demais pedaços, como índices de uma tabela de textos sem repetição); o nome original
+# é separador.join(família, pedaços...). O arquivo pode ser aberto com mmap e consultado por índice
+# sem ler o resto. Formato (little-endian, vetores de uint32 alinhados em 4 bytes):
+#   cabeçalho:  "XLEG", versão (1 byte), tipo ("x" colunas ou "c" linhas), separador, 1 byte livre,
+#               entradas n, famílias f, textos s, pedaços k
+#   vetores:    início de cada texto [s + 1] (em bytes), texto de cada família [f],
+#               família de cada entrada [n], início dos pedaços de cada entrada [n + 1], pedaços [k]
+#   textos:     UTF-8 concatenado
+# A legenda em texto continua disponível como exportação (export_text_legend), idêntica à antiga.
+
+LEGEND_MAGIC = b"XLEG"
+LEGEND_VERSION = 1
+_HEADER = struct.Struct("<4sBccxIIII")
+_TITLES = {"x": "Legenda das Variáveis:", "c": "Legenda das Restrições:"}
+
+
+# Função para criar o acumulador de uma legenda ("x": colunas, "c": linhas); guarda só inteiros
+# e a tabela de textos distintos, então pode receber os nomes de um gerador de linhas
+def new_legend(kind, separator="_"):
+    if kind not in _TITLES:
+        raise ValueError(f"Tipo de legenda desconhecido: {kind}")
+    if len(separator.encode()) != 1:
+        raise ValueError(f"O separador deve ter um byte: {separator!r}")
+    return {"kind": kind, "separator": separator, "strings": {}, "families": {}, "family": array("I"), "start": array("I", [0]),
+            "tokens": array("I")}
+
+
+# Função para obter o índice de um texto na tabela (acrescentando se for novo)
+def _string_index(legend, text):
+    strings = legend["strings"]
+    index = strings.get(text)
+    if index is None:
+        index = strings[text] = len(strings)
+    return index
+
+
+# Função para acrescentar a próxima entrada já separada em família e pedaços
+def add_legend_entry(legend, family, tokens):
+    code = legend["families"].get(family)
+    if code is None:
+        code = legend["families"][family] = len(legend["families"])
+        _string_index(legend, family)
+    legend["family"].append(code)
+    legend["tokens"].extend(_string_index(legend, token) for token in tokens)
+    legend["start"].append(len(legend["tokens"]))
+
+
+# Função para acrescentar o nome da próxima entrada
+def add_legend_name(legend, name):
+    family, *tokens = name.split(legend["separator"])
+    add_legend_entry(legend, family, tokens)
+
+
+# Função para gravar a legenda acumulada
+def save_legend(legend, legend_output_path):
+    blobs = [text.encode("utf-8") for text in legend["strings"]]
+    offsets = array("I", [0])
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    family_strings = array("I", (legend["strings"][family] for family in legend["families"]))
+    with open(legend_output_path, "wb") as legend_file:
+        legend_file.write(_HEADER.pack(LEGEND_MAGIC, LEGEND_VERSION, legend["kind"].encode(), legend["separator"].encode(),
+                                       len(legend["family"]), len(family_strings), len(blobs), len(legend["tokens"])))
+        for vector in (offsets, family_strings, legend["family"], legend["start"], legend["tokens"]):
+            legend_file.write(vector.tobytes())
+        legend_file.write(b"".join(blobs))
+
+
+# Função para gravar a legenda de uma sequência de nomes (na ordem dos índices)
+def write_binary_legend(names, legend_output_path, kind, separator="_"):
+    legend = new_legend(kind, separator)
+    for name in names:
+        add_legend_name(legend, name)
+    save_legend(legend, legend_output_path)
+
+
+# Função para abrir uma legenda binária com mmap. Devolve {"kind", "count", ...}; os vetores são
+# vistas sobre o mapeamento (nada é lido até ser consultado). Fechar com close_legend.
+def open_legend(legend_path):
+    legend_file = open(legend_path, "rb")
+    mapped = mmap.mmap(legend_file.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, kind, separator, count, families, strings, tokens = _HEADER.unpack_from(mapped)
+    if magic != LEGEND_MAGIC or version != LEGEND_VERSION:
+        mapped.close()
+        legend_file.close()
+        raise ValueError(f"Arquivo não é uma legenda binária (versão {LEGEND_VERSION}): {legend_path}")
+    view = memoryview(mapped)
+    legend = {"kind": kind.decode(), "separator": separator.decode(), "count": count, "file": legend_file, "mmap": mapped, "views": []}
+    position = _HEADER.size
+    for field, length in (("offsets", strings + 1), ("families", families), ("family", count), ("start", count + 1), ("tokens", tokens)):
+        legend[field] = view[position:position + 4 * length].cast("I")
+        legend["views"].append(legend[field])
+        position += 4 * length
+    legend["text"] = view[position:]
+    legend["views"] += [legend["text"], view]
+    return legend
+
+
+# Função para ler um texto da tabela
+def _legend_string(legend, index):
+    offsets = legend["offsets"]
+    return bytes(legend["text"][offsets[index]:offsets[index + 1]]).decode("utf-8")
+
+
+# Função para consultar a entrada de um índice (0 = x1/c1): devolve (família, (pedaços...))
+def legend_entry(legend, index):
+    if not 0 <= index < legend["count"]:
+        raise IndexError(f"Índice fora da legenda: {index}")
+    family = _legend_string(legend, legend["families"][legend["family"][index]])
+    start, end = legend["start"][index], legend["start"][index + 1]
+    return family, tuple(_legend_string(legend, token) for token in legend["tokens"][start:end])
+
+
+# Função para consultar o nome legível de um índice (0 = x1/c1)
+def legend_name(legend, index):
+    family, tokens = legend_entry(legend, index)
+    return legend["separator"].join((family,) + tokens)
+
+
+# Função para fechar a legenda aberta por open_legend
+def close_legend(legend):
+    for view in reversed(legend["views"]):
+        view.release()
+    legend["mmap"].close()
+    legend["file"].close()
+
+
+# Função para exportar a legenda binária no formato de texto ("x1: nome" por linha)
+def export_text_legend(legend_path, text_output_path):
+    legend = open_legend(legend_path)
+    try:
+        with open(text_output_path, "w") as text_file:
+            text_file.write(_TITLES[legend["kind"]] + "\n")
+            for index in range(legend["count"]):
+                text_file.write(f"{legend['kind']}{index + 1}: {legend_name(legend, index)}\n")
+    finally:
+        close_legend(legend)
+
+
+# Exemplo: python Códigos-fontes/legendaBinaria.py outputs/txt/BrazilInstance1_legend.bin 17
+#          python Códigos-fontes/legendaBinaria.py outputs/txt/BrazilInstance1_legend.bin outputs/txt/BrazilInstance1_legend.txt
+if __name__ == "__main__":
+    import sys
+
+    legend_path = sys.argv[1]
+    if len(sys.argv) > 2 and not sys.argv[2].isdigit():
+        export_text_legend(legend_path, sys.argv[2])
+    else:
+        legend = open_legend(legend_path)
+        for argument in sys.argv[2:] or ["1"]:
+            print(f"{legend['kind']}{argument}: {legend_name(legend, int(argument) - 1)}")
+        close_legend(legend)
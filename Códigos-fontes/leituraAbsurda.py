@@ -1,5 +1,11 @@
 import xml.etree.ElementTree as ET
 import re
+import queue
+import threading
+import os
+from contextlib import contextmanager
+from indiceArquivoXHSTT import load_instance
+from legendaBinaria import add_legend_entry, add_legend_name, new_legend, save_legend
 
 # Estruturas de dados para armazenar informações
 times = []
@@ -8,8 +14,17 @@ events = []
 constraints = []
 variable_map = {}  # Mapear variáveis para índices
 variable_counter = 1
+variable_names = []  # Nome de cada variável, na ordem dos índices: texto, ou (par, tempo) para as colunas x do registro
+column_pairs = {}  # Registro das colunas x: (professor, turma) -> índice do par
+column_slots = []  # Coluna x do par p no tempo t na posição p * len(times) + t (None enquanto não usada)
+pair_names = []  # (professor, turma) de cada par do registro
 constraint_map = {}  # Mapear restrições para índices
 constraint_counter = 1
+legend_sinks = {}  # Modo pipeline: arquivos que recebem cada entrada nova das legendas ("variables", "constraints")
+
+# Modo pipeline: blocos de texto em espera por arquivo e tamanho aproximado (caracteres) de cada bloco
+PIPELINE_QUEUE_SIZE = 64
+PIPELINE_CHUNK_SIZE = 1 << 16
 
 # Função para mapear uma variável para um índice
 def map_variable(name):
@@ -17,14 +32,47 @@ def map_variable(name):
     if name not in variable_map:
         variable_map[name] = f"x{variable_counter}"  # Nome da variável com índice
         variable_counter += 1
+        variable_names.append(name)
+        if legend_sinks:
+            legend_sinks["variables"].write(variable_map[name] + ": " + name + "\n")
     return variable_map[name]
 
+# Função para montar o nome x_<professor>_<turma>_<tempo> de uma coluna do registro
+def x_name(pair, time_index):
+    teacher, cls = pair_names[pair]
+    return "x_" + teacher + "_" + cls + "_" + times[time_index]["id"]
+
+# Função para mapear a coluna x do par (professor, turma) no tempo pelo registro inteiro: a posição
+# é calculada (par * T + tempo) e o nome só é montado para a legenda, sem texto nem hash no laço
+def map_x(pair, time_index):
+    global variable_counter
+    slot = pair * len(times) + time_index
+    column = column_slots[slot]
+    if column is None:
+        column = column_slots[slot] = f"x{variable_counter}"
+        variable_counter += 1
+        variable_names.append((pair, time_index))
+        if legend_sinks:
+            legend_sinks["variables"].write(column + ": " + x_name(pair, time_index) + "\n")
+    return column
+
+# Função para montar o registro das colunas x a partir dos eventos (pares na ordem dos eventos)
+def build_column_registry():
+    column_pairs.clear()
+    for event in events:
+        if event["teacher"] and event["class"]:
+            column_pairs.setdefault((event["teacher"], event["class"]), len(column_pairs))
+    pair_names[:] = list(column_pairs)
+    column_slots[:] = [None] * (len(column_pairs) * len(times))
+
 # Função para mapear uma restrição para um índice
 def map_constraint(name):
     global constraint_counter
     if name not in constraint_map:
         constraint_map[name] = f"c{constraint_counter}"  # Nome da restrição com índice
         constraint_counter += 1
+        if legend_sinks:
+            legend_sinks["constraints"].write(constraint_map[name] + ": " + name + "\n")
     return constraint_map[name]
 
 # Função para processar os horários
@@ -50,7 +98,8 @@ def parse_events(events_element):
         teacher = None
         cls = None
         for resource in event.findall("Resources/Resource"):
-            role = resource.get("Role")
+            # No XHSTT o papel vem no elemento filho <Role>
+            role = resource.get("Role") or resource.findtext("Role")
             if role == "Teacher":
                 teacher = resource.get("Reference")
             elif role == "Class":
@@ -71,12 +120,145 @@ def parse_constraints(constraints_element):
         name = constraint.find("Name").text if constraint.find("Name") is not None else ""
         constraints.append({"id": constraint_id, "name": name})
 
+# Modos de referência à ocupação de um professor em um tempo (restrições S1 e S2):
+#   "placeholder": variáveis x_<professor>_*_<tempo>, sem ligação com as turmas (formulação original)
+#   "expanded":    soma das variáveis x de todas as turmas do professor, repetida em cada linha
+#   "busy":        uma variável busy_<professor>_<tempo> por par, ligada uma única vez às turmas
+TEACHER_SLOT_MODES = ("placeholder", "expanded", "busy")
+
+# Modos de contagem dos dias de trabalho (restrição S2):
+#   "single":         uma única variável days_<professor>, como na formulação original
+#   "aggregated":     binária day_<professor>_<dia> ligada por P * day - soma(ocupação no dia) >= 0
+#   "disaggregated":  binária day_<professor>_<dia> ligada por day - ocupação(tempo) >= 0 em cada tempo
+#                     (mais linhas, relaxação linear mais forte)
+WORKING_DAY_MODES = ("single", "aggregated", "disaggregated")
+
+# Formatos das legendas de variáveis e restrições (ver legendaBinaria.py)
+LEGEND_FORMATS = ("text", "binary")
+
+# Arquivo de saída do modo pipeline: write() junta o texto em blocos, que seguem por uma fila
+# limitada até uma thread escritora; a geração continua enquanto o bloco anterior é gravado
+class _PipelinedFile:
+    def __init__(self, path):
+        self.queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        self.buffer = []
+        self.size = 0
+        self.error = None
+        self.thread = threading.Thread(target=self._drain, args=(path,), daemon=True)
+        self.thread.start()
+
+    def _drain(self, path):
+        try:
+            with open(path, "w") as output_file:
+                while True:
+                    chunk = self.queue.get()
+                    if chunk is None:
+                        return
+                    output_file.write(chunk)
+        except OSError as error:
+            self.error = error
+            while self.queue.get() is not None:  # Esvazia a fila para a geração não travar
+                pass
+
+    def write(self, text):
+        self.buffer.append(text)
+        self.size += len(text)
+        if self.size >= PIPELINE_CHUNK_SIZE:
+            self.queue.put("".join(self.buffer))
+            self.buffer, self.size = [], 0
+
+    def close(self):
+        if self.buffer:
+            self.queue.put("".join(self.buffer))
+        self.queue.put(None)
+        self.thread.join()
+        if self.error:
+            raise self.error
+
+# Função para abrir os três arquivos de saída; no modo pipeline, cada um tem a sua thread
+# escritora e as legendas são escritas à medida que variáveis e restrições são criadas.
+# Com legendas binárias, só o LP é aberto aqui (as legendas são gravadas no fim por _write_binary_legends).
+@contextmanager
+def _output_files(lp_output_path, legend_output_path, constraints_output_path, pipelined=False, legend_format="text"):
+    if legend_format == "binary":
+        lp_file = _PipelinedFile(lp_output_path) if pipelined else open(lp_output_path, "w")
+        try:
+            yield lp_file, None, None
+        finally:
+            lp_file.close()
+        return
+    if not pipelined:
+        with open(lp_output_path, "w") as lp_file, open(legend_output_path, "w") as legend_file, open(constraints_output_path, "w") as constraints_file:
+            yield lp_file, legend_file, constraints_file
+        return
+    files = [_PipelinedFile(path) for path in (lp_output_path, legend_output_path, constraints_output_path)]
+    files[1].write("Legenda das Variáveis:\n")
+    files[2].write("Legenda das Restrições:\n")
+    legend_sinks.update(variables=files[1], constraints=files[2])
+    try:
+        yield tuple(files)
+    finally:
+        legend_sinks.clear()
+        for output_file in files:
+            output_file.close()
+
+# Função para gravar as legendas no formato binário de legendaBinaria.py: as colunas x do registro
+# entram como ("x", (professor, turma, tempo)) sem montar o nome; as restrições são separadas por espaço
+def _write_binary_legends(legend_output_path, constraints_output_path):
+    variable_legend = new_legend("x")
+    for name in variable_names:
+        if isinstance(name, str):
+            add_legend_name(variable_legend, name)
+        else:
+            pair, time_index = name
+            add_legend_entry(variable_legend, "x", pair_names[pair] + (times[time_index]["id"],))
+    save_legend(variable_legend, legend_output_path)
+    constraint_legend = new_legend("c", " ")
+    for name in constraint_map:
+        add_legend_name(constraint_legend, name)
+    save_legend(constraint_legend, constraints_output_path)
+
 # Função para gerar o arquivo LP, a legenda e o mapeamento de restrições
-def generate_lp_and_legend(lp_output_path, legend_output_path, constraints_output_path):
+# legend_format: "text" (legendas "x1: nome") ou "binary" (legendaBinaria.py; o texto sai por export_text_legend)
+# pipelined: escrita em threads separadas (ver _output_files); constraints_ready: evento que indica
+# que as restrições do XML já foram lidas (H4 espera por ele); parse_errors: lista de erros da
+# leitura, conferida depois da espera (com erro, a geração para antes de escrever H4)
+def generate_lp_and_legend(lp_output_path, legend_output_path, constraints_output_path, teacher_slot_mode="placeholder", working_day_mode="single",
+                           pipelined=False, constraints_ready=None, legend_format="text", parse_errors=None):
     global variable_map, constraint_map
-    double_variables = set()  # Variáveis para lições duplas
-
-    with open(lp_output_path, "w") as lp_file, open(legend_output_path, "w") as legend_file, open(constraints_output_path, "w") as constraints_file:
+    if legend_format not in LEGEND_FORMATS:
+        raise ValueError(f"Formato de legenda desconhecido: {legend_format}")
+    if teacher_slot_mode not in TEACHER_SLOT_MODES:
+        raise ValueError(f"Modo de ocupação desconhecido: {teacher_slot_mode}")
+    if working_day_mode not in WORKING_DAY_MODES:
+        raise ValueError(f"Modo de dias de trabalho desconhecido: {working_day_mode}")
+    double_variables = []  # Variáveis para lições duplas
+    busy_variables = []  # Variáveis binárias de ocupação (modo "busy")
+    day_variables = []  # Variáveis binárias de dia de trabalho (modos "aggregated" e "disaggregated")
+
+    # Registro das colunas x e, na ordem dos eventos, os pares de cada evento por professor e por turma
+    # (um por evento, repetidos se dois eventos têm o mesmo par) e as turmas distintas de cada professor
+    build_column_registry()
+    time_index = {time["id"]: index for index, time in enumerate(times)}
+    teacher_event_pairs = {}
+    class_event_pairs = {}
+    teacher_classes = {}
+    for event in events:
+        if event["teacher"] and event["class"]:
+            pair = column_pairs[event["teacher"], event["class"]]
+            teacher_event_pairs.setdefault(event["teacher"], []).append(pair)
+            class_event_pairs.setdefault(event["class"], []).append(pair)
+            classes = teacher_classes.setdefault(event["teacher"], [])
+            if pair not in classes:
+                classes.append(pair)
+
+    # Função para obter os termos que indicam que o professor está ocupado no tempo
+    def teacher_slot_terms(teacher_id, time_id):
+        if teacher_slot_mode == "busy":
+            return [map_variable("busy_" + teacher_id + "_" + time_id)]
+        return [map_x(pair, time_index[time_id]) for pair in teacher_classes.get(teacher_id, [])]
+
+    with _output_files(lp_output_path, legend_output_path, constraints_output_path, pipelined, legend_format) as (lp_file, legend_file, constraints_file):
         # Função objetivo
         lp_file.write("Minimize\n obj: ")
         terms = []
@@ -93,32 +275,49 @@ def generate_lp_and_legend(lp_output_path, legend_output_path, constraints_outpu
         # H1: Carga horária
         for event in events:
             if event["teacher"] and event["class"]:
-                terms = [map_variable("x_" + event["teacher"] + "_" + event["class"] + "_" + time["id"]) for time in times]
+                pair = column_pairs[event["teacher"], event["class"]]
+                terms = [map_x(pair, t) for t in range(len(times))]
                 if terms:  # Verifica se há termos na restrição
                     constraint_name = map_constraint("Carga horária do evento " + event["id"])
                     lp_file.write(f" {constraint_name}: " + " + ".join(terms) + " = " + str(event["duration"]) + "\n")
 
+        # Ligação das variáveis de ocupação: busy_<professor>_<tempo> = soma das turmas no tempo.
+        # Como busy é binária, a ligação já implica H2, que deixa de ser escrita neste modo.
+        if teacher_slot_mode == "busy":
+            for teacher in [r for r in resources if r["type"] == "Teacher"]:
+                for t, time in enumerate(times):
+                    terms = [map_x(pair, t) for pair in teacher_classes.get(teacher["id"], [])]
+                    if terms:
+                        busy_var = map_variable("busy_" + teacher["id"] + "_" + time["id"])
+                        busy_variables.append(busy_var)
+                        constraint_name = map_constraint("Ocupação do professor " + teacher["id"] + " no tempo " + time["id"])
+                        lp_file.write(f" {constraint_name}: " + busy_var + " - " + " - ".join(terms) + " = 0\n")
+
         # H2: Conflito de horário por professor
-        for teacher in [r for r in resources if r["type"] == "Teacher"]:
-            for time in times:
-                terms = [map_variable("x_" + teacher["id"] + "_" + event["class"] + "_" + time["id"]) for event in events if event["teacher"] == teacher["id"] and event["class"]]
+        for teacher in [r for r in resources if r["type"] == "Teacher" and teacher_slot_mode != "busy"]:
+            for t, time in enumerate(times):
+                terms = [map_x(pair, t) for pair in teacher_event_pairs.get(teacher["id"], [])]
                 if terms:
                     constraint_name = map_constraint("Conflito de horário do professor " + teacher["id"] + " no tempo " + time["id"])
                     lp_file.write(f" {constraint_name}: " + " + ".join(terms) + " <= 1\n")
 
         # H3: Conflito de horário por turma
-        for cls in {e["class"] for e in events if e["class"]}:
-            for time in times:
-                terms = [map_variable("x_" + event["teacher"] + "_" + cls + "_" + time["id"]) for event in events if event["class"] == cls and event["teacher"]]
+        for cls in dict.fromkeys(e["class"] for e in events if e["class"]):
+            for t, time in enumerate(times):
+                terms = [map_x(pair, t) for pair in class_event_pairs.get(cls, [])]
                 if terms:
                     constraint_name = map_constraint("Conflito de horário da turma " + cls + " no tempo " + time["id"])
                     lp_file.write(f" {constraint_name}: " + " + ".join(terms) + " <= 1\n")
 
         # H4: Indisponibilidade dos professores
+        if constraints_ready:
+            constraints_ready.wait()
+        if parse_errors:
+            raise parse_errors[0]
         for constraint in constraints:
             if constraint["name"] == "AvoidUnavailableTimes":
-                for time in times:
-                    terms = [map_variable("x_" + constraint["id"] + "_" + event["class"] + "_" + time["id"]) for event in events if event["teacher"] == constraint["id"] and event["class"]]
+                for t, time in enumerate(times):
+                    terms = [map_x(pair, t) for pair in teacher_event_pairs.get(constraint["id"], [])]
                     if terms:
                         constraint_name = map_constraint("Indisponibilidade do professor " + constraint["id"] + " no tempo " + time["id"])
                         lp_file.write(f" {constraint_name}: " + " + ".join(terms) + " = 0\n")
@@ -126,12 +325,13 @@ def generate_lp_and_legend(lp_output_path, legend_output_path, constraints_outpu
         # H5: Máximo de aulas diárias
         for event in events:
             if event["teacher"] and event["class"] and event["max_daily"]:
+                pair = column_pairs[event["teacher"], event["class"]]
                 daily_terms = {}
-                for time in times:
+                for t, time in enumerate(times):
                     day = time["id"][:2]  # Extrair o dia (e.g., Mo, Tu)
                     if day not in daily_terms:
                         daily_terms[day] = []
-                    daily_terms[day].append(map_variable("x_" + event["teacher"] + "_" + event["class"] + "_" + time["id"]))
+                    daily_terms[day].append(map_x(pair, t))
                 for day, terms in daily_terms.items():
                     if terms:
                         constraint_name = map_constraint("Máximo de aulas diárias do evento " + event["id"] + " no dia " + day)
@@ -140,23 +340,45 @@ def generate_lp_and_legend(lp_output_path, legend_output_path, constraints_outpu
         # H6: Lições duplas
         for event in events:
             if event["teacher"] and event["class"] and event["double_lessons"]:
+                pair = column_pairs[event["teacher"], event["class"]]
                 for i, time in enumerate(times[:-1]):
                     current_time = time["id"]
                     next_time = times[i + 1]["id"]
                     if current_time[:2] == next_time[:2]:  # Verificar se estão no mesmo dia
                         double_var = map_variable("double_" + event["id"] + "_" + current_time)
-                        terms = [
-                            map_variable("x_" + event["teacher"] + "_" + event["class"] + "_" + current_time),
-                            map_variable("x_" + event["teacher"] + "_" + event["class"] + "_" + next_time)
-                        ]
+                        terms = [map_x(pair, i), map_x(pair, i + 1)]
                         if terms:
                             constraint_name = map_constraint("Lições duplas do evento " + event["id"] + " no tempo " + current_time)
                             lp_file.write(f" {constraint_name}: " + double_var + " - " + " - ".join(terms) + " >= -1\n")
 
         # S1: Períodos ociosos
         for teacher in [r for r in resources if r["type"] == "Teacher"]:
+            if teacher_slot_mode != "placeholder" and not teacher_classes.get(teacher["id"]):
+                continue
+            idle_terms = []
             for day in ["Mo", "Tu", "We", "Th", "Fr"]:
                 day_periods = [time for time in times if time["id"].startswith(day)]
+                if teacher_slot_mode != "placeholder":
+                    # Nos períodos internos do dia: pre_p >= ocupado(q) para q < p e post_p >= ocupado(q) para q > p
+                    # (em cadeia), idle_p >= pre_p + post_p - ocupado(p) - 1; vale para buracos de qualquer tamanho
+                    for i in range(1, len(day_periods) - 1):
+                        current = day_periods[i]["id"]
+                        idle_var = map_variable("idle_" + teacher["id"] + "_" + current)
+                        pre_var = map_variable("pre_" + teacher["id"] + "_" + current)
+                        post_var = map_variable("post_" + teacher["id"] + "_" + current)
+                        idle_terms.append(idle_var)
+                        rows = [("Aula antes", pre_var + "".join(" - " + term for term in teacher_slot_terms(teacher["id"], day_periods[i - 1]["id"])) + " >= 0")]
+                        if i > 1:
+                            rows.append(("Aula antes (cadeia)", pre_var + " - " + map_variable("pre_" + teacher["id"] + "_" + day_periods[i - 1]["id"]) + " >= 0"))
+                        rows.append(("Aula depois", post_var + "".join(" - " + term for term in teacher_slot_terms(teacher["id"], day_periods[i + 1]["id"])) + " >= 0"))
+                        if i < len(day_periods) - 2:
+                            rows.append(("Aula depois (cadeia)", post_var + " - " + map_variable("post_" + teacher["id"] + "_" + day_periods[i + 1]["id"]) + " >= 0"))
+                        rows.append(("Período ocioso", idle_var + " - " + pre_var + " - " + post_var
+                                     + "".join(" + " + term for term in teacher_slot_terms(teacher["id"], current)) + " >= -1"))
+                        for label, row in rows:
+                            constraint_name = map_constraint(label + " do professor " + teacher["id"] + " no tempo " + current)
+                            lp_file.write(f" {constraint_name}: " + row + "\n")
+                    continue
                 for i in range(len(day_periods) - 1):
                     current = day_periods[i]["id"]
                     next_period = day_periods[i + 1]["id"]
@@ -168,11 +390,42 @@ def generate_lp_and_legend(lp_output_path, legend_output_path, constraints_outpu
                     if terms:
                         constraint_name = map_constraint("Período ocioso do professor " + teacher["id"] + " no tempo " + current)
                         lp_file.write(f" {constraint_name}: " + idle_var + " - " + " + ".join(terms) + " >= 0\n")
+            if idle_terms:
+                # Soma dos períodos ociosos na variável da função objetivo
+                constraint_name = map_constraint("Total de períodos ociosos do professor " + teacher["id"])
+                lp_file.write(f" {constraint_name}: " + map_variable("idle_" + teacher["id"]) + " - " + " - ".join(idle_terms) + " >= 0\n")
+
+        # S2: Dias de trabalho com um indicador por (professor, dia); days_<professor> passa a ser a soma deles
+        for teacher in [r for r in resources if r["type"] == "Teacher" and working_day_mode != "single"]:
+            if not teacher_classes.get(teacher["id"]):
+                continue
+            teacher_days = []
+            for day in ["Mo", "Tu", "We", "Th", "Fr"]:
+                day_times = [time for time in times if time["id"].startswith(day)]
+                if not day_times:
+                    continue
+                day_var = map_variable("day_" + teacher["id"] + "_" + day)
+                day_variables.append(day_var)
+                teacher_days.append(day_var)
+                if working_day_mode == "aggregated":
+                    terms = [term for time in day_times for term in teacher_slot_terms(teacher["id"], time["id"])]
+                    constraint_name = map_constraint("Dia de trabalho do professor " + teacher["id"] + " no dia " + day)
+                    lp_file.write(f" {constraint_name}: {len(day_times)} " + day_var + " - " + " - ".join(terms) + " >= 0\n")
+                else:
+                    for time in day_times:
+                        terms = teacher_slot_terms(teacher["id"], time["id"])
+                        constraint_name = map_constraint("Dia de trabalho do professor " + teacher["id"] + " no tempo " + time["id"])
+                        lp_file.write(f" {constraint_name}: " + day_var + " - " + " - ".join(terms) + " >= 0\n")
+            constraint_name = map_constraint("Total de dias de trabalho do professor " + teacher["id"])
+            lp_file.write(f" {constraint_name}: " + map_variable("days_" + teacher["id"]) + " - " + " - ".join(teacher_days) + " = 0\n")
 
         # S2: Dias de trabalho
-        for teacher in [r for r in resources if r["type"] == "Teacher"]:
+        for teacher in [r for r in resources if r["type"] == "Teacher" and working_day_mode == "single"]:
             for day in ["Mo", "Tu", "We", "Th", "Fr"]:
-                terms = [map_variable("x_" + teacher["id"] + "_" + time["id"]) for time in times if time["id"].startswith(day)]
+                if teacher_slot_mode == "placeholder":
+                    terms = [map_variable("x_" + teacher["id"] + "_" + time["id"]) for time in times if time["id"].startswith(day)]
+                else:
+                    terms = [term for time in times if time["id"].startswith(day) for term in teacher_slot_terms(teacher["id"], time["id"])]
                 if terms:
                     constraint_name = map_constraint("Dias de trabalho do professor " + teacher["id"] + " no dia " + day)
                     lp_file.write(f" {constraint_name}: " + map_variable("days_" + teacher["id"]) + " - " + " - ".join(terms) + " >= 0\n")
@@ -196,9 +449,12 @@ def generate_lp_and_legend(lp_output_path, legend_output_path, constraints_outpu
         binary_terms = []
         for event in events:
             if event["teacher"] and event["class"] and event["duration"] > 0:
-                for time in times:
-                    binary_terms.append(map_variable("x_" + event["teacher"] + "_" + event["class"] + "_" + time["id"]))
+                pair = column_pairs[event["teacher"], event["class"]]
+                for t in range(len(times)):
+                    binary_terms.append(map_x(pair, t))
         binary_terms.extend(double_variables)
+        binary_terms.extend(busy_variables)
+        binary_terms.extend(day_variables)
 
         if binary_terms:
             lp_file.write("\nBinary\n")
@@ -219,32 +475,89 @@ def generate_lp_and_legend(lp_output_path, legend_output_path, constraints_outpu
         # Finalizar arquivo LP
         lp_file.write("End\n")
 
-        # Gerar legenda
-        legend_file.write("Legenda das Variáveis:\n")
-        for original, mapped in variable_map.items():
-            legend_file.write(mapped + ": " + original + "\n")
-
-        # Gerar mapeamento de restrições
-        constraints_file.write("Legenda das Restrições:\n")
-        for original, mapped in constraint_map.items():
-            constraints_file.write(mapped + ": " + original + "\n")
+        # Gerar legenda e mapeamento de restrições (no modo pipeline já foram escritos)
+        if legend_format == "binary":
+            _write_binary_legends(legend_output_path, constraints_output_path)
+        elif not pipelined:
+            legend_file.write("Legenda das Variáveis:\n")
+            for number, name in enumerate(variable_names, start=1):
+                legend_file.write(f"x{number}: " + (name if isinstance(name, str) else x_name(*name)) + "\n")
+
+            constraints_file.write("Legenda das Restrições:\n")
+            for original, mapped in constraint_map.items():
+                constraints_file.write(mapped + ": " + original + "\n")
+
+# Função da etapa de leitura do modo pipeline: lê as seções da instância em uma thread e sinaliza
+# cada uma assim que termina (ready: {seção: threading.Event}); erros vão para a lista errors
+def _parse_sections(file_path, instance_id, ready, errors):
+    parsers = {"Times": parse_times, "Resources": parse_resources, "Events": parse_events, "Constraints": parse_constraints}
+    try:
+        if instance_id is not None:
+            root = load_instance(file_path, instance_id)
+            for section, parse in parsers.items():
+                parse(root.find(".//" + section))
+                ready[section].set()
+        else:
+            # Leitura incremental: cada seção é processada quando o seu elemento fecha (a primeira
+            # de cada nome, como em root.find(".//Seção"), pois as seções vêm nessa ordem no arquivo)
+            for _, element in ET.iterparse(file_path):
+                if element.tag in parsers and not ready[element.tag].is_set():
+                    parsers[element.tag](element)
+                    ready[element.tag].set()
+    except Exception as error:
+        errors.append(error)
+    finally:
+        for section_ready in ready.values():
+            section_ready.set()
 
 # Função principal para processar o XML e gerar os arquivos
-def parse_xml_and_generate_files(file_path, lp_output_path, legend_output_path, constraints_output_path):
-    tree = ET.parse(file_path)
-    root = tree.getroot()
-
+# Se instance_id for informado, apenas essa <Instance> é lida do arquivo (via índice auxiliar)
+# Com pipelined=True, leitura, geração e escrita rodam como etapas sobrepostas ligadas por filas
+# limitadas: a geração começa quando tempos, recursos e eventos foram lidos (a leitura das
+# restrições continua em paralelo) e o LP e as legendas são gravados por threads próprias.
+def parse_xml_and_generate_files(file_path, lp_output_path, legend_output_path, constraints_output_path, instance_id=None, teacher_slot_mode="placeholder", working_day_mode="single",
+                                 pipelined=False, legend_format="text"):
     # Limpar dados anteriores
     times.clear()
     resources.clear()
     events.clear()
     constraints.clear()
     variable_map.clear()
+    variable_names.clear()
     constraint_map.clear()
     global variable_counter, constraint_counter
     variable_counter = 1
     constraint_counter = 1
 
+    if pipelined:
+        ready = {section: threading.Event() for section in ("Times", "Resources", "Events", "Constraints")}
+        errors = []
+        parser = threading.Thread(target=_parse_sections, args=(file_path, instance_id, ready, errors), daemon=True)
+        parser.start()
+        for section in ("Times", "Resources", "Events"):
+            ready[section].wait()
+        if errors:
+            raise errors[0]
+        try:
+            generate_lp_and_legend(lp_output_path, legend_output_path, constraints_output_path, teacher_slot_mode, working_day_mode,
+                                   pipelined=True, constraints_ready=ready["Constraints"], legend_format=legend_format, parse_errors=errors)
+        except Exception:
+            # Não deixar um LP parcial (sem H4 e o restante) no lugar da saída
+            for path in (lp_output_path, legend_output_path, constraints_output_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            raise
+        parser.join()
+        if errors:
+            raise errors[0]
+        return
+
+    if instance_id is not None:
+        root = load_instance(file_path, instance_id)
+    else:
+        tree = ET.parse(file_path)
+        root = tree.getroot()
+
     # Processar os elementos do XML
     parse_times(root.find(".//Times"))
     parse_resources(root.find(".//Resources"))
@@ -252,12 +565,14 @@ def parse_xml_and_generate_files(file_path, lp_output_path, legend_output_path,
     parse_constraints(root.find(".//Constraints"))
 
     # Gerar arquivos LP, legenda e mapeamento de restrições
-    generate_lp_and_legend(lp_output_path, legend_output_path, constraints_output_path)
+    generate_lp_and_legend(lp_output_path, legend_output_path, constraints_output_path, teacher_slot_mode, working_day_mode,
+                           legend_format=legend_format)
 
 # Executar o parser e gerar os arquivos
-parse_xml_and_generate_files(
-    "./Instâncias/BrazilInstance1.xml",
-    "./outputs/lps/BrazilInstance1.lp",
-    "./outputs/txt/BrazilInstance1_legend.txt",
-    "./outputs/txt/BrazilInstance1_constraints.txt"
-)
\ No newline at end of file
+if __name__ == "__main__":
+    parse_xml_and_generate_files(
+        "./Instâncias/BrazilInstance1.xml",
+        "./outputs/lps/BrazilInstance1.lp",
+        "./outputs/txt/BrazilInstance1_legend.txt",
+        "./outputs/txt/BrazilInstance1_constraints.txt"
+    )
\ No newline at end of file
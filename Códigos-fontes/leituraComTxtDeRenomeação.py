@@ -74,7 +74,7 @@ def parse_constraints(constraints_element):
 # Função para gerar o arquivo LP, a legenda e o mapeamento de restrições
 def generate_lp_and_legend(lp_output_path, legend_output_path, constraints_output_path):
     global variable_map, constraint_map
-    double_variables = set()  # Variáveis para lições duplas
+    double_variables = []  # Variáveis para lições duplas
 
     with open(lp_output_path, "w") as lp_file, open(legend_output_path, "w") as legend_file, open(constraints_output_path, "w") as constraints_file:
         # Função objetivo
@@ -105,7 +105,7 @@ def generate_lp_and_legend(lp_output_path, legend_output_path, constraints_outpu
                 lp_file.write(f" {constraint_name}: " + " + ".join(terms) + " <= 1\n")
 
         # H3: Conflito de horário por turma
-        for cls in {e["class"] for e in events if e["class"]}:
+        for cls in dict.fromkeys(e["class"] for e in events if e["class"]):
             for time in times:
                 terms = [map_variable("x_" + event["teacher"] + "_" + cls + "_" + time["id"]) for event in events if event["class"] == cls and event["teacher"]]
                 constraint_name = map_constraint("Conflito de horário da turma " + cls + " no tempo " + time["id"])
@@ -59,7 +59,7 @@ def parse_constraints(constraints_element):
 
 # Função para gerar o arquivo LP
 def generate_lp_file(output_path):
-    double_variables = set()  # Inicializar a variável aqui
+    double_variables = {}  # Inicializar a variável aqui (conjunto ordenado)
     with open(output_path, "w") as f:
         # Função objetivo
         f.write("Minimize\n obj: ")
@@ -86,10 +86,10 @@ def generate_lp_file(output_path):
                 f.write(f" h2_{teacher['id'].replace('-', '_')}_{time['id'].replace('-', '_')}: " + " + ".join(terms) + " <= 1\n")
         
         # H3: Conflito de horário por turma
-        for cls in {e["class"] for e in events if e["class"]}:  # Adicionar verificação de classe
+        for cls in dict.fromkeys(e["class"] for e in events if e["class"]):  # Adicionar verificação de classe
             for time in times:
                 terms = [f"x_{event['teacher'].replace('-', '_')}_{cls.replace('-', '_')}_{time['id'].replace('-', '_')}" for event in events if event["class"] == cls]
-                unique_terms = list(set(terms))  # Remover duplicatas
+                unique_terms = list(dict.fromkeys(terms))  # Remover duplicatas, mantendo a ordem
                 f.write(f" h3_{cls.replace('-', '_')}_{time['id'].replace('-', '_')}: " + " + ".join(unique_terms) + " <= 1\n")
         
         # H4: Indisponibilidade
@@ -116,7 +116,7 @@ def generate_lp_file(output_path):
                     next_id = f"{prefix}{int(num) + 1}"
                     if next_id in [t['id'] for t in times]:
                         double_var = f"double_{event['id'].replace('-', '_')}_{time['id'].replace('-', '_')}"
-                        double_variables.add(double_var)
+                        double_variables[double_var] = None
                         f.write(f" h6_{event['id'].replace('-', '_')}_{time['id'].replace('-', '_')}: {double_var} - x_{event['teacher'].replace('-', '_')}_{event['class'].replace('-', '_')}_{time['id'].replace('-', '_')} - x_{event['teacher'].replace('-', '_')}_{event['class'].replace('-', '_')}_{next_id.replace('-', '_')} <= 0\n")
                         f.write(f" h6_aux_{event['id'].replace('-', '_')}_{time['id'].replace('-', '_')}: {double_var} <= 1\n")
 
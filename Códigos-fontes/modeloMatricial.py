@@ -0,0 +1,424 @@
+import random
+import shutil
+from array import array
+
+from legendaBinaria import add_legend_name, new_legend, save_legend, write_binary_legend
+
+# Representação de um modelo linear em forma matricial (colunas + linhas esparsas),
+# compartilhada pelos geradores que trabalham sobre instanciaXHSTT.
+#   columns: lista de {"name", "cost", "kind" ("B", "I" ou "C"), "lower", "upper", "key"}
+#            "key" identifica a coluna para quem lê a solução; as aulas usam ("x", evento, (tempos...)),
+#            a ocupação ("busy", professor, (tempo,)) e os dias de trabalho ("day", professor, (tempos do dia...));
+#            na formulação de atribuição também ("pre"/"post"/"idle", professor, (tempo,)), as duplas
+#            ("double", evento, (tempo, tempo seguinte)) e as duplas não atendidas ("missing", evento, ())
+#   rows:    lista de {"name", "family", "indices", "coefs", "sense" ("<=", ">=", "="), "rhs"}
+# As colunas e linhas são escritas no LP como x<i>/c<j>, como em leituraAbsurda,
+# e os nomes legíveis vão para os arquivos de legenda: em texto ("x1: nome") ou, com
+# legend_format="binary", no formato binário de legendaBinaria.py (consultável por índice com mmap).
+
+LEGEND_FORMATS = ("text", "binary")
+
+
+# Função para criar um modelo vazio
+def new_model(name):
+    return {"name": name, "columns": [], "column_index": {}, "rows": []}
+
+
+# Função para adicionar uma coluna (ou devolver a existente com o mesmo nome)
+def add_column(model, name, cost=0.0, kind="C", lower=0.0, upper=None, key=None):
+    if name in model["column_index"]:
+        return model["column_index"][name]
+    index = len(model["columns"])
+    model["columns"].append({"name": name, "cost": cost, "kind": kind, "lower": lower, "upper": upper, "key": key})
+    model["column_index"][name] = index
+    return index
+
+
+# Função para criar o registro de uma linha, sem acrescentá-la a um modelo (geradores de linhas)
+def new_row(name, family, indices, coefs, sense, rhs):
+    return {"name": name, "family": family, "indices": list(indices), "coefs": list(coefs), "sense": sense, "rhs": rhs}
+
+
+# Função para adicionar uma linha
+def add_row(model, name, family, indices, coefs, sense, rhs):
+    model["rows"].append(new_row(name, family, indices, coefs, sense, rhs))
+    return len(model["rows"]) - 1
+
+
+# Função para contar linhas, colunas e não-zeros do modelo
+def model_statistics(model):
+    return {
+        "rows": len(model["rows"]),
+        "columns": len(model["columns"]),
+        "nonzeros": sum(len(row["indices"]) for row in model["rows"])
+    }
+
+
+# Função para formatar uma soma linear no formato LP
+def _linear_expression(indices, coefs):
+    parts = []
+    for index, coef in zip(indices, coefs):
+        sign = "-" if coef < 0 else "+"
+        value = abs(coef)
+        term = f"x{index + 1}" if value == 1 else f"{value:g} x{index + 1}"
+        parts.append(f"{sign} {term}")
+    expression = " ".join(parts)
+    return expression[2:] if expression.startswith("+ ") else expression
+
+
+# Função para escrever a função objetivo do modelo no início de um arquivo LP
+def _write_objective(lp_file, columns):
+    objective = [(index, column["cost"]) for index, column in enumerate(columns) if column["cost"]]
+    lp_file.write("Minimize\n obj: ")
+    if objective:
+        lp_file.write(_linear_expression([index for index, _ in objective], [cost for _, cost in objective]) + "\n\n")
+    else:
+        lp_file.write("0 x1\n\n")
+
+
+# Função para formatar uma linha no formato LP, sem o nome
+def _row_text(row):
+    return _linear_expression(row["indices"], row["coefs"]) + f" {row['sense']} {row['rhs']:g}"
+
+
+# Função para escrever o restante do LP (restrições, limites e integralidade), que não depende dos custos.
+# As linhas podem vir de um gerador: cada uma é escrita (e o seu nome, na legenda de restrições) e descartada.
+def _write_body(lp_file, columns, rows, constraints_file=None):
+    # Restrições
+    lp_file.write("Subject To\n")
+    for number, row in enumerate(rows, start=1):
+        lp_file.write(f" c{number}: " + _row_text(row) + "\n")
+        if constraints_file:
+            constraints_file.write(f"c{number}: {row['name']}\n")
+    _write_column_sections(lp_file, columns)
+
+
+# Função para escrever as seções de limites e de integralidade e o fim do LP
+def _write_column_sections(lp_file, columns):
+    # Limites diferentes de [0, +inf)
+    bounds = []
+    for index, column in enumerate(columns):
+        if column["kind"] == "B":
+            if column["upper"] == 0 or column["lower"] == 1:
+                bounds.append(f" x{index + 1} = {column['lower']:g}\n")
+            continue
+        lower = column["lower"]
+        upper = column["upper"]
+        if lower == 0 and upper is None:
+            continue
+        lower_text = "-inf" if lower is None else f"{lower:g}"
+        upper_text = "+inf" if upper is None else f"{upper:g}"
+        bounds.append(f" {lower_text} <= x{index + 1} <= {upper_text}\n")
+    if bounds:
+        lp_file.write("\nBounds\n")
+        lp_file.writelines(bounds)
+
+    # Variáveis binárias e inteiras
+    binary_terms = [f"x{index + 1}" for index, column in enumerate(columns) if column["kind"] == "B"]
+    if binary_terms:
+        lp_file.write("\nBinary\n")
+        for term in binary_terms:
+            lp_file.write(" " + term + "\n")
+    general_terms = [f"x{index + 1}" for index, column in enumerate(columns) if column["kind"] == "I"]
+    if general_terms:
+        lp_file.write("\nGeneral\n")
+        for term in general_terms:
+            lp_file.write(" " + term + "\n")
+
+    lp_file.write("End\n")
+
+
+# Função para validar o formato das legendas
+def _check_legend_format(legend_format):
+    if legend_format not in LEGEND_FORMATS:
+        raise ValueError(f"Formato de legenda desconhecido: {legend_format}")
+
+
+# Função para repassar as linhas de um iterável acrescentando os nomes à legenda binária
+def _recorded_rows(rows, legend):
+    for row in rows:
+        add_legend_name(legend, row["name"])
+        yield row
+
+
+# Função para gerar a legenda de variáveis
+def _write_legend(columns, legend_output_path, legend_format="text"):
+    if legend_format == "binary":
+        write_binary_legend((column["name"] for column in columns), legend_output_path, "x")
+        return
+    with open(legend_output_path, "w") as legend_file:
+        legend_file.write("Legenda das Variáveis:\n")
+        for index, column in enumerate(columns):
+            legend_file.write(f"x{index + 1}: {column['name']}\n")
+
+
+# Função para gerar o arquivo LP a partir das colunas e de um iterável de linhas (lista ou gerador),
+# consumido uma única vez; opcionalmente gera as legendas de variáveis e restrições
+def write_lp_stream(columns, rows, lp_output_path, legend_output_path=None, constraints_output_path=None, legend_format="text"):
+    _check_legend_format(legend_format)
+    with open(lp_output_path, "w") as lp_file:
+        _write_objective(lp_file, columns)
+        if constraints_output_path and legend_format == "binary":
+            row_legend = new_legend("c")
+            _write_body(lp_file, columns, _recorded_rows(rows, row_legend))
+            save_legend(row_legend, constraints_output_path)
+        elif constraints_output_path:
+            with open(constraints_output_path, "w") as constraints_file:
+                constraints_file.write("Legenda das Restrições:\n")
+                _write_body(lp_file, columns, rows, constraints_file)
+        else:
+            _write_body(lp_file, columns, rows)
+    if legend_output_path:
+        _write_legend(columns, legend_output_path, legend_format)
+
+
+# Função para gerar o arquivo LP e, opcionalmente, as legendas de variáveis e restrições
+def write_lp(model, lp_output_path, legend_output_path=None, constraints_output_path=None, legend_format="text"):
+    write_lp_stream(model["columns"], model["rows"], lp_output_path, legend_output_path, constraints_output_path, legend_format)
+
+
+# Função para gerar o arquivo MPS (formato livre) a partir das colunas e de um iterável de linhas.
+# O MPS é organizado por coluna: as linhas são escritas na seção ROWS enquanto chegam e os
+# coeficientes ficam em vetores compactos (array) até a seção COLUMNS.
+def write_mps_stream(columns, rows, mps_output_path, constraints_output_path=None, legend_format="text"):
+    _check_legend_format(legend_format)
+    senses = {"<=": "L", ">=": "G", "=": "E"}
+    entry_rows, entry_columns, entry_values = array("i"), array("i"), array("d")
+    rhs = []
+    row_legend = new_legend("c") if constraints_output_path and legend_format == "binary" else None
+    if row_legend:
+        rows = _recorded_rows(rows, row_legend)
+    constraints_file = open(constraints_output_path, "w") if constraints_output_path and not row_legend else None
+    try:
+        with open(mps_output_path, "w") as mps_file:
+            mps_file.write("NAME model\nROWS\n N  obj\n")
+            if constraints_file:
+                constraints_file.write("Legenda das Restrições:\n")
+            for number, row in enumerate(rows, start=1):
+                mps_file.write(f" {senses[row['sense']]}  c{number}\n")
+                entry_rows.extend([number] * len(row["indices"]))
+                entry_columns.extend(row["indices"])
+                entry_values.extend(row["coefs"])
+                if row["rhs"]:
+                    rhs.append((number, row["rhs"]))
+                if constraints_file:
+                    constraints_file.write(f"c{number}: {row['name']}\n")
+
+            # Coeficientes por coluna (a linha 0 é o objetivo)
+            by_column = [[] for _ in columns]
+            for position, index in enumerate(entry_columns):
+                by_column[index].append(position)
+            mps_file.write("COLUMNS\n")
+            integer = False
+            for index, column in enumerate(columns):
+                if (column["kind"] != "C") != integer:
+                    integer = not integer
+                    mps_file.write(f"    MARKER  'MARKER'  '{'INTORG' if integer else 'INTEND'}'\n")
+                if column["cost"]:
+                    mps_file.write(f"    x{index + 1}  obj  {column['cost']:g}\n")
+                for position in by_column[index]:
+                    mps_file.write(f"    x{index + 1}  c{entry_rows[position]}  {entry_values[position]:g}\n")
+                if not column["cost"] and not by_column[index]:
+                    mps_file.write(f"    x{index + 1}  obj  0\n")  # Coluna sem coeficientes continua declarada
+            if integer:
+                mps_file.write("    MARKER  'MARKER'  'INTEND'\n")
+
+            mps_file.write("RHS\n")
+            for number, value in rhs:
+                mps_file.write(f"    rhs  c{number}  {value:g}\n")
+
+            # Limites diferentes de [0, +inf); binárias como BV (ou FX quando fixadas)
+            mps_file.write("BOUNDS\n")
+            for index, column in enumerate(columns):
+                name = f"x{index + 1}"
+                if column["kind"] == "B":
+                    if column["upper"] == 0 or column["lower"] == 1:
+                        mps_file.write(f" FX bnd  {name}  {column['lower']:g}\n")
+                    else:
+                        mps_file.write(f" BV bnd  {name}\n")
+                    continue
+                lower, upper = column["lower"], column["upper"]
+                if lower is None:
+                    mps_file.write(f" MI bnd  {name}\n")
+                elif lower != 0:
+                    mps_file.write(f" LO bnd  {name}  {lower:g}\n")
+                if upper is not None:
+                    mps_file.write(f" UP bnd  {name}  {upper:g}\n")
+            mps_file.write("ENDATA\n")
+    finally:
+        if constraints_file:
+            constraints_file.close()
+    if row_legend:
+        save_legend(row_legend, constraints_output_path)
+
+
+# Função para traduzir os valores devolvidos pelo resolvedor (x<i>) para os nomes legíveis
+def solution_by_name(model, values):
+    named = {}
+    for key, value in values.items():
+        if key.startswith("x") and key[1:].isdigit():
+            index = int(key[1:]) - 1
+            if index < len(model["columns"]):
+                named[model["columns"][index]["name"]] = value
+    return named
+
+
+# Função para traduzir uma solução por nomes legíveis para o formato x<i> (ex.: MIP start)
+def solution_by_index(model, named_values):
+    return {f"x{model['column_index'][name] + 1}": value for name, value in named_values.items() if name in model["column_index"]}
+
+
+# Função para extrair o quadro de horários {evento: [tempos]} de uma solução (valores por x<i>)
+def extract_timetable(model, values):
+    timetable = {}
+    for index, column in enumerate(model["columns"]):
+        key = column["key"]
+        if key and key[0] == "x" and values.get(f"x{index + 1}", 0) > 0.5:
+            timetable.setdefault(key[1], []).extend(key[2])
+    return timetable
+
+
+# Função para converter um quadro {evento: [tempos]} em MIP start (valores por x<i>) com todas as
+# colunas do modelo, não só as aulas: o HiGHS completa com zero o que faltar, o que quebraria H2, S1,
+# S2 e S3. As colunas dependentes saem do quadro como nas linhas da formulação de atribuição: busy é
+# a soma das aulas do professor no tempo, day indica aula no dia, pre/post indicam aula antes/depois
+# no mesmo dia, idle é pre e post sem aula no tempo, double indica os dois tempos no quadro e missing
+# é o que falta para o número de duplas pedido. O quadro deve ser completo (com as aulas fixadas, se
+# houver); eventos fora dele ficam com zero. Colunas sem "key" conhecida também ficam com zero.
+def timetable_start(instance, model, timetable):
+    time_day = {time["id"]: time["day"] for time in instance["times"]}
+    events = {event["id"]: event for event in instance["events"]}
+    lessons = {event_id: set(time_ids) for event_id, time_ids in timetable.items()}
+    busy = set()
+    for event_id, time_ids in lessons.items():
+        for resource in events[event_id]["resources"]:
+            if instance["resources"].get(resource["reference"], {}).get("type") == "Teacher":
+                busy.update((resource["reference"], time_id) for time_id in time_ids)
+
+    # Função para contar os pares de tempos seguidos do dia ocupados pelo evento
+    def doubles(event_id):
+        own = lessons.get(event_id, set())
+        return sum(1 for day in instance["days"] for current, following in zip(instance["day_times"][day], instance["day_times"][day][1:])
+                   if current in own and following in own)
+
+    start = {}
+    for index, column in enumerate(model["columns"]):
+        kind, owner, time_ids = column["key"] or (None, None, ())
+        value = 0
+        if kind in ("x", "double"):
+            value = int(set(time_ids) <= lessons.get(owner, set()))
+        elif kind == "busy":
+            value = int((owner, time_ids[0]) in busy)
+        elif kind == "day":
+            value = int(any((owner, time_id) in busy for time_id in time_ids))
+        elif kind in ("pre", "post", "idle"):
+            day_times = instance["day_times"][time_day[time_ids[0]]]
+            position = day_times.index(time_ids[0])
+            before = any((owner, time_id) in busy for time_id in day_times[:position])
+            after = any((owner, time_id) in busy for time_id in day_times[position + 1:])
+            value = int({"pre": before, "post": after, "idle": before and after and (owner, time_ids[0]) not in busy}[kind])
+        elif kind == "missing":
+            value = max(0, events[owner]["double_lessons"] - doubles(owner))
+        start[f"x{index + 1}"] = value
+    return start
+
+
+# Função para criar uma cópia do modelo com colunas relaxadas e/ou fixadas, sem alterar o original
+#   relax: índices das colunas inteiras que passam a ser contínuas (mesmos limites)
+#   fix:   {índice: valor} das colunas fixadas
+def restricted_model(model, relax=(), fix=None):
+    fix = fix or {}
+    relax = set(relax)
+    columns = []
+    for index, column in enumerate(model["columns"]):
+        if index in fix:
+            column = dict(column, kind="C", lower=fix[index], upper=fix[index])
+        elif index in relax and column["kind"] != "C":
+            column = dict(column, kind="C", upper=1 if column["kind"] == "B" else column["upper"])
+        columns.append(column)
+    return dict(model, columns=columns)
+
+
+# Função para permutar colunas e linhas com uma semente, para estudos de variabilidade do resolvedor:
+# a mesma semente dá sempre o mesmo LP, sementes diferentes só mudam a ordem (x<i>/c<j>). As colunas
+# continuam com nome e "key", então solution_by_name e extract_timetable funcionam com o modelo permutado
+# (no quadro de horários, os tempos de cada evento saem na ordem das colunas permutadas).
+def permuted_model(model, seed):
+    generator = random.Random(seed)
+    order = list(range(len(model["columns"])))
+    generator.shuffle(order)
+    position = {old: new for new, old in enumerate(order)}
+    rows = [dict(row, indices=[position[index] for index in row["indices"]]) for row in model["rows"]]
+    generator.shuffle(rows)
+    columns = [model["columns"][old] for old in order]
+    return dict(model, columns=columns, column_index={column["name"]: index for index, column in enumerate(columns)}, rows=rows)
+
+
+# Função para criar uma cópia do modelo com outro vetor de custos, sem alterar linhas nem o original
+#   costs: {índice: custo}; as colunas ausentes ficam com custo zero ({} gera um modelo de viabilidade)
+def with_objective(model, costs):
+    return dict(model, columns=[dict(column, cost=costs.get(index, 0.0)) for index, column in enumerate(model["columns"])])
+
+
+# Função para calcular o valor da função objetivo do modelo em uma solução (valores por x<i>)
+def objective_value(model, values):
+    return sum(column["cost"] * values.get(f"x{index + 1}", 0.0) for index, column in enumerate(model["columns"]) if column["cost"])
+
+
+# Função para gravar só o corpo do LP (de "Subject To" até "End"), para reaproveitá-lo com outros objetivos
+def write_lp_body(model, body_output_path):
+    with open(body_output_path, "w") as body_file:
+        _write_body(body_file, model["columns"], model["rows"])
+
+
+# Função para gerar um LP com a função objetivo do modelo e um corpo já gravado por write_lp_body
+# (o modelo deve ter as mesmas colunas e linhas; apenas os custos mudam)
+def write_lp_with_body(model, body_path, lp_output_path):
+    with open(lp_output_path, "w") as lp_file, open(body_path) as body_file:
+        _write_objective(lp_file, model["columns"])
+        shutil.copyfileobj(body_file, lp_file)
+
+
+# Função para gravar um pedaço de linhas sem numeração ("<expressão> <sentido> <rhs>\t<nome>" por linha),
+# para ser numerado e juntado depois por write_lp_from_shards. Devolve o número de linhas.
+def write_row_shard(rows, shard_path):
+    count = 0
+    with open(shard_path, "w") as shard_file:
+        for row in rows:
+            shard_file.write(_row_text(row) + "\t" + row["name"] + "\n")
+            count += 1
+    return count
+
+
+# Função para gerar o LP (e as legendas) juntando, na ordem dada, os pedaços gravados por write_row_shard;
+# as linhas são numeradas c1, c2, ... na ordem em que aparecem
+def write_lp_from_shards(columns, shard_paths, lp_output_path, legend_output_path=None, constraints_output_path=None,
+                         legend_format="text"):
+    _check_legend_format(legend_format)
+    row_legend = new_legend("c") if constraints_output_path and legend_format == "binary" else None
+    constraints_file = open(constraints_output_path, "w") if constraints_output_path and not row_legend else None
+    try:
+        with open(lp_output_path, "w") as lp_file:
+            _write_objective(lp_file, columns)
+            lp_file.write("Subject To\n")
+            if constraints_file:
+                constraints_file.write("Legenda das Restrições:\n")
+            number = 0
+            for shard_path in shard_paths:
+                with open(shard_path) as shard_file:
+                    for line in shard_file:
+                        number += 1
+                        text, _, name = line.rstrip("\n").rpartition("\t")
+                        lp_file.write(f" c{number}: {text}\n")
+                        if constraints_file:
+                            constraints_file.write(f"c{number}: {name}\n")
+                        elif row_legend:
+                            add_legend_name(row_legend, name)
+            _write_column_sections(lp_file, columns)
+    finally:
+        if constraints_file:
+            constraints_file.close()
+    if row_legend:
+        save_legend(row_legend, constraints_output_path)
+    if legend_output_path:
+        _write_legend(columns, legend_output_path, legend_format)
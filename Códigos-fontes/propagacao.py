@@ -0,0 +1,136 @@
+from instanciaXHSTT import read_instance
+
+# Propagação de restrições antes da geração do modelo: cada evento tem um domínio de tempos
+# permitidos, reduzido até um ponto fixo pelas regras abaixo. Os geradores só criam variáveis
+# x_<evento>_<tempo> para os pares que sobrevivem.
+#   indisponível: tempos em que algum recurso do evento está indisponível (H4) saem do domínio
+#   pré-atribuído: o evento fica nos "duration" tempos seguidos a partir do tempo fixado
+#   forçado:      se o domínio tem exatamente "duration" tempos, todos são obrigatórios e saem
+#                 do domínio dos eventos que compartilham um recurso com ele
+#   dia:          com o máximo diário, um dia com menos tempos livres que o máximo precisa usar
+#                 todos eles quando a soma dos dias só alcança a duração (e então são forçados)
+#   recurso:      se a carga de um professor/turma é igual ao número de tempos em que ele ainda
+#                 pode dar aula, todo tempo desse conjunto é usado; um tempo que só cabe em um
+#                 evento do recurso é forçado para esse evento
+
+
+# Função para obter o bloco de um evento pré-atribuído: os "duration" tempos seguidos do dia a
+# partir do tempo fixado (cortado no fim do dia), ou None se o evento não tem tempo fixado.
+# Usada também pelos geradores de modelo, com ou sem propagação.
+def preassigned_block(instance, event):
+    time_day = {time["id"]: time["day"] for time in instance["times"]}
+    if event["preassigned_time"] not in time_day:
+        return None
+    day_times = instance["day_times"][time_day[event["preassigned_time"]]]
+    start = day_times.index(event["preassigned_time"])
+    return set(day_times[start:start + event["duration"]])
+
+
+# Função para montar os domínios iniciais (indisponibilidades e tempos pré-atribuídos)
+def _initial_domains(instance, events):
+    domains = {}
+    forced = {}
+    for event in events:
+        blocked = set()
+        for resource in event["resources"]:
+            blocked.update(instance["unavailable"].get(resource["reference"], ()))
+        domain = {time["id"] for time in instance["times"] if time["id"] not in blocked}
+        forced[event["id"]] = set()
+        block = preassigned_block(instance, event)
+        if block is not None:
+            domain &= block
+            forced[event["id"]] = set(domain)
+        domains[event["id"]] = domain
+    return domains, forced
+
+
+# Função principal: devolve {"domains": {evento: conjunto de tempos}, "forced": {evento: tempos
+# obrigatórios}, "infeasible": [mensagens], "columns": (antes, depois)}
+def propagate_domains(instance):
+    events = [event for event in instance["events"] if event["duration"] > 0]
+    by_id = {event["id"]: event for event in events}
+    domains, forced = _initial_domains(instance, events)
+    infeasible = []
+
+    resource_events = {}
+    for event in events:
+        for resource in event["resources"]:
+            resource_events.setdefault(resource["reference"], []).append(event["id"])
+    neighbours = {event["id"]: set() for event in events}
+    for members in resource_events.values():
+        for event_id in members:
+            neighbours[event_id].update(members)
+    for event_id in neighbours:
+        neighbours[event_id].discard(event_id)
+
+    # Função para forçar um tempo em um evento e retirá-lo dos vizinhos
+    def force(event_id, time_id):
+        if time_id in forced[event_id]:
+            return False
+        forced[event_id].add(time_id)
+        for other in neighbours[event_id]:
+            domains[other].discard(time_id)
+        return True
+
+    changed = True
+    while changed and not infeasible:
+        changed = False
+        for event_id, event in by_id.items():
+            domain = domains[event_id]
+            if not forced[event_id] <= domain:
+                infeasible.append(f"Evento {event_id}: tempo obrigatório retirado por um evento vizinho.")
+                break
+            if len(domain) < event["duration"]:
+                infeasible.append(f"Evento {event_id}: {len(domain)} tempo(s) possível(is) para duração {event['duration']}.")
+                break
+            if len(domain) == event["duration"]:
+                for time_id in domain:
+                    changed |= force(event_id, time_id)
+                continue
+
+            # Dias: o máximo diário limita quantas aulas cada dia pode receber
+            per_day = {day: [time_id for time_id in instance["day_times"][day] if time_id in domain] for day in instance["days"]}
+            reachable = sum(min(event["max_daily"], len(day_times)) for day_times in per_day.values())
+            if reachable < event["duration"]:
+                infeasible.append(f"Evento {event_id}: no máximo {reachable} aula(s) com o máximo diário, duração {event['duration']}.")
+                break
+            if reachable == event["duration"]:
+                for day_times in per_day.values():
+                    if 0 < len(day_times) <= event["max_daily"]:
+                        for time_id in day_times:
+                            changed |= force(event_id, time_id)
+
+        # Recursos com carga igual aos tempos ainda possíveis
+        for resource_id, members in resource_events.items():
+            if infeasible:
+                break
+            load = sum(by_id[event_id]["duration"] for event_id in members)
+            candidates = {}
+            for event_id in members:
+                for time_id in domains[event_id]:
+                    candidates.setdefault(time_id, []).append(event_id)
+            if load > len(candidates):
+                infeasible.append(f"Recurso {resource_id}: carga {load} maior que {len(candidates)} tempo(s) possível(is).")
+            elif load == len(candidates):
+                for time_id, users in candidates.items():
+                    if len(users) == 1:
+                        changed |= force(users[0], time_id)
+
+    before = len(events) * len(instance["times"])
+    after = sum(len(domain) for domain in domains.values())
+    return {"domains": domains, "forced": forced, "infeasible": infeasible, "columns": (before, after)}
+
+
+# Exemplo: python Códigos-fontes/propagacao.py Instâncias/BrazilInstance1.xml [...]
+if __name__ == "__main__":
+    import sys
+
+    for file_path in sys.argv[1:] or ["./Instâncias/BrazilInstance1.xml"]:
+        instance = read_instance(file_path)
+        result = propagate_domains(instance)
+        before, after = result["columns"]
+        forced = sum(len(times) for times in result["forced"].values())
+        print(f"{instance['id']}: colunas x {before} -> {after} ({100 * (before - after) / before if before else 0:.1f}% a menos), "
+              f"{forced} aula(s) forçada(s)")
+        for message in result["infeasible"]:
+            print(f"  Erro: {message}")
@@ -0,0 +1,193 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from analisePrevia import analyse_instance
+from formulacaoAtribuicao import GAMMA, OMEGA
+from geracaoColunas import price_pattern
+from instanciaXHSTT import read_instance
+
+# Relaxação lagrangiana das linhas de carga horária H1 (multiplicadores π[evento] livres) e das
+# linhas de conflito H3 (turmas, salas e demais recursos que não são o professor do evento, com
+# multiplicadores λ[recurso, tempo] >= 0). Sem H1 e H3, o modelo se separa por professor e dia:
+# cada subproblema escolhe o padrão do dia (a aula de cada período, com H2, H4 e H5) pela
+# programação dinâmica do pricing de geracaoColunas, com custo γ se houver aula no dia, ω por
+# período ocioso entre aulas e λ - π em cada aula. O mínimo de dias de trabalho da análise prévia
+# continua no subproblema do professor: entram os dias de padrão negativo e, se faltarem dias, os
+# padrões não vazios mais baratos dos demais. Os eventos sem professor formam subproblemas
+# próprios, sem γ, ω e mínimo de dias. Aulas duplas (custo δ >= 0) ficam de fora, então L(λ, π)
+# continua sendo um limitante inferior válido:
+#   L(λ, π) = soma dos padrões mínimos + soma de π[e] * duração[e] - soma de λ
+# Os multiplicadores são atualizados por subgradiente com passo de Polyak; os subproblemas de
+# cada iteração rodam em paralelo.
+
+_worker = {}
+
+
+# Função para montar os subproblemas: um por professor e um por evento sem professor.
+# Devolve (dados no formato de geracaoColunas.build_pattern_data, subproblemas)
+def build_subproblems(instance):
+    events = [event for event in instance["events"] if event["duration"] > 0]
+    working_days = analyse_instance(instance, with_conflicts=False)["working_days"]
+
+    # Recursos relaxados: usados por mais de um evento e não apenas como professor dos próprios eventos
+    resource_events = {}
+    for event in events:
+        for resource in event["resources"]:
+            resource_events.setdefault(resource["reference"], []).append(event)
+    relaxed = {resource_id for resource_id, users in resource_events.items()
+               if len(users) > 1 and not all(event["teacher"] == resource_id for event in users)}
+
+    owner_events = {}
+    blocked = {}
+    for event in events:
+        owner_events.setdefault(event["teacher"] or ("event", event["id"]), []).append(event)
+        blocked[event["id"]] = set()
+        for resource in event["resources"]:
+            blocked[event["id"]].update(instance["unavailable"].get(resource["reference"], ()))
+    data = {"events": {event["id"]: event for event in events}, "teacher_events": owner_events,
+            "shared": relaxed, "blocked": blocked}
+
+    subproblems = []
+    for owner, assigned in owner_events.items():
+        is_teacher = not isinstance(owner, tuple)
+        subproblems.append({
+            "owner": owner,
+            "events": [event["id"] for event in assigned],
+            "resources": {resource["reference"] for event in assigned for resource in event["resources"]} & relaxed,
+            "day_cost": GAMMA if is_teacher else 0,
+            "idle_cost": OMEGA if is_teacher else 0,
+            "working_days": working_days.get(owner, 0) if is_teacher else 0,
+        })
+    return data, subproblems
+
+
+# Inicializador dos processos: guarda a instância e os dados uma única vez por processo
+def _init_worker(instance, data):
+    _worker["instance"] = instance
+    _worker["data"] = data
+
+
+# Função para resolver um subproblema: o melhor padrão não vazio de cada dia, com os multiplicadores
+# no formato de duais do pricing (("H1", evento): π, ("H3", (recurso, tempo)): -λ); os dias vazios
+# custam zero. Devolve (valor, aulas [(evento, tempo)]), com valor infinito se o mínimo de dias não couber
+def solve_subproblem(instance, data, subproblem, duals):
+    patterns = sorted((price_pattern(instance, data, subproblem["owner"], day, duals, day_cost=subproblem["day_cost"],
+                                     idle_cost=subproblem["idle_cost"], nonempty=True) for day in instance["days"]),
+                      key=lambda pattern: pattern[0])
+    value = 0.0
+    lessons = []
+    for number, (cost, pattern) in enumerate(patterns):
+        if cost >= 0 and number >= subproblem["working_days"]:
+            break
+        if cost == float("inf"):
+            return float("inf"), []
+        value += cost
+        lessons.extend(pattern)
+    return value, lessons
+
+
+# Função auxiliar para o pool de processos
+def _solve_subproblem(arguments):
+    return solve_subproblem(_worker["instance"], _worker["data"], *arguments)
+
+
+# Função para separar os multiplicadores que afetam um subproblema
+def _subproblem_duals(subproblem, lesson_multipliers, conflict_multipliers):
+    duals = {("H1", event_id): lesson_multipliers[event_id] for event_id in subproblem["events"]}
+    for (resource_id, time_id), multiplier in conflict_multipliers.items():
+        if resource_id in subproblem["resources"]:
+            duals["H3", (resource_id, time_id)] = -multiplier
+    return duals
+
+
+# Função principal: otimização subgradiente dos multiplicadores.
+#   upper_bound: valor de uma solução conhecida (alvo do passo de Polyak); sem ele, o alvo é
+#                o melhor limitante acrescido de 10%
+# Devolve {"bound", "multipliers" {(recurso, tempo): λ}, "lesson_multipliers" {evento: π},
+#          "timetable" (da melhor iteração), "violations" (linhas H1 e H3 violadas na melhor
+#          iteração), "history" [limitante por iteração]}
+def lagrangian_bound(instance, iterations=100, step=2.0, patience=10, upper_bound=None, workers=None):
+    data, subproblems = build_subproblems(instance)
+    events = data["events"]
+    lesson_multipliers = {event_id: 0.0 for event_id in events}
+    conflict_multipliers = {}
+    best = {"bound": -float("inf"), "multipliers": {}, "lesson_multipliers": dict(lesson_multipliers), "lessons": [],
+            "violations": None}
+    history = []
+    stalled = 0
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(instance, data)) as executor:
+        for _ in range(iterations):
+            tasks = [(subproblem, _subproblem_duals(subproblem, lesson_multipliers, conflict_multipliers)) for subproblem in subproblems]
+            results = list(executor.map(_solve_subproblem, tasks, chunksize=max(1, len(tasks) // (4 * workers))))
+            if any(value == float("inf") for value, _ in results):
+                print("Erro: um professor não tem dias suficientes para o mínimo de dias de trabalho; o modelo não tem solução.")
+                return {"bound": float("inf"), "multipliers": {}, "lesson_multipliers": {}, "timetable": {}, "violations": None,
+                        "history": history}
+            lessons = [lesson for _, owner_lessons in results for lesson in owner_lessons]
+            bound = (sum(value for value, _ in results) + sum(lesson_multipliers[event_id] * event["duration"] for event_id, event in events.items())
+                     - sum(conflict_multipliers.values()))
+            history.append(bound)
+
+            # Subgradientes: aulas que faltam em H1 e uso acima de 1 em H3
+            lesson_gradient = {event_id: event["duration"] for event_id, event in events.items()}
+            usage = {}
+            for event_id, time_id in lessons:
+                lesson_gradient[event_id] -= 1
+                for resource in events[event_id]["resources"]:
+                    if resource["reference"] in data["shared"]:
+                        usage[resource["reference"], time_id] = usage.get((resource["reference"], time_id), 0) + 1
+            conflict_gradient = {key: usage.get(key, 0) - 1 for key in set(usage) | set(conflict_multipliers)}
+            violations = sum(1 for gradient in lesson_gradient.values() if gradient) + sum(1 for gradient in conflict_gradient.values() if gradient > 0)
+
+            if bound > best["bound"] + 1e-6:
+                best = {"bound": bound, "multipliers": dict(conflict_multipliers), "lesson_multipliers": dict(lesson_multipliers),
+                        "lessons": lessons, "violations": violations}
+                stalled = 0
+            else:
+                stalled += 1
+                if stalled >= patience:
+                    step /= 2
+                    stalled = 0
+            # Multiplicadores com λ = 0 e linha folgada não se movem
+            conflict_gradient = {key: gradient for key, gradient in conflict_gradient.items()
+                                 if gradient > 0 or conflict_multipliers.get(key, 0) > 0}
+            norm = float(sum(gradient ** 2 for gradient in lesson_gradient.values()) + sum(gradient ** 2 for gradient in conflict_gradient.values()))
+            if norm == 0:
+                break  # A solução lagrangiana respeita H1 e H3: o limitante é ótimo para a relaxação
+            target = upper_bound if upper_bound is not None else abs(best["bound"]) * 1.1 + 1
+            scale = step * (target - bound) / norm
+            for event_id, gradient in lesson_gradient.items():
+                lesson_multipliers[event_id] += scale * gradient
+            for key, gradient in conflict_gradient.items():
+                multiplier = max(0.0, conflict_multipliers.get(key, 0.0) + scale * gradient)
+                if multiplier > 0:
+                    conflict_multipliers[key] = multiplier
+                else:
+                    conflict_multipliers.pop(key, None)
+            if step < 1e-4:
+                break
+
+    timetable = {}
+    for event_id, time_id in best["lessons"]:
+        timetable.setdefault(event_id, []).append(time_id)
+    return {
+        "bound": best["bound"],
+        "multipliers": best["multipliers"],
+        "lesson_multipliers": best["lesson_multipliers"],
+        "timetable": timetable,
+        "violations": best["violations"],
+        "history": history,
+    }
+
+
+# Exemplo: python Códigos-fontes/relaxacaoLagrangiana.py Instâncias/BrazilInstance7.xml 100
+if __name__ == "__main__":
+    import sys
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else "./Instâncias/BrazilInstance1.xml"
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    result = lagrangian_bound(read_instance(file_path), iterations)
+    print(f"Limitante lagrangiano: {result['bound']:.2f} ({len(result['history'])} iterações, "
+          f"{result['violations']} linhas H1/H3 violadas na melhor solução)")
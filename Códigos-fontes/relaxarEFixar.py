@@ -0,0 +1,176 @@
+import csv
+import os
+import tempfile
+import time
+
+from analisePrevia import analyse_instance, gap
+from formulacoes import build_model
+from instanciaXHSTT import read_instance
+from modeloMatricial import extract_timetable, restricted_model, write_lp
+from solverLocal import solve_lp
+
+# Matheurística relax-and-fix / fix-and-optimize sobre a formulação de atribuição.
+# As colunas inteiras são divididas em janelas (um dia ou um grupo de turmas, pela chave das colunas).
+#   relax-and-fix:    resolve com integralidade apenas na janela atual, relaxando as janelas
+#                     seguintes, e fixa as aulas (colunas "x") da janela antes de passar à próxima.
+#   fix-and-optimize: a partir da solução completa, reabre duas janelas vizinhas por vez, com as
+#                     demais aulas fixadas e a solução atual como MIP start, e aceita melhorias.
+# Cada subproblema é um LP escrito em disco e resolvido pelo resolvedor local (solverLocal).
+
+WINDOW_KINDS = ("day", "class")
+
+
+# Função para montar as janelas: listas de índices de colunas inteiras
+#   day:   aulas, ocupação e dias de trabalho cujos tempos estão no dia
+#   class: aulas das turmas de cada grupo de cluster_size turmas (eventos sem turma no último grupo)
+def build_windows(model, instance, kind="day", cluster_size=3):
+    if kind not in WINDOW_KINDS:
+        raise ValueError(f"Tipo de janela desconhecido: {kind}")
+    keyed = [(index, column["key"]) for index, column in enumerate(model["columns"]) if column["key"] and column["kind"] != "C"]
+
+    if kind == "day":
+        time_days = {time["id"]: time["day"] for time in instance["times"]}
+        windows = {day: [] for day in instance["days"]}
+        for index, key in keyed:
+            days = {time_days[time_id] for time_id in key[2]}
+            if len(days) == 1:
+                windows[days.pop()].append(index)
+        return [window for window in windows.values() if window]
+
+    events = {event["id"]: event for event in instance["events"]}
+    classes = sorted({event["class"] for event in events.values() if event["class"]})
+    cluster_of = {cls: position // cluster_size for position, cls in enumerate(classes)}
+    last = (len(classes) - 1) // cluster_size if classes else 0
+    windows = [[] for _ in range(last + 1)]
+    for index, key in keyed:
+        if key[0] == "x":
+            windows[cluster_of.get(events[key[1]]["class"], last)].append(index)
+    return [window for window in windows if window]
+
+
+# Função para resolver uma cópia restrita do modelo e devolver o resultado do resolvedor
+def _solve_restricted(model, relax, fix, solver, time_limit, mip_start=None):
+    with tempfile.TemporaryDirectory() as workdir:
+        lp_path = os.path.join(workdir, "window.lp")
+        write_lp(restricted_model(model, relax, fix), lp_path)
+        return solve_lp(lp_path, solver, time_limit, mip_start=mip_start)
+
+
+# Função para verificar se o resolvedor devolveu uma solução utilizável
+def _has_solution(result):
+    return result["objective"] is not None and bool(result["values"]) and "infeasible" not in result["status"]
+
+
+# Função para fixar as aulas de uma janela no valor arredondado da solução
+def _fix_lessons(model, window, values, fixed):
+    for index in window:
+        if model["columns"][index]["key"][0] == "x":
+            fixed[index] = round(values.get(f"x{index + 1}", 0))
+
+
+# Relax-and-fix: devolve (valores, objetivo) da solução completa ou (None, None)
+def relax_and_fix(model, windows, solver="highs", window_time_limit=None, trajectory=None, start=None):
+    start = start or time.perf_counter()
+    integer = {index for window in windows for index in window}
+    integer.update(index for index, column in enumerate(model["columns"]) if column["kind"] != "C")
+    fixed = {}
+    previous = []
+    for number, window in enumerate(windows, start=1):
+        opened = set(window)
+        relax = integer - opened - set(fixed)
+        result = _solve_restricted(model, relax, fixed, solver, window_time_limit)
+        if not _has_solution(result) and previous:
+            # Janela inviável com a anterior fixada: reabre a anterior e resolve as duas juntas
+            print(f"Aviso: janela {number} inviável, reabrindo a janela {number - 1}.")
+            for index in previous:
+                fixed.pop(index, None)
+            opened.update(previous)
+            result = _solve_restricted(model, integer - opened - set(fixed), fixed, solver, window_time_limit)
+        if not _has_solution(result):
+            print(f"Erro: relax-and-fix sem solução na janela {number}.")
+            return None, None
+        _fix_lessons(model, opened, result["values"], fixed)
+        previous = window
+        if trajectory is not None:
+            trajectory.append({"time": time.perf_counter() - start, "phase": f"relax-and-fix {number}/{len(windows)}",
+                               "objective": result["objective"]})
+
+    # Solução completa: aulas fixadas, demais colunas inteiras livres
+    result = _solve_restricted(model, (), fixed, solver, window_time_limit)
+    if not _has_solution(result):
+        print("Erro: relax-and-fix não completou a solução.")
+        return None, None
+    if trajectory is not None:
+        trajectory.append({"time": time.perf_counter() - start, "phase": "relax-and-fix final", "objective": result["objective"]})
+    return result["values"], result["objective"]
+
+
+# Fix-and-optimize: reabre pares de janelas vizinhas até não haver melhoria ou acabar o tempo
+def fix_and_optimize(model, windows, values, objective, solver="highs", window_time_limit=None, time_limit=None,
+                     trajectory=None, start=None):
+    start = start or time.perf_counter()
+    lessons = [index for index, column in enumerate(model["columns"]) if column["key"] and column["key"][0] == "x"]
+    neighbourhoods = [windows[i] + windows[i + 1] for i in range(len(windows) - 1)] or windows
+    improved = True
+    while improved:
+        improved = False
+        for number, neighbourhood in enumerate(neighbourhoods, start=1):
+            if time_limit and time.perf_counter() - start >= time_limit:
+                return values, objective
+            opened = set(neighbourhood)
+            fixed = {index: round(values.get(f"x{index + 1}", 0)) for index in lessons if index not in opened}
+            result = _solve_restricted(model, (), fixed, solver, window_time_limit, mip_start=values)
+            if _has_solution(result) and result["objective"] < objective - 1e-6:
+                values, objective = result["values"], result["objective"]
+                improved = True
+            if trajectory is not None:
+                trajectory.append({"time": time.perf_counter() - start, "phase": f"fix-and-optimize {number}/{len(neighbourhoods)}",
+                                   "objective": objective})
+    return values, objective
+
+
+# Função principal: relax-and-fix seguido de fix-and-optimize.
+# Devolve {"objective", "timetable", "trajectory" [(tempo, fase, objetivo)], "time", "lower_bound", "gap"};
+# o gap é medido contra o limitante da análise prévia, já que a matheurística não produz limitante.
+def solve_matheuristic(instance, window_kind="day", cluster_size=3, solver="highs", window_time_limit=60,
+                       time_limit=600, formulation="assignment", **options):
+    start = time.perf_counter()
+    analysis = analyse_instance(instance)
+    if not analysis["feasible"]:
+        print(f"Erro: {instance['id']} é inviável pela análise prévia; a matheurística não será executada.")
+        return {"objective": None, "timetable": {}, "trajectory": [], "time": time.perf_counter() - start,
+                "lower_bound": analysis["lower_bound"], "gap": None}
+    model = build_model(instance, formulation, **options)
+    windows = build_windows(model, instance, window_kind, cluster_size)
+    trajectory = []
+    values, objective = relax_and_fix(model, windows, solver, window_time_limit, trajectory, start)
+    if values is not None:
+        values, objective = fix_and_optimize(model, windows, values, objective, solver, window_time_limit,
+                                             time_limit, trajectory, start)
+    return {"objective": objective, "timetable": extract_timetable(model, values or {}),
+            "trajectory": trajectory, "time": time.perf_counter() - start,
+            "lower_bound": analysis["lower_bound"], "gap": gap(objective, analysis["lower_bound"])}
+
+
+# Função para gravar a trajetória do objetivo em CSV
+def write_trajectory(trajectory, output_csv):
+    os.makedirs(os.path.dirname(output_csv) or ".", exist_ok=True)
+    with open(output_csv, "w", newline="") as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=["time", "phase", "objective"])
+        writer.writeheader()
+        writer.writerows(trajectory)
+
+
+# Exemplo: python Códigos-fontes/relaxarEFixar.py Instâncias/AustraliaBGHS98.xml day highs 600
+if __name__ == "__main__":
+    import sys
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else "./Instâncias/AustraliaBGHS98.xml"
+    window_kind = sys.argv[2] if len(sys.argv) > 2 else "day"
+    solver = sys.argv[3] if len(sys.argv) > 3 else "highs"
+    time_limit = float(sys.argv[4]) if len(sys.argv) > 4 else 600
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    result = solve_matheuristic(read_instance(file_path), window_kind, solver=solver, time_limit=time_limit)
+    for point in result["trajectory"]:
+        print(f"{point['time']:8.2f}s  {point['phase']:<28} {point['objective']}")
+    write_trajectory(result["trajectory"], f"./outputs/benchmark/{name}_relax_fix_{window_kind}.csv")
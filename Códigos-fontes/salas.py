@@ -0,0 +1,133 @@
+from modeloMatricial import new_row
+
+# Índice de compatibilidade de salas, linhas esparsas de capacidade e atribuição de salas
+# por emparelhamento bipartido depois que os horários estão fixos.
+
+
+# Função para montar a lista de demandas de sala: uma por sala pré-atribuída e uma por
+# pedido de sala sem recurso (<Resource> sem Reference com tipo Room). Cada demanda guarda
+# as salas compatíveis, vindas de PreferResourcesConstraint (papel + grupos/recursos) ou,
+# sem preferência declarada, de todas as salas da instância.
+def room_demands(instance):
+    preferred = {}
+    for constraint in instance["constraints"]:
+        if constraint["tag"] == "PreferResourcesConstraint" and constraint["required"]:
+            for event_id in constraint["events"]:
+                key = (event_id, constraint["role"])
+                allowed = set(constraint["preferred_resources"])
+                preferred[key] = preferred[key] & allowed if key in preferred else allowed
+
+    rooms = instance["rooms"]
+    demands = []
+    for event in instance["events"]:
+        if event["duration"] <= 0:
+            continue
+        for room in event["rooms"]:
+            demands.append({"event": event["id"], "role": None, "rooms": (room,), "fixed": True})
+        for requirement in event["room_requirements"]:
+            if requirement["type"] != "Room":
+                continue
+            allowed = preferred.get((event["id"], requirement["role"]))
+            compatible = tuple(room for room in rooms if allowed is None or room in allowed)
+            demands.append({"event": event["id"], "role": requirement["role"], "rooms": compatible, "fixed": False})
+    return demands
+
+
+# Função para agrupar as demandas flexíveis pelo conjunto de salas compatíveis.
+# Para cada conjunto S, as demandas cujo conjunto está contido em S não podem passar de |S|
+# em um mesmo tempo (condição de Hall restrita aos conjuntos que aparecem na instância).
+# Devolve [(S, {evento: número de demandas do evento contidas em S})].
+def room_capacity_groups(demands):
+    groups = []
+    seen = set()
+    for demand in demands:
+        if demand["fixed"] or demand["rooms"] in seen:
+            continue
+        seen.add(demand["rooms"])
+        room_set = set(demand["rooms"])
+        counts = {}
+        for other in demands:
+            if other["rooms"] and set(other["rooms"]) <= room_set:
+                counts[other["event"]] = counts.get(other["event"], 0) + 1
+        groups.append((demand["rooms"], counts))
+    return groups
+
+
+# Função para acrescentar ao modelo as linhas de capacidade de salas.
+# event_time_columns: {(evento, tempo): [colunas que colocam o evento no tempo]}
+# pinned: {evento: tempos} de aulas fixadas, que já ocupam salas do conjunto nesses tempos
+def add_room_capacity_rows(model, instance, event_time_columns, pinned=None):
+    groups = room_capacity_groups(room_demands(instance))
+    for number, (room_set, counts) in enumerate(groups, start=1):
+        model["rows"].extend(room_group_rows(instance, number, room_set, counts, event_time_columns, pinned))
+    return groups
+
+
+# Função para gerar as linhas de capacidade de um conjunto de salas (numerado RG<number>) em cada tempo
+def room_group_rows(instance, number, room_set, counts, event_time_columns, pinned=None):
+    pinned = pinned or {}
+    if sum(counts.values()) <= len(room_set):
+        return  # O conjunto nunca pode ficar sem salas
+    for time in instance["times"]:
+        indices, coefs = [], []
+        capacity = len(room_set)
+        for event_id, count in counts.items():
+            if time["id"] in pinned.get(event_id, ()):
+                capacity -= count
+            for index in event_time_columns.get((event_id, time["id"]), []):
+                indices.append(index)
+                coefs.append(count)
+        if sum(coefs) > capacity:
+            yield new_row(f"ROOM_RG{number}_{time['id']}", "ROOM", indices, coefs, "<=", capacity)
+
+
+# Função para encontrar um caminho aumentante a partir de uma demanda (algoritmo de Kuhn)
+def _augment(demand, candidates, room_owner, visited):
+    for room in candidates[demand]:
+        if room in visited:
+            continue
+        visited.add(room)
+        if room not in room_owner or _augment(room_owner[room], candidates, room_owner, visited):
+            room_owner[room] = demand
+            return True
+    return False
+
+
+# Função para atribuir salas depois que os horários estão fixos.
+# timetable: {evento: [tempos]}. Em cada tempo, as demandas dos eventos ali alocados são
+# emparelhadas com as salas compatíveis (emparelhamento bipartido máximo).
+# Devolve ({(evento, papel, tempo): sala}, [(evento, papel, tempo) sem sala]).
+def assign_rooms(instance, timetable, demands=None):
+    if demands is None:
+        demands = room_demands(instance)
+    demands_by_event = {}
+    for demand in demands:
+        demands_by_event.setdefault(demand["event"], []).append(demand)
+
+    events_by_time = {}
+    for event_id, time_ids in timetable.items():
+        for time_id in time_ids:
+            events_by_time.setdefault(time_id, []).append(event_id)
+
+    assignment = {}
+    unassigned = []
+    for time_id, event_ids in events_by_time.items():
+        slot_demands = [(event_id, demand) for event_id in event_ids for demand in demands_by_event.get(event_id, [])]
+        # Demandas com menos opções primeiro: menos caminhos aumentantes longos
+        order = sorted(range(len(slot_demands)), key=lambda i: len(slot_demands[i][1]["rooms"]))
+        candidates = {i: slot_demands[i][1]["rooms"] for i in order}
+        room_owner = {}
+        for i in order:
+            _augment(i, candidates, room_owner, set())
+        matched = {demand: room for room, demand in room_owner.items()}
+        for i in order:
+            event_id, demand = slot_demands[i]
+            key = (event_id, demand["role"], time_id)
+            if i in matched:
+                assignment[key] = matched[i]
+            else:
+                unassigned.append(key)
+
+    if unassigned:
+        print(f"Aviso: {len(unassigned)} demanda(s) de sala sem atribuição.")
+    return assignment, unassigned
@@ -0,0 +1,252 @@
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+
+# Resolvedores de código aberto chamados pela linha de comando. O executável pode
+# ser trocado pelas variáveis de ambiente HIGHS_BIN e CBC_BIN.
+SOLVERS = {
+    "highs": os.environ.get("HIGHS_BIN", "highs"),
+    "cbc": os.environ.get("CBC_BIN", "cbc"),
+}
+
+
+# Função para verificar se um resolvedor está instalado
+def solver_available(solver="highs"):
+    return shutil.which(SOLVERS[solver]) is not None
+
+
+# Função para escrever uma solução inicial (MIP start) no formato lido pelo resolvedor.
+# O HiGHS lê o vetor completo, na ordem das colunas do modelo: com "columns" (nomes na ordem de
+# _lp_column_names), as colunas ausentes de "values" entram com 0 e nomes fora do modelo são ignorados.
+# O CBC lê os valores pelo nome, então a solução pode ser parcial.
+def write_mip_start(values, path, solver="highs", columns=None):
+    with open(path, "w") as start_file:
+        if solver == "highs":
+            columns = list(values) if columns is None else columns
+            start_file.write("Model status\nUnknown\n\n# Primal solution values\nFeasible\nObjective 0\n")
+            start_file.write(f"# Columns {len(columns)}\n")
+            for name in columns:
+                start_file.write(f"{name} {values.get(name, 0):g}\n")
+            start_file.write("# Rows 0\n")
+        else:
+            start_file.write("Stopped on iterations - objective value 0\n")
+            for idx, (name, value) in enumerate(values.items()):
+                start_file.write(f"{idx} {name} {value:g} 0\n")
+
+
+# Função para ler o arquivo de solução do HiGHS (valores primais e, em LPs, duais das linhas)
+def _read_highs_solution(solution_path):
+    status, objective, values, duals = "unknown", None, {}, {}
+    with open(solution_path) as solution_file:
+        lines = [line.strip() for line in solution_file]
+    section = None
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if line == "Model status" and i + 1 < len(lines):
+            status = lines[i + 1].lower()
+        elif line.startswith("# Primal solution values"):
+            section = "primal"
+        elif line.startswith("# Dual solution values"):
+            section = "dual"
+        elif line.startswith("# Basis"):
+            break
+        elif line.startswith("Objective") and section == "primal":
+            objective = float(line.split()[-1])
+        elif line.startswith("# Columns") or line.startswith("# Rows"):
+            count = int(line.split()[-1])
+            target = values if line.startswith("# Columns") and section == "primal" else \
+                duals if line.startswith("# Rows") and section == "dual" else None
+            if target is not None:
+                for entry in lines[i + 1:i + 1 + count]:
+                    name, value = entry.split()[:2]
+                    target[name] = float(value)
+            i += count
+        i += 1
+    return status, objective, values, duals
+
+
+# Função para ler os nomes das linhas de um arquivo LP (para separar linhas e colunas na saída do CBC)
+def _lp_row_names(lp_path):
+    names = set()
+    section = None
+    with open(lp_path) as lp_file:
+        for line in lp_file:
+            lower = line.strip().lower()
+            if lower in ("subject to", "st", "s.t."):
+                section = "constraints"
+            elif lower in ("bounds", "binary", "binaries", "general", "generals", "end"):
+                break
+            elif section == "constraints" and ":" in line:
+                names.add(line.split(":", 1)[0].strip())
+    return names
+
+
+# Função para ler os nomes das colunas de um arquivo LP na ordem em que o HiGHS as numera
+# (primeira aparição no objetivo, nas restrições, nos limites e nas seções de integralidade)
+def _lp_column_names(lp_path):
+    names = {}
+    section = None
+    keywords = {"free", "inf", "infinity"}
+    with open(lp_path) as lp_file:
+        for line in lp_file:
+            stripped = line.strip()
+            lower = stripped.lower()
+            if lower in ("minimize", "maximize", "min", "max"):
+                section = "objective"
+                continue
+            if lower in ("subject to", "st", "s.t."):
+                section = "constraints"
+                continue
+            if lower in ("bounds", "binary", "binaries", "bin", "general", "generals", "gen"):
+                section = lower
+                continue
+            if lower == "end":
+                break
+            if section in ("objective", "constraints") and ":" in stripped:
+                stripped = stripped.split(":", 1)[1]
+            for token in stripped.split():
+                if (token[0].isalpha() or token[0] == "_") and token.lower() not in keywords:
+                    names.setdefault(token, None)
+    return list(names)
+
+
+# Função para ler o arquivo de solução do CBC (com "printingOptions all", as linhas vêm junto,
+# com o dual na quarta coluna)
+def _read_cbc_solution(solution_path, row_names=()):
+    status, objective, values, duals = "unknown", None, {}, {}
+    with open(solution_path) as solution_file:
+        header = solution_file.readline()
+        match = re.search(r"objective value\s+(\S+)", header)
+        if match:
+            objective = float(match.group(1))
+        status = header.split("-")[0].strip().lower()
+        for line in solution_file:
+            parts = line.replace("**", "").split()
+            if len(parts) >= 4 and parts[1] in row_names:
+                duals[parts[1]] = float(parts[3])
+            elif len(parts) >= 3:
+                values[parts[1]] = float(parts[2])
+    return status, objective, values, duals
+
+
+# Função para extrair do log o instante da primeira solução viável e o melhor limitante
+def _read_log(solver, log):
+    first_feasible, bound = None, None
+    for line in log.splitlines():
+        if solver == "highs":
+            # Linhas da árvore do HiGHS: "... BestBound BestSol Gap Cuts InLp Confl. LpIters Time"
+            columns = line.split()
+            if len(columns) > 8 and re.match(r"^[\d.]+s$", columns[-1]):
+                try:
+                    best_bound, best_sol = float(columns[-8]), columns[-7]
+                except ValueError:
+                    continue
+                bound = best_bound
+                if first_feasible is None and best_sol.lower() not in ("inf", "-inf"):
+                    first_feasible = float(columns[-1][:-1])
+        else:
+            match = re.search(r"Integer solution of \S+ found .*\(([\d.]+) seconds\)", line)
+            if match and first_feasible is None:
+                first_feasible = float(match.group(1))
+            match = re.search(r"best possible (\S+)", line)
+            if match:
+                bound = float(match.group(1))
+    return first_feasible, bound
+
+
+# Função para resolver um arquivo LP com um resolvedor local e devolver o resultado
+#   relax: resolve apenas a relaxação linear
+#   mip_start: dicionário {variável: valor} usado como solução inicial (pode ser parcial; no HiGHS, as
+#              variáveis ausentes começam em 0)
+#   duals: em LPs, devolve também os duais das linhas em "duals" ({linha: valor})
+def solve_lp(lp_path, solver="highs", time_limit=None, relax=False, mip_start=None, threads=None, duals=False):
+    if not solver_available(solver):
+        raise RuntimeError(f"Resolvedor {solver} não encontrado no PATH.")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        solution_path = os.path.join(workdir, "solution.sol")
+        if solver == "highs":
+            options_path = os.path.join(workdir, "highs.opt")
+            with open(options_path, "w") as options_file:
+                options_file.write("write_solution_style = 0\n")
+                if relax:
+                    options_file.write("solve_relaxation = true\n")
+                if threads:
+                    options_file.write(f"threads = {threads}\n")
+            command = [SOLVERS[solver], "--model_file", lp_path, "--options_file", options_path, "--solution_file", solution_path]
+            if time_limit:
+                command += ["--time_limit", str(time_limit)]
+            if mip_start:
+                start_path = os.path.join(workdir, "start.sol")
+                write_mip_start(mip_start, start_path, solver, _lp_column_names(lp_path))
+                command += ["--read_solution_file", start_path]
+        else:
+            command = [SOLVERS[solver], lp_path]
+            if time_limit:
+                command += ["sec", str(time_limit)]
+            if threads:
+                command += ["threads", str(threads)]
+            if mip_start:
+                start_path = os.path.join(workdir, "start.sol")
+                write_mip_start(mip_start, start_path, solver)
+                command += ["mips", start_path]
+            if duals:
+                command += ["printingOptions", "all"]
+            command += ["initialSolve" if relax else "solve", "solu", solution_path]
+
+        start = time.perf_counter()
+        process = subprocess.run(command, capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+
+        if not os.path.exists(solution_path):
+            print(f"Aviso: {solver} não gerou solução para {lp_path}.")
+            return {"status": "error", "objective": None, "bound": None, "time": elapsed,
+                    "first_feasible": None, "values": {}, "duals": {}, "log": process.stdout + process.stderr}
+
+        if solver == "highs":
+            status, objective, values, row_duals = _read_highs_solution(solution_path)
+        else:
+            status, objective, values, row_duals = _read_cbc_solution(solution_path, _lp_row_names(lp_path) if duals else ())
+
+    first_feasible, bound = _read_log(solver, process.stdout)
+    if relax:
+        bound = objective
+    return {"status": status, "objective": objective, "bound": bound, "time": elapsed,
+            "first_feasible": first_feasible, "values": values, "duals": row_duals if duals else {}, "log": process.stdout}
+
+
+# Função para contar linhas, colunas e não-zeros de um arquivo LP
+def lp_statistics(lp_path):
+    rows, nonzeros = 0, 0
+    columns = set()
+    section = None
+    term_pattern = re.compile(r"([A-Za-z_][\w.\[\]*#]*)")
+    with open(lp_path) as lp_file:
+        for line in lp_file:
+            stripped = line.strip()
+            lower = stripped.lower()
+            if lower in ("minimize", "maximize"):
+                section = "objective"
+                continue
+            if lower in ("subject to", "st", "s.t."):
+                section = "constraints"
+                continue
+            if lower in ("bounds", "binary", "binaries", "general", "generals", "end"):
+                section = lower
+                continue
+            if section == "constraints" and stripped:
+                if ":" in stripped:
+                    rows += 1
+                    stripped = stripped.split(":", 1)[1]
+                names = term_pattern.findall(stripped)
+                nonzeros += len(names)
+                columns.update(names)
+            elif section == "objective" and stripped:
+                if ":" in stripped:
+                    stripped = stripped.split(":", 1)[1]
+                columns.update(term_pattern.findall(stripped))
+    return {"rows": rows, "columns": len(columns), "nonzeros": nonzeros, "size": os.path.getsize(lp_path)}
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+
+from modeloMatricial import add_column, add_row, new_model, write_lp
+from solverLocal import _lp_column_names, _read_highs_solution, solve_lp, solver_available, write_mip_start
+
+# Testes da solução inicial (MIP start) do HiGHS: o arquivo precisa ter todas as colunas, na ordem em
+# que o HiGHS as numera ao ler o LP, mesmo quando o chamador passa só parte dos valores.
+# Rodar de dentro de Códigos-fontes: python -m unittest test_solverLocal
+
+
+# Modelo pequeno: min x3 com x1 + x2 = 1 e x3 >= x1. Só x3 está no objetivo, então o HiGHS
+# numera as colunas como x3, x1, x2 (ordem diferente da do modelo).
+def _small_model():
+    model = new_model("teste")
+    first = add_column(model, "a", kind="B", upper=1)
+    second = add_column(model, "b", kind="B", upper=1)
+    cost = add_column(model, "c", cost=1)
+    add_row(model, "escolha", "H1", [first, second], [1, 1], "=", 1)
+    add_row(model, "custo", "H1", [cost, first], [1, -1], ">=", 0)
+    return model
+
+
+class MipStartTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.lp_path = os.path.join(self.workdir.name, "teste.lp")
+        write_lp(_small_model(), self.lp_path)
+
+    def tearDown(self):
+        self.workdir.cleanup()
+
+    def test_column_order(self):
+        self.assertEqual(_lp_column_names(self.lp_path), ["x3", "x1", "x2"])
+
+    def test_partial_start_is_written_dense(self):
+        start_path = os.path.join(self.workdir.name, "start.sol")
+        write_mip_start({"x2": 1, "y9": 1}, start_path, "highs", _lp_column_names(self.lp_path))
+        status, objective, values, duals = _read_highs_solution(start_path)
+        self.assertEqual(list(values.items()), [("x3", 0.0), ("x1", 0.0), ("x2", 1.0)])
+
+    @unittest.skipUnless(solver_available("highs"), "HiGHS não encontrado no PATH")
+    def test_partial_start_round_trip(self):
+        result = solve_lp(self.lp_path, "highs", mip_start={"x2": 1})
+        self.assertEqual(result["status"], "optimal")
+        self.assertAlmostEqual(result["objective"], 0)
+        self.assertAlmostEqual(result["values"]["x2"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
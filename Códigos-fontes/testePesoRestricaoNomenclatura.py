@@ -56,16 +56,16 @@ def read_xml_and_generate_lp_with_weights(input_file, output_file):
     print("Gerando arquivo LP...")
     with open(output_file, "w") as lp_file:
         lp_file.write("Minimize\n")
-        objective_terms = set()
+        objective_terms = {}
 
         for event in events:
             teacher = event['teacher']
             class_group = event['class']
             for time in times:
                 var = f"x_{teacher}_{class_group}_{time['id']}"
-                objective_terms.add(f"3 {var}")  # ω = 3 para períodos ociosos
-            objective_terms.add(f"9 y_{teacher}")  # γ = 9 para dias de trabalho
-            objective_terms.add(f"1 g_{teacher}_{class_group}")  # δ = 1 para aulas duplas não satisfeitas
+                objective_terms[f"3 {var}"] = None  # ω = 3 para períodos ociosos
+            objective_terms[f"9 y_{teacher}"] = None  # γ = 9 para dias de trabalho
+            objective_terms[f"1 g_{teacher}_{class_group}"] = None  # δ = 1 para aulas duplas não satisfeitas
 
         lp_file.write(" + ".join(objective_terms) + "\n")
         lp_file.write("Subject To\n")
@@ -90,7 +90,7 @@ def read_xml_and_generate_lp_with_weights(input_file, output_file):
                     lp_file.write(f" {constraint_name}: " + " + ".join(terms) + f" = {event['duration']}\n")
 
         # H2: Conflito de horário por professor
-        for teacher in {e["teacher"] for e in events if e["teacher"]}:
+        for teacher in dict.fromkeys(e["teacher"] for e in events if e["teacher"]):
             for time in times:
                 terms = [f"x_{teacher}_{event['class']}_{time['id']}" for event in events if event["teacher"] == teacher and event["class"]]
                 if terms:
@@ -98,7 +98,7 @@ def read_xml_and_generate_lp_with_weights(input_file, output_file):
                     lp_file.write(f" {constraint_name}: " + " + ".join(terms) + " <= 1\n")
 
         # H3: Conflito de horário por turma
-        for cls in {e["class"] for e in events if e["class"]}:
+        for cls in dict.fromkeys(e["class"] for e in events if e["class"]):
             for time in times:
                 terms = [f"x_{event['teacher']}_{cls}_{time['id']}" for event in events if event["class"] == cls and event["teacher"]]
                 if terms:
@@ -145,7 +145,7 @@ def read_xml_and_generate_lp_with_weights(input_file, output_file):
                             lp_file.write(f" {constraint_name}: " + double_var + " - " + " - ".join(terms) + " >= -1\n")
 
         # S1: Períodos ociosos
-        for teacher in {e["teacher"] for e in events if e["teacher"]}:
+        for teacher in dict.fromkeys(e["teacher"] for e in events if e["teacher"]):
             for day in ["Mo", "Tu", "We", "Th", "Fr"]:
                 day_periods = [time for time in times if time["id"].startswith(day)]
                 for i in range(len(day_periods) - 1):
@@ -161,7 +161,7 @@ def read_xml_and_generate_lp_with_weights(input_file, output_file):
                         lp_file.write(f" {constraint_name}: " + idle_var + " - " + " + ".join(terms) + " >= 0\n")
 
         # S2: Dias de trabalho
-        for teacher in {e["teacher"] for e in events if e["teacher"]}:
+        for teacher in dict.fromkeys(e["teacher"] for e in events if e["teacher"]):
             for day in ["Mo", "Tu", "We", "Th", "Fr"]:
                 terms = [f"x_{teacher}_{time['id']}" for time in times if time["id"].startswith(day)]
                 if terms:
@@ -177,12 +177,12 @@ def read_xml_and_generate_lp_with_weights(input_file, output_file):
                     lp_file.write(f" {constraint_name}: " + " + ".join(terms) + f" >= {event['double_lessons']}\n")
 
         lp_file.write("Binary\n")
-        binary_vars = set()
+        binary_vars = {}
         for event in events:
             for time in times:
-                binary_vars.add(f"x_{event['teacher']}_{event['class']}_{time['id']}")
-            binary_vars.add(f"y_{event['teacher']}")
-            binary_vars.add(f"z_{event['teacher']}_{event['class']}")
+                binary_vars[f"x_{event['teacher']}_{event['class']}_{time['id']}"] = None
+            binary_vars[f"y_{event['teacher']}"] = None
+            binary_vars[f"z_{event['teacher']}_{event['class']}"] = None
         for var in binary_vars:
             lp_file.write(f"  {var}\n")
 
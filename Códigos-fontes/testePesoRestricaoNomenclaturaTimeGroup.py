@@ -1,8 +1,9 @@
-import xml.etree.ElementTree as ET
+from instanciaXHSTT import read_instance
+from salas import room_capacity_groups, room_demands
 
 def read_xml_and_generate_lp_with_weights(input_file, output_file):
-    tree = ET.parse(input_file)
-    root = tree.getroot()
+    # Todos os dados vêm de uma única leitura do XML (instanciaXHSTT.read_instance)
+    instance = read_instance(input_file)
 
     # Dicionários para armazenar os dados
     times = []
@@ -13,68 +14,54 @@ def read_xml_and_generate_lp_with_weights(input_file, output_file):
     time_groups = {}
 
     print("Lendo os tempos...")
-    for time in root.findall(".//Time"):
-        time_id = time.attrib.get("Id")
-        ref = time.find(".//Day").attrib.get("Reference") if time.find(".//Day") is not None else None
-        if time_id and ref:
-            times.append({"id": time_id, "group": ref})
+    for time in instance["times"]:
+        times.append({"id": time["id"], "group": time["day"]})
 
     print("Lendo os grupos de tempo...")
-    for group in root.findall(".//TimeGroups/*"):
-        ref = group.attrib.get("Id")
-        name = group.find("Name").text
-        if ref and name:
-            time_groups[ref] = name
+    # Os dias são identificados pelo ID do grupo de tempos
+    for day in instance["days"]:
+        time_groups[day] = day
 
     print("Lendo as salas...")
-    for resource in root.findall(".//Resource"):
-        res_type = resource.find("ResourceType")
-        if res_type is not None and res_type.attrib.get("Reference") == "Room":
-            rooms.append(resource.attrib.get("Reference"))
+    # Índice de compatibilidade: cada demanda de sala (pré-atribuída ou pedida por papel)
+    # com as salas aceitas, vindas dos requisitos dos eventos e dos grupos de recursos
+    rooms = instance["rooms"]
+    room_groups = room_capacity_groups(room_demands(instance))
 
     print("Lendo os eventos...")
-    for idx, event in enumerate(root.findall(".//Event"), start=1):
-        if event.tag == "Instances":
-            break
+    for idx, event in enumerate(instance["events"], start=1):
         event_id = f"E{idx}"  # Abreviação numérica para o ID do evento
-        duration_elem = event.find("Duration")
-        if duration_elem is not None and duration_elem.text.isdigit():
-            duration = int(duration_elem.text)
-        else:
+        if not event["duration"]:
             print(f"Aviso: Evento {event_id} ignorado. Duração ausente ou inválida.")
             continue
 
-        resources = [res.attrib.get("Reference") for res in event.findall(".//Resource")]
-        teacher = next((res for res in resources if "T" in res), None)
-        class_group = next((res for res in resources if "C" in res), None)
-
-        if teacher and class_group:
+        if event["teacher"] and event["class"]:
             events.append({
                 "id": event_id,
-                "duration": duration,
-                "teacher": teacher,
-                "class": class_group
+                "xml_id": event["id"],
+                "duration": event["duration"],
+                "teacher": event["teacher"],
+                "class": event["class"]
             })
         else:
             print(f"Aviso: Evento {event_id} ignorado. Classe ou professor ausentes.")
 
     if not rooms:
-        print("Erro: Nenhum elemento <Room> válido foi encontrado.")
-        return
+        print("Aviso: Nenhuma sala encontrada, restrições de sala não serão geradas.")
 
     print("Gerando arquivo LP...")
     with open(output_file, "w") as lp_file:
         lp_file.write("Minimize\n")
-        objective_terms = set()
+        objective_terms = {}
 
         for event in events:
             teacher = event['teacher']
             class_group = event['class']
             for time in times:
                 var = f"x_{teacher}_{class_group}_{time['id']}"
-                objective_terms.add(f"3 {var}")  # ω = 3 para períodos ociosos
-            objective_terms.add(f"9 y_{teacher}")  # γ = 9 para dias de trabalho
-            objective_terms.add(f"1 g_{teacher}_{class_group}")  # δ = 1 para aulas duplas não satisfeitas
+                objective_terms[f"3 {var}"] = None  # ω = 3 para períodos ociosos
+            objective_terms[f"9 y_{teacher}"] = None  # γ = 9 para dias de trabalho
+            objective_terms[f"1 g_{teacher}_{class_group}"] = None  # δ = 1 para aulas duplas não satisfeitas
 
         lp_file.write(" + ".join(objective_terms) + "\n")
         lp_file.write("Subject To\n")
@@ -84,12 +71,15 @@ def read_xml_and_generate_lp_with_weights(input_file, output_file):
             constraint_name = f"event_{event['id']}_timeslot"
             lp_file.write(f""" {constraint_name}: {' + '.join([f'x_{event["teacher"]}_{event["class"]}_{time["id"]}' for time in times])} = {event['duration']}\n""")
 
-        # Restrições de sala: uma sala só pode ser usada por um evento por vez
-        for time in times:
-            for room in rooms:
-                if room:
-                    constraint_name = f"room_{room}_time_{time['id']}"
-                    lp_file.write(f""" {constraint_name}: {' + '.join([f'x_{event["teacher"]}_{event["class"]}_{time["id"]}' for event in events])} <= 1\n""")
+        # Restrições de sala: para cada conjunto de salas compatíveis, os eventos que só cabem
+        # nesse conjunto não podem passar do número de salas em um mesmo tempo
+        for number, (room_set, counts) in enumerate(room_groups, start=1):
+            group_events = [(event, counts[event["xml_id"]]) for event in events if event["xml_id"] in counts]
+            if sum(count for _, count in group_events) <= len(room_set):
+                continue
+            for time in times:
+                constraint_name = f"room_RG{number}_time_{time['id']}"
+                lp_file.write(f""" {constraint_name}: {' + '.join([f'{count} x_{event["teacher"]}_{event["class"]}_{time["id"]}' for event, count in group_events])} <= {len(room_set)}\n""")
 
         # H1: Carga horária
         for event in events:
@@ -100,7 +90,7 @@ def read_xml_and_generate_lp_with_weights(input_file, output_file):
                     lp_file.write(f" {constraint_name}: " + " + ".join(terms) + f" = {event['duration']}\n")
 
         # H2: Conflito de horário por professor
-        for teacher in {e["teacher"] for e in events if e["teacher"]}:
+        for teacher in dict.fromkeys(e["teacher"] for e in events if e["teacher"]):
             for time in times:
                 terms = [f"x_{teacher}_{event['class']}_{time['id']}" for event in events if event["teacher"] == teacher and event["class"]]
                 if terms:
@@ -108,7 +98,7 @@ def read_xml_and_generate_lp_with_weights(input_file, output_file):
                     lp_file.write(f" {constraint_name}: " + " + ".join(terms) + " <= 1\n")
 
         # H3: Conflito de horário por turma
-        for cls in {e["class"] for e in events if e["class"]}:
+        for cls in dict.fromkeys(e["class"] for e in events if e["class"]):
             for time in times:
                 terms = [f"x_{event['teacher']}_{cls}_{time['id']}" for event in events if event["class"] == cls and event["teacher"]]
                 if terms:
@@ -155,7 +145,7 @@ def read_xml_and_generate_lp_with_weights(input_file, output_file):
                             lp_file.write(f" {constraint_name}: " + double_var + " - " + " - ".join(terms) + " >= -1\n")
 
         # S1: Períodos ociosos
-        for teacher in {e["teacher"] for e in events if e["teacher"]}:
+        for teacher in dict.fromkeys(e["teacher"] for e in events if e["teacher"]):
             for group in time_groups.values():
                 group_periods = [time for time in times if time_groups.get(time["group"], time["group"]) == group]
                 for i in range(len(group_periods) - 1):
@@ -172,7 +162,7 @@ def read_xml_and_generate_lp_with_weights(input_file, output_file):
                         lp_file.write(f" {constraint_name}: " + idle_var + " - " + " - ".join(terms) + " >= 0\n")
 
         # S2: Dias de trabalho
-        for teacher in {e["teacher"] for e in events if e["teacher"]}:
+        for teacher in dict.fromkeys(e["teacher"] for e in events if e["teacher"]):
             for group in time_groups.values():
                 terms = [f"x_{teacher}_{time['id']}" for time in times if time_groups.get(time["group"], time["group"]) == group]
                 if terms:
@@ -188,12 +178,12 @@ def read_xml_and_generate_lp_with_weights(input_file, output_file):
                     lp_file.write(f" {constraint_name}: " + " + ".join(terms) + f" >= {event['double_lessons']}\n")
 
         lp_file.write("Binary\n")
-        binary_vars = set()
+        binary_vars = {}
         for event in events:
             for time in times:
-                binary_vars.add(f"x_{event['teacher']}_{event['class']}_{time['id']}")
-            binary_vars.add(f"y_{event['teacher']}")
-            binary_vars.add(f"g_{event['teacher']}_{event['class']}")
+                binary_vars[f"x_{event['teacher']}_{event['class']}_{time['id']}"] = None
+            binary_vars[f"y_{event['teacher']}"] = None
+            binary_vars[f"g_{event['teacher']}_{event['class']}"] = None
         for var in binary_vars:
             lp_file.write(f"  {var}\n")
 
@@ -0,0 +1,150 @@
+import csv
+import itertools
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from formulacaoAtribuicao import DELTA, GAMMA, OMEGA
+from formulacoes import build_model
+from instanciaXHSTT import read_instance
+from modeloMatricial import with_objective, write_lp_body, write_lp_with_body
+from solverLocal import solve_lp
+
+# Varredura de pesos da função objetivo (δ aulas duplas não atendidas, ω períodos ociosos,
+# γ dias de trabalho) sem remontar o modelo: a matriz de restrições é montada e gravada uma vez
+# (write_lp_body) e cada ponto troca apenas o vetor de custos. As colunas com custo são
+# classificadas pelo peso com que foram geradas (DELTA, OMEGA ou GAMMA).
+# Os pontos são resolvidos em ondas a partir do ponto inicial (os pesos padrão, se estiverem na
+# grade): cada ponto usa como MIP start a solução de um vizinho da onda anterior (pontos que
+# diferem em um único peso, em posições seguidas da lista), e os pontos de uma onda rodam em paralelo.
+# A tabela final traz os valores de cada termo sem peso e marca os pontos não dominados (Pareto).
+
+WEIGHT_TERMS = ("delta", "omega", "gamma")
+PARETO_FIELDS = ["delta", "omega", "gamma", "status", "objective", "doubles", "idle", "days", "time", "pareto"]
+
+
+# Função para agrupar as colunas com custo por termo da função objetivo: {termo: [índices]}
+def objective_terms(model):
+    if len({DELTA, OMEGA, GAMMA}) < 3:
+        raise ValueError("Os pesos padrão precisam ser distintos para identificar os termos do objetivo.")
+    term_of = {DELTA: "delta", OMEGA: "omega", GAMMA: "gamma"}
+    terms = {term: [] for term in WEIGHT_TERMS}
+    for index, column in enumerate(model["columns"]):
+        if column["cost"]:
+            if column["cost"] not in term_of:
+                raise ValueError(f"Coluna {column['name']} com custo {column['cost']} fora dos pesos δ, ω e γ.")
+            terms[term_of[column["cost"]]].append(index)
+    return terms
+
+
+# Função para montar o vetor de custos {índice: peso} de um ponto (δ, ω, γ)
+def weighted_costs(terms, weights):
+    return {index: weight for term, weight in zip(WEIGHT_TERMS, weights) for index in terms[term] if weight}
+
+
+# Função para montar a grade de pontos (δ, ω, γ)
+def weight_grid(deltas, omegas, gammas):
+    return list(itertools.product(deltas, omegas, gammas))
+
+
+# Função para organizar os pontos em ondas a partir do ponto inicial.
+# Devolve [[(ponto, vizinho de onde vem o MIP start ou None), ...], ...]
+def sweep_waves(axes, seed):
+    position = {point: tuple(axis.index(value) for axis, value in zip(axes, point)) for point in itertools.product(*axes)}
+    point_at = {place: point for point, place in position.items()}
+    waves = [[(seed, None)]]
+    seen = {seed}
+    while True:
+        wave = []
+        for point, _ in waves[-1]:
+            for axis in range(len(axes)):
+                for step in (-1, 1):
+                    place = list(position[point])
+                    place[axis] += step
+                    neighbour = point_at.get(tuple(place))
+                    if neighbour is not None and neighbour not in seen:
+                        seen.add(neighbour)
+                        wave.append((neighbour, point))
+        if not wave:
+            return waves
+        waves.append(wave)
+
+
+# Função para marcar os pontos não dominados em (aulas duplas, ociosos, dias), todos minimizados
+def mark_pareto(rows):
+    solved = [row for row in rows if row["objective"] is not None]
+    for row in rows:
+        values = (row["doubles"], row["idle"], row["days"])
+        row["pareto"] = row["objective"] is not None and not any(
+            all(a <= b for a, b in zip(other_values, values)) and other_values != values
+            for other_values in ((other["doubles"], other["idle"], other["days"]) for other in solved))
+    return rows
+
+
+# Função principal: resolve a grade de pesos e devolve as linhas da tabela (PARETO_FIELDS)
+def sweep_weights(instance, deltas=(DELTA,), omegas=(OMEGA,), gammas=(GAMMA,), formulation="assignment", solver="highs",
+                  time_limit=None, workers=None, threads=1, **options):
+    axes = (list(deltas), list(omegas), list(gammas))
+    seed = (DELTA, OMEGA, GAMMA)
+    if seed not in weight_grid(*axes):
+        seed = weight_grid(*axes)[0]
+    model = build_model(instance, formulation, **options)
+    terms = objective_terms(model)
+    solutions = {}
+    rows = []
+
+    with tempfile.TemporaryDirectory() as workdir, ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        body_path = os.path.join(workdir, "body.lp")
+        write_lp_body(model, body_path)
+        for number, wave in enumerate(sweep_waves(axes, seed)):
+            print(f"Onda {number}: {len(wave)} ponto(s)")
+            futures = []
+            for point, neighbour in wave:
+                lp_path = os.path.join(workdir, "pesos_{}_{}_{}.lp".format(*point))
+                write_lp_with_body(with_objective(model, weighted_costs(terms, point)), body_path, lp_path)
+                futures.append((point, executor.submit(solve_lp, lp_path, solver, time_limit, False, solutions.get(neighbour), threads)))
+            for point, future in futures:
+                result = future.result()
+                if result["values"]:
+                    solutions[point] = result["values"]
+                term_values = {term: sum(result["values"].get(f"x{index + 1}", 0.0) for index in indices)
+                               for term, indices in terms.items()}
+                rows.append({
+                    "delta": point[0], "omega": point[1], "gamma": point[2],
+                    "status": result["status"],
+                    "objective": result["objective"],
+                    "doubles": round(term_values["delta"], 6) if result["values"] else None,
+                    "idle": round(term_values["omega"], 6) if result["values"] else None,
+                    "days": round(term_values["gamma"], 6) if result["values"] else None,
+                    "time": result["time"],
+                })
+                print(f"  δ={point[0]:g} ω={point[1]:g} γ={point[2]:g}: {result['status']}, objetivo {result['objective']}")
+    return mark_pareto(rows)
+
+
+# Função para gravar a tabela da varredura em CSV
+def write_pareto_table(rows, output_csv):
+    os.makedirs(os.path.dirname(output_csv) or ".", exist_ok=True)
+    with open(output_csv, "w", newline="") as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=PARETO_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Tabela de Pareto gravada em {output_csv}")
+
+
+# Exemplo: python Códigos-fontes/varreduraPesos.py Instâncias/BrazilInstance1.xml highs 120 1 1,3,5 3,9,15
+if __name__ == "__main__":
+    import sys
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else "./Instâncias/BrazilInstance1.xml"
+    solver = sys.argv[2] if len(sys.argv) > 2 else "highs"
+    time_limit = float(sys.argv[3]) if len(sys.argv) > 3 else 120
+    deltas = [float(value) for value in sys.argv[4].split(",")] if len(sys.argv) > 4 else [DELTA]
+    omegas = [float(value) for value in sys.argv[5].split(",")] if len(sys.argv) > 5 else [1, OMEGA, 5]
+    gammas = [float(value) for value in sys.argv[6].split(",")] if len(sys.argv) > 6 else [3, GAMMA, 15]
+    instance = read_instance(file_path)
+    start = time.perf_counter()
+    rows = sweep_weights(instance, deltas, omegas, gammas, solver=solver, time_limit=time_limit)
+    print(f"{len(rows)} ponto(s) em {time.perf_counter() - start:.2f}s")
+    write_pareto_table(rows, f"./outputs/pesos/{instance['id']}_pareto.csv")
@@ -68,22 +68,22 @@ def read_xml_and_generate_lp_with_weights(input_file, output_file):
     print("Gerando arquivo LP...")
     with open(output_file, "w") as lp_file:
         lp_file.write("Minimize\n")
-        objective_terms = set()
+        objective_terms = {}
 
         for event in events:
             teacher = event['teacher']
             class_group = event['class']
             for time in times:
                 var = f"x_{teacher}_{class_group}_{time['id']}"
-                objective_terms.add(f"3 {var}")  # ω = 3 para períodos ociosos
-            objective_terms.add(f"9 y_{teacher}")  # γ = 9 para dias de trabalho
-            objective_terms.add(f"1 g_{teacher}_{class_group}")  # δ = 1 para aulas duplas não satisfeitas
+                objective_terms[f"3 {var}"] = None  # ω = 3 para períodos ociosos
+            objective_terms[f"9 y_{teacher}"] = None  # γ = 9 para dias de trabalho
+            objective_terms[f"1 g_{teacher}_{class_group}"] = None  # δ = 1 para aulas duplas não satisfeitas
 
         lp_file.write(" + ".join(objective_terms) + "\n")
         lp_file.write("Subject To\n")
 
         # Restrição 2: Fluxo de entrada e saída nos nós
-        for teacher in {e["teacher"] for e in events if e["teacher"]}:
+        for teacher in dict.fromkeys(e["teacher"] for e in events if e["teacher"]):
             for time in times:
                 terms_in = [f"x_{teacher}_{event['class']}_{time['id']}" for event in events if event["teacher"] == teacher and event["class"]]
                 terms_out = [f"x_{teacher}_{event['class']}_{time['id']}" for event in events if event["teacher"] == teacher and event["class"]]
@@ -92,7 +92,7 @@ def read_xml_and_generate_lp_with_weights(input_file, output_file):
                     lp_file.write(f" {constraint_name}: " + " + ".join(terms_in) + " - " + " - ".join(terms_out) + " = 0\n")
 
         # Restrição 3: Capacidade unitária dos arcos de aula
-        for cls in {e["class"] for e in events if e["class"]}:
+        for cls in dict.fromkeys(e["class"] for e in events if e["class"]):
             for time in times:
                 terms = [f"x_{event['teacher']}_{cls}_{time['id']}" for event in events if event["class"] == cls and event["teacher"]]
                 if terms:
@@ -122,7 +122,7 @@ def read_xml_and_generate_lp_with_weights(input_file, output_file):
                         lp_file.write(f" {constraint_name}: " + " + ".join(terms) + " <= 2\n")
 
         # Restrição 6: Conflito de horário por professor
-        for teacher in {e["teacher"] for e in events if e["teacher"]}:
+        for teacher in dict.fromkeys(e["teacher"] for e in events if e["teacher"]):
             for time in times:
                 terms = [f"x_{teacher}_{event['class']}_{time['id']}" for event in events if event["teacher"] == teacher and event["class"]]
                 if terms:
@@ -146,7 +146,7 @@ def read_xml_and_generate_lp_with_weights(input_file, output_file):
                             lp_file.write(f" {constraint_name}: " + double_var + " - " + " - ".join(terms) + " >= -1\n")
 
         # Restrição 8: Dias de trabalho
-        for teacher in {e["teacher"] for e in events if e["teacher"]}:
+        for teacher in dict.fromkeys(e["teacher"] for e in events if e["teacher"]):
             for group in time_groups.values():
                 terms = [f"x_{teacher}_{time['id']}" for time in times if time_groups.get(time["group"], time["group"]) == group]
                 if terms:
@@ -154,12 +154,12 @@ def read_xml_and_generate_lp_with_weights(input_file, output_file):
                     lp_file.write(f" {constraint_name}: " + f"days_{teacher}" + " - " + " - ".join(terms) + " >= 0\n")
 
         lp_file.write("Binary\n")
-        binary_vars = set()
+        binary_vars = {}
         for event in events:
             for time in times:
-                binary_vars.add(f"x_{event['teacher']}_{event['class']}_{time['id']}")
-            binary_vars.add(f"y_{event['teacher']}")
-            binary_vars.add(f"g_{event['teacher']}_{event['class']}")
+                binary_vars[f"x_{event['teacher']}_{event['class']}_{time['id']}"] = None
+            binary_vars[f"y_{event['teacher']}"] = None
+            binary_vars[f"g_{event['teacher']}_{event['class']}"] = None
         for var in binary_vars:
             lp_file.write(f"  {var}\n")
 
@@ -1,14 +1,19 @@
 import xml.etree.ElementTree as ET
-
-def read_xml_and_generate_lp_with_weights(input_file, output_file):
-    tree = ET.parse(input_file)
-    root = tree.getroot()
-
-    # Encontrar a tag <Instances>
-    instances = root.find(".//Instances")
-    if instances is None:
-        print("Erro: Nenhuma tag <Instances> encontrada.")
-        return
+from indiceArquivoXHSTT import load_instance
+
+def read_xml_and_generate_lp_with_weights(input_file, output_file, instance_id=None):
+    if instance_id is not None:
+        # Ler apenas a instância pedida, sem percorrer o restante do arquivo
+        instances = load_instance(input_file, instance_id)
+    else:
+        tree = ET.parse(input_file)
+        root = tree.getroot()
+
+        # Encontrar a tag <Instances>
+        instances = root.find(".//Instances")
+        if instances is None:
+            print("Erro: Nenhuma tag <Instances> encontrada.")
+            return
 
     # Dicionários para armazenar os dados
     times = []
@@ -70,23 +75,23 @@ def read_xml_and_generate_lp_with_weights(input_file, output_file):
     print("Gerando arquivo LP...")
     with open(output_file, "w") as lp_file:
         lp_file.write("Minimize\n")
-        objective_terms = set()
+        objective_terms = {}
 
         for event in events:
             teacher = event['teacher']
             class_group = event['class']
             for time in times:
                 var = f"x_{teacher}_{class_group}_{time['id']}"
-                objective_terms.add(f"3 {var}")  # ω = 3 para períodos ociosos
-            objective_terms.add(f"9 y_{teacher}")  # γ = 9 para dias de trabalho
-            objective_terms.add(f"1 g_{teacher}_{class_group}")  # δ = 1 para aulas duplas não satisfeitas
+                objective_terms[f"3 {var}"] = None  # ω = 3 para períodos ociosos
+            objective_terms[f"9 y_{teacher}"] = None  # γ = 9 para dias de trabalho
+            objective_terms[f"1 g_{teacher}_{class_group}"] = None  # δ = 1 para aulas duplas não satisfeitas
 
         lp_file.write(" + ".join(objective_terms) + "\n")
         lp_file.write("Subject To\n")
 
         # Restrição 1: Conservação de Fluxo
         # PERGUNTAR PARA O GERALDO SOBRE ESSA RESTRIÇÃO
-        for teacher in {e["teacher"] for e in events if e["teacher"]}:
+        for teacher in dict.fromkeys(e["teacher"] for e in events if e["teacher"]):
             for time in times:
                 terms_in = [f"x_{teacher}_{event['class']}_{time['id']}" for event in events if event["teacher"] == teacher and event["class"]]
                 terms_out = [f"x_{teacher}_{event['class']}_{time['id']}" for event in events if event["teacher"] == teacher and event["class"]]
@@ -101,7 +106,7 @@ def read_xml_and_generate_lp_with_weights(input_file, output_file):
                     lp_file.write(f" {constraint_name}: " + " + ".join(terms_in) + " - " + " - ".join(terms_out) + f" = {b_v}\n")
 
         # Restrição 2: Capacidade unitária dos arcos de aula
-        for cls in {e["class"] for e in events if e["class"]}:
+        for cls in dict.fromkeys(e["class"] for e in events if e["class"]):
             for time in times:
                 terms = [f"x_{event['teacher']}_{cls}_{time['id']}" for event in events if event["class"] == cls and event["teacher"]]
                 if terms:
@@ -132,7 +137,7 @@ def read_xml_and_generate_lp_with_weights(input_file, output_file):
                         lp_file.write(f" {constraint_name}: " + " + ".join(terms) + f" <= {max_daily}\n")
 
         # Restrição 5: Aulas no primeiro período do dia
-        for cls in {e["class"] for e in events if e["class"]}:
+        for cls in dict.fromkeys(e["class"] for e in events if e["class"]):
             for time in times:
                 if time["id"].endswith("_1"):
                     terms = [f"x_{event['teacher']}_{cls}_{time['id']}" for event in events if event["class"] == cls and event["teacher"]]
@@ -157,7 +162,7 @@ def read_xml_and_generate_lp_with_weights(input_file, output_file):
                     lp_file.write(f" {constraint_name}: g_{event['teacher']}_{event['class']} >= {double_lessons_needed} - " + " - ".join(terms) + "\n")
 
         # Restrição 7: Mínimo de dias de trabalho
-        for teacher in {e["teacher"] for e in events if e["teacher"]}:
+        for teacher in dict.fromkeys(e["teacher"] for e in events if e["teacher"]):
             ## PERGUNTAR PARA O GERALDO SOBRE ESSA RESTRIÇÃO
             min_working_days = 3  # VOU SUPOR QUE o número mínimo de dias de trabalho é 3
             terms = [f"x_{teacher}_{time['id']}" for time in times]
@@ -166,13 +171,13 @@ def read_xml_and_generate_lp_with_weights(input_file, output_file):
                 lp_file.write(f" {constraint_name}: " + " + ".join(terms) + f" >= {min_working_days}\n")
 
         lp_file.write("Binary\n")
-        binary_vars = set()
-        continuous_vars = set()
+        binary_vars = {}
+        continuous_vars = {}
         for event in events:
             for time in times:
-                binary_vars.add(f"x_{event['teacher']}_{event['class']}_{time['id']}")
-            binary_vars.add(f"y_{event['teacher']}")
-            continuous_vars.add(f"g_{event['teacher']}_{event['class']}")
+                binary_vars[f"x_{event['teacher']}_{event['class']}_{time['id']}"] = None
+            binary_vars[f"y_{event['teacher']}"] = None
+            continuous_vars[f"g_{event['teacher']}_{event['class']}"] = None
         for var in binary_vars:
             lp_file.write(f"  {var}\n")
 